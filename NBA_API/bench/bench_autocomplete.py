@@ -0,0 +1,74 @@
+# bench_autocomplete.py
+# Micro-benchmark: NameIndex.autocomplete vs the old linear scan over get_players().
+# Run from NBA_API/:  python -m bench.bench_autocomplete
+import random
+import time
+
+from nba_api.stats.static import players as nba_players_static
+from nba.name_index import NameIndex
+
+
+def linear_autocomplete(prefix: str, limit: int = 10):
+    """The pre-index do_players_autocomplete."""
+    prefix_lower = prefix.lower()
+    matches = [
+        {"id": p["id"], "full_name": p["full_name"]}
+        for p in nba_players_static.get_players()
+        if prefix_lower in p["full_name"].lower()
+    ]
+
+    def sort_key(player):
+        first_name = player["full_name"].lower().split()[0]
+        return (0 if first_name.startswith(prefix_lower) else 1, player["full_name"])
+
+    return sorted(matches, key=sort_key)[:limit]
+
+
+def sample_queries(names, count=2000, seed=7):
+    """What people type: growing prefixes of names plus random substrings and misses."""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        name = rng.choice(names)
+        kind = rng.random()
+        if kind < 0.6:
+            queries.append(name[:rng.randint(1, min(8, len(name)))])
+        elif kind < 0.9:
+            start = rng.randrange(len(name))
+            queries.append(name[start:start + rng.randint(1, 6)].upper())
+        else:
+            queries.append(rng.choice(["zzq", "xq", "qqq", "lebron james jr"]))
+    return queries
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1e6
+    return pick(0.50), pick(0.99)
+
+
+def run(func, queries):
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        func(q, 10)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+if __name__ == "__main__":
+    players = nba_players_static.get_players()
+
+    start = time.perf_counter()
+    index = NameIndex(players)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = sample_queries([p["full_name"] for p in players])
+    for q in queries:
+        assert index.autocomplete(q, 10) == linear_autocomplete(q, 10), q
+
+    scan_p50, scan_p99 = run(linear_autocomplete, queries)
+    idx_p50, idx_p99 = run(index.autocomplete, queries)
+    print(f"{len(players)} players, {len(queries)} queries, index built in {build_ms:.0f} ms")
+    print(f"  linear scan : p50 {scan_p50:8.1f} us   p99 {scan_p99:8.1f} us")
+    print(f"  name index  : p50 {idx_p50:8.1f} us   p99 {idx_p99:8.1f} us")
@@ -0,0 +1,43 @@
+# bench_columnar.py
+# Size of one day of /matches-of-the-day in the records layout against format=columnar:
+# response body, gzip'd body (what actually crosses the wire behind a compressing proxy),
+# the text stored by the materializer, and Python heap held by the built payload.
+# Run from NBA_API/:  python -m bench.bench_columnar [games]
+import gzip
+import json
+import sys
+import tracemalloc
+
+from bench.bench_json import day_of_games
+from nba.matches import _build_games_json, games_view
+from nba.responses import dumps
+
+
+def held_bytes(build):
+    """Python heap still referenced by build()'s result."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    date_str, games_df, boxes = day_of_games(games)
+    columnar = _build_games_json(date_str, games_df, boxes)
+    records = games_view(columnar)
+    assert games_view(records, columnar=True) == columnar
+
+    print(f"{games} games ({len(records['games'])} game log rows)")
+    print(f"  {'layout':<10}{'body KiB':>10}{'gzip KiB':>10}{'stored KiB':>12}{'heap KiB':>10}")
+    for name, payload, build in (
+        ("records", records, lambda: games_view(_build_games_json(date_str, games_df, boxes))),
+        ("columnar", columnar, lambda: _build_games_json(date_str, games_df, boxes)),
+    ):
+        body = dumps(payload)
+        stored = json.dumps(payload)  # what materialize._write keeps
+        print(f"  {name:<10}{len(body) / 1024:10.1f}{len(gzip.compress(body)) / 1024:10.1f}"
+              f"{len(stored) / 1024:12.1f}{held_bytes(build) / 1024:10.1f}")
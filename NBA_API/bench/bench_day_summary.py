@@ -0,0 +1,76 @@
+# bench_day_summary.py
+# What one day costs the front-end (its "/" and "/matches-today" pages): the two separate
+# pipelines behind /player-of-the-day and /matches-of-the-day versus the one day summary
+# both are now views of. Counts upstream calls, box score store reads and time per date.
+# Run from NBA_API/:  python -m bench.bench_day_summary [dates] [games per day] [latency]
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("NBA_CACHE_DIR", tempfile.mkdtemp(prefix="nba-bench-"))
+os.environ.setdefault("NBA_STATS_RATE", "10000")
+os.environ.setdefault("NBA_STATS_BURST", "10000")
+
+from bench import fake_stats_server
+from nba import boxscores, game_index
+from nba.day_summary import get_day_summary_async
+from nba.matches import get_game_stats_async
+from nba.metrics import render
+from nba.player_of_the_day import get_player_of_the_day_async
+from nba.stats_client import close_stats_client
+
+
+def upstream_calls():
+    return sum(float(line.split()[-1]) for line in render().splitlines()
+               if line.startswith("nba_upstream_request_duration_seconds_count"))
+
+
+def store_reads():
+    stats = boxscores.cache_stats()
+    return stats["hits"] + stats["misses"]
+
+
+async def separate(days_ago):
+    await get_game_stats_async(days_ago, columnar=True)
+    await get_player_of_the_day_async(days_ago)
+
+
+async def combined(days_ago):
+    await get_day_summary_async(days_ago)
+
+
+async def measure(label, run, first_day, dates):
+    calls, reads, started = upstream_calls(), store_reads(), time.perf_counter()
+    for days_ago in range(first_day, first_day + dates):
+        await run(days_ago)
+    seconds = time.perf_counter() - started
+    print(f"  {label:<34}{(upstream_calls() - calls) / dates:10.1f}"
+          f"{(store_reads() - reads) / dates:12.1f}{seconds / dates * 1000:10.1f}")
+
+
+async def main(dates, games):
+    print(f"  {'per date':<34}{'upstream':>10}{'box reads':>12}{'ms':>10}")
+    # Each pass gets dates nobody asked for yet: cold game index, empty box store
+    await measure("separate (matches + POTD), cold", separate, 1, dates)
+    await measure("day summary, cold", combined, 1 + dates, dates)
+    # The same dates again: the game index is warm, box scores come from the store
+    await measure("separate (matches + POTD), stored", separate, 1, dates)
+    await measure("day summary, stored", combined, 1, dates)
+    # Today's games: box scores are only trusted for LIVE_TTL_SECONDS
+    boxscores.LIVE_TTL_SECONDS = 0
+    game_index.TODAY_TTL_SECONDS = 0
+    await measure("separate (matches + POTD), live", separate, 0, 1)
+    await measure("day summary, live", combined, 0, 1)
+    await close_stats_client()
+
+
+if __name__ == "__main__":
+    dates = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    server = fake_stats_server.start_fake_server(latency=latency, games=games)
+    fake_stats_server.use_fake_server(server)
+    asyncio.run(main(dates, games))
+    server.shutdown()
@@ -0,0 +1,46 @@
+# bench_derived.py
+# Time derived_stats.derive on synthetic league tables (one season row per player) against
+# the per-player, per-stat division index.js used to do, written as a Python loop.
+# Run from NBA_API/:  python -m bench.bench_derived [rows ...]
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from bench import fake_stats_server
+from nba.derived_stats import MODES, derive
+
+PER_GAME_STATS = ["PTS", "REB", "AST", "STL", "BLK", "FG3M", "FGM"]
+
+
+def league_table(rows):
+    return pd.DataFrame([fake_stats_server._season_totals(1000 + i, "2024-25") for i in range(rows)])
+
+
+def one_player_at_a_time(df):
+    """What getStats did in the browser, once per player."""
+    out = []
+    for record in df.to_dict(orient="records"):
+        out.append({stat: round(record[stat] / record["GP"], 1) for stat in PER_GAME_STATS})
+    return out
+
+
+def timed(run, repeat=15):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [500, 5000, 50000]
+    print(f"  {'rows':>7}{'loop (7 stats)':>16}" + "".join(f"{mode:>11}" for mode in MODES) + "   (ms, p50)")
+    for rows in sizes:
+        df = league_table(rows)
+        derive(df, "advanced")  # first call pays for numpy/pandas warm-up
+        loop = timed(lambda: one_player_at_a_time(df), repeat=5)
+        modes = [timed(lambda: derive(df, mode)) for mode in MODES]
+        print(f"  {rows:>7}{loop:16.2f}" + "".join(f"{ms:11.2f}" for ms in modes))
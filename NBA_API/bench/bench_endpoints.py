@@ -0,0 +1,152 @@
+# bench_endpoints.py
+# Offline latency / throughput / memory numbers for every route in main.py, served
+# against the fake stats server (synthetic data, or fixtures recorded with bench.replay).
+# Run from NBA_API/:
+#   python -m bench.bench_endpoints [--fixtures DIR] [--latency 0.2] [--save results.json]
+#                                   [--compare results.json] [--tolerance 0.25]
+# With --compare, exits non-zero when a route got slower (or hungrier) than the saved run
+# by more than the tolerance, so it can gate a change before it ships.
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Measure the app, not the upstream politeness limit or the background jobs
+os.environ.setdefault("NBA_STATS_RATE", "10000")
+os.environ.setdefault("NBA_STATS_BURST", "10000")
+os.environ.setdefault("NBA_CACHE_DIR", tempfile.mkdtemp(prefix="nba-bench-"))
+os.environ.setdefault("NBA_MATERIALIZE_DAYS", "0")
+
+import httpx
+
+import main
+from bench.fake_stats_server import use_fake_server
+from bench.bench_load import serve
+
+UPSTREAM_PORT = 8710
+APP_PORT = 8711
+# Synthetic player ids (team_id * 100 + n) exist in the fake league
+PLAYER_IDS = [161061273700 + i for i in range(10)]
+
+
+def route_urls(player_ids, days_ago):
+    """One representative request per route in main.py."""
+    p = player_ids
+    return {
+        "/search-player": "/search-player?name=james",
+        "/player-stats": f"/player-stats/{p[0]}",
+        "/player-of-the-day": f"/player-of-the-day?days_ago={days_ago}",
+        "/player-of-the-day top": f"/player-of-the-day?days_ago={days_ago}&formula=game_score&top=10",
+        "/matches-of-the-day": f"/matches-of-the-day?days_ago={days_ago}",
+        "/cache-stats": "/cache-stats",
+        "/compare-players": f"/compare-players?player1={p[0]}&player2={p[1 % len(p)]}",
+        "/compare": "/compare?" + "&".join(f"player_ids={pid}" for pid in p[:5]),
+        "/leaders": "/leaders?stat=PTS&limit=10",
+        "/autocomplete": "/autocomplete?prefix=ste&limit=10",
+    }
+
+
+async def measure(client, url, repeat, concurrency):
+    # Latency: the first call is cold (upstream + caches empty), the rest are warm
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, f"{url}: {response.status_code} {response.text[:200]}"
+
+    # Throughput: `concurrency` identical requests at once
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(client.get(url) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses), f"{url}: failures under load"
+
+    # Memory: peak Python allocations while serving one warm request
+    tracemalloc.start()
+    await client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    warm = sorted(timings[1:]) or timings
+    return {
+        "cold_ms": timings[0] * 1000,
+        "p50_ms": statistics.median(warm) * 1000,
+        "p95_ms": warm[min(len(warm) - 1, int(len(warm) * 0.95))] * 1000,
+        "req_per_s": concurrency / elapsed,
+        "peak_kib": peak / 1024,
+        "bytes": len(responses[0].content),
+    }
+
+
+async def run(urls, repeat, concurrency):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{APP_PORT}", timeout=120, limits=limits) as client:
+        return {route: await measure(client, url, repeat, concurrency) for route, url in urls.items()}
+
+
+def regressions(results, baseline, tolerance):
+    """Routes whose warm latency or memory grew (or throughput fell) past the tolerance."""
+    found = []
+    for route, now in results.items():
+        before = baseline.get(route)
+        if before is None:
+            continue
+        for key, worse in (("p50_ms", now["p50_ms"] > before["p50_ms"] * (1 + tolerance)),
+                           ("peak_kib", now["peak_kib"] > before["peak_kib"] * (1 + tolerance)),
+                           ("req_per_s", now["req_per_s"] < before["req_per_s"] * (1 - tolerance))):
+            if worse:
+                found.append(f"{route} {key}: {before[key]:.1f} -> {now[key]:.1f}")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", help="replay responses recorded by bench.replay")
+    parser.add_argument("--latency", type=float, default=0.2, help="upstream latency in seconds")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--days-ago", type=int, default=3)
+    parser.add_argument("--players", type=int, nargs="*", default=PLAYER_IDS,
+                        help="player ids to use (pass the recorded ones with --fixtures)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="fail on regressions against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # The fake upstream gets its own process so it doesn't compete for our GIL
+    command = [sys.executable, "-m", "bench.fake_stats_server", str(UPSTREAM_PORT), str(args.latency), "10"]
+    if args.fixtures:
+        command.append(args.fixtures)
+    upstream = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    time.sleep(1.5)
+    use_fake_server(f"127.0.0.1:{UPSTREAM_PORT}")
+    server = serve(main.app, APP_PORT)
+
+    try:
+        results = asyncio.run(run(route_urls(args.players, args.days_ago), args.repeat, args.concurrency))
+    finally:
+        server.should_exit = True
+        upstream.terminate()
+
+    print(f"{args.latency * 1000:.0f} ms upstream latency, {args.repeat} sequential + "
+          f"{args.concurrency} concurrent requests per route")
+    print(f"  {'route':<24}{'cold ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}{'peak KiB':>10}{'bytes':>9}")
+    for route, r in results.items():
+        print(f"  {route:<24}{r['cold_ms']:9.1f}{r['p50_ms']:9.2f}{r['p95_ms']:9.2f}"
+              f"{r['req_per_s']:9.1f}{r['peak_kib']:10.1f}{r['bytes']:9d}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"  REGRESSION {line}")
+        sys.exit(1 if found else 0)
@@ -0,0 +1,59 @@
+# bench_history.py
+# Ingest a synthetic season into the history store, then time the season-wide queries.
+# Box scores are generated in-process (no HTTP), so this measures the store alone.
+# Run from NBA_API/:  python -m bench.bench_history [days] [games per day] [repeat]
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("NBA_CACHE_DIR", tempfile.mkdtemp(prefix="nba-bench-"))
+
+from bench import fake_stats_server
+from nba import history
+
+SEASON_START = date(2024, 10, 22)
+
+
+def ingest(days, games):
+    started = time.perf_counter()
+    for i in range(days):
+        day = SEASON_START + timedelta(days=i)
+        game_ids = fake_stats_server._game_ids_for(day.strftime("%m/%d/%Y"), games)
+        history.ingest_box_scores(day, {gid: fake_stats_server._box_score({"GameID": gid}, games)
+                                        for gid in game_ids})
+    return time.perf_counter() - started
+
+
+def timed(query, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, max(timings) * 1000
+
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 170
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    seconds = ingest(days, games)
+    seasons = history.history_stats()["seasons"]
+    lines = sum(s["player_lines"] for s in seasons)
+    print(f"ingested {days * games} games ({lines} player lines) in {seconds:.1f}s, "
+          f"{os.path.getsize(history.HISTORY_PATH) / 2**20:.1f} MiB on disk")
+
+    queries = {
+        "best PRA, top 10": lambda: history.best_performances("PRA", "2024-25", 10),
+        "best PTS, one team": lambda: history.best_performances("PTS", "2024-25", 10, "BOS"),
+        "PTS >= 25 streaks": lambda: history.streaks("PTS", 25, "2024-25", 10),
+        "team history": lambda: history.team_history("BOS", "2024-25"),
+    }
+    print(f"  {'query':<22}{'p50 ms':>9}{'max ms':>9}")
+    for name, query in queries.items():
+        p50, worst = timed(query, repeat)
+        print(f"  {name:<22}{p50:9.2f}{worst:9.2f}")
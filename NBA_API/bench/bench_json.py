@@ -0,0 +1,83 @@
+# bench_json.py
+# CPU time and peak allocations to turn one day of box scores into the /matches-of-the-day
+# response body: the old path (records -> clean_nans -> jsonable_encoder -> json.dumps)
+# against the new one (nil_rows per column -> FastJSONResponse).
+# Run from NBA_API/:  python -m bench.bench_json [games] [rounds]
+import sys
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from bench import fake_stats_server
+from nba.fetch import result_set_frame
+from nba.matches import _build_games_json, games_view
+from nba.responses import FastJSONResponse
+from nba.utils import clean_nans
+
+
+def day_of_games(games):
+    date_str = "01/15/2025"
+    game_ids = fake_stats_server._game_ids_for(date_str, games)
+    log = fake_stats_server._league_game_log(
+        {"SeasonType": "Regular Season", "DateFrom": date_str, "Season": "2024-25"}, games
+    )
+    boxes = {gid: fake_stats_server._box_score({"GameID": gid}, games) for gid in game_ids}
+    return date_str, result_set_frame(log, "LeagueGameLog"), boxes
+
+
+def old_body(date_str, games_df, boxes):
+    """The pre-change path, kept here as the reference (plus the team/opponent fields added since)."""
+    games_json = {"games": []}
+    teams = games_df.groupby("GAME_ID")["TEAM_ABBREVIATION"].agg(list)
+    for _, game in games_df.iterrows():
+        box = boxes[game["GAME_ID"]]
+        players_df = result_set_frame(box, "PlayerStats")
+        players = players_df[[
+            "PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "REB", "AST",
+            "STL", "BLK", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "PLUS_MINUS"
+        ]].to_dict(orient="records")
+        team_scores = result_set_frame(box, "TeamStats")[["TEAM_ABBREVIATION", "PTS"]].to_dict(orient="records")
+        games_json["games"].append({
+            "date": date_str,
+            "matchup": game["MATCHUP"],
+            "team": game["TEAM_ABBREVIATION"],
+            "opponent": next(t for t in teams[game["GAME_ID"]] if t != game["TEAM_ABBREVIATION"]),
+            "final_score": " - ".join(str(team["PTS"]) for team in team_scores),
+            "players": players,
+        })
+    return JSONResponse(jsonable_encoder(clean_nans(games_json))).body
+
+
+def new_body(date_str, games_df, boxes):
+    return FastJSONResponse(games_view(_build_games_json(date_str, games_df, boxes))).body
+
+
+def measure(build, args, rounds):
+    cpu = time.process_time()
+    for _ in range(rounds):
+        build(*args)
+    cpu = (time.process_time() - cpu) / rounds
+
+    tracemalloc.start()
+    build(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    args = day_of_games(games)
+
+    old, new = old_body(*args), new_body(*args)
+    assert old == new, "response bytes differ"
+    assert b'"Nil"' in new  # the DNP rows went through the NaN path
+
+    print(f"{games} games, {len(new) / 1024:.0f} KiB body, identical bytes")
+    print(f"  {'path':<8}{'CPU ms':>9}{'peak KiB':>10}")
+    for name, build in (("old", old_body), ("new", new_body)):
+        cpu, peak = measure(build, args, rounds)
+        print(f"  {name:<8}{cpu * 1000:9.2f}{peak / 1024:10.0f}")
@@ -0,0 +1,68 @@
+# bench_live.py
+# Upstream calls and bytes per viewer for the live feed, as the number of SSE viewers grows.
+# Today's games in the fake league play out over a few seconds (LIVE_GAME_SECONDS).
+# Run from NBA_API/:  python -m bench.bench_live [seconds] [viewers ...]
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("NBA_STATS_RATE", "10000")
+os.environ.setdefault("NBA_STATS_BURST", "10000")
+os.environ.setdefault("NBA_CACHE_DIR", tempfile.mkdtemp(prefix="nba-bench-"))
+os.environ.setdefault("NBA_MATERIALIZE_DAYS", "0")
+
+import httpx
+
+import main
+from bench import fake_stats_server
+from bench.bench_load import serve
+from nba import live
+
+APP_PORT = 8721
+
+
+def upstream_calls(metrics_text):
+    return sum(int(line.rsplit(" ", 1)[1]) for line in metrics_text.splitlines()
+               if line.startswith("nba_upstream_requests_total{"))
+
+
+async def watch(client, seconds):
+    received = 0
+    async with client.stream("GET", "/live/stream") as response:
+        deadline = time.monotonic() + seconds
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if time.monotonic() > deadline:
+                break
+    return received
+
+
+async def run(viewers, seconds):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{APP_PORT}", timeout=60,
+                                 limits=httpx.Limits(max_connections=viewers + 5)) as client:
+        before = upstream_calls((await client.get("/metrics")).text)
+        received = await asyncio.gather(*(watch(client, seconds) for _ in range(viewers)))
+        after = upstream_calls((await client.get("/metrics")).text)
+    return after - before, sum(received) / viewers
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    counts = [int(n) for n in sys.argv[2:]] or [1, 10, 50]
+
+    fake_stats_server.use_fake_server(fake_stats_server.start_fake_server(latency=0.05, games=10))
+    live.LIVE_POLL_SECONDS = 1
+    live.VIEWER_GRACE_SECONDS = 0
+    server = serve(main.app, APP_PORT)
+
+    print(f"{seconds:.0f} s of live games per run, {live.LIVE_POLL_SECONDS} s poll interval")
+    print(f"  {'viewers':>8}{'upstream calls':>16}{'KiB per viewer':>16}")
+    for viewers in counts:
+        # Each run replays the day from the start so the runs are comparable
+        fake_stats_server._started = time.time()
+        fake_stats_server.LIVE_GAME_SECONDS = seconds * 2
+        calls, per_viewer = asyncio.run(run(viewers, seconds))
+        print(f"  {viewers:>8}{calls:>16}{per_viewer / 1024:16.1f}")
+    server.should_exit = True
@@ -0,0 +1,112 @@
+# bench_load.py
+# Concurrent-throughput comparison: the async routes in main.py against the same
+# routes as plain sync `def`s (one threadpool worker blocked per upstream call).
+# Run from NBA_API/:  python -m bench.bench_load [concurrency] [latency]
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Measure the servers, not the upstream politeness limit
+os.environ.setdefault("NBA_STATS_RATE", "10000")
+os.environ.setdefault("NBA_STATS_BURST", "10000")
+os.environ.setdefault("NBA_CACHE_DIR", tempfile.mkdtemp(prefix="nba-bench-"))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+import main
+from nba.matches import get_game_stats
+from nba.leaders import get_league_leaders
+from nba.player import get_player_stats, do_players_comparison
+from bench.fake_stats_server import use_fake_server
+
+PLAYER_IDS = [161061273700 + i for i in range(10)]
+STATS = ["PTS", "REB", "AST", "STL", "BLK"]
+
+
+def sync_app():
+    """The pre-async routes: same functions, sync `def` handlers."""
+    app = FastAPI()
+
+    @app.get("/matches-of-the-day")
+    def matches_of_the_day(days_ago: int):
+        return get_game_stats(days_ago)
+
+    @app.get("/leaders")
+    def league_leaders(stat: str, limit: int = 5):
+        return get_league_leaders(stat, limit)
+
+    @app.get("/player-stats/{player_id}")
+    def player_stats(player_id: int):
+        return get_player_stats(player_id)
+
+    @app.get("/compare-players")
+    def compare_players(player1: int, player2: int):
+        return do_players_comparison(player1, player2)
+
+    return app
+
+
+def serve(app, port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def workloads(concurrency, first_day):
+    """Per-route request mixes; many requests are identical, as on a busy homepage."""
+    return {
+        "/leaders": [f"/leaders?stat={STATS[i % len(STATS)]}&limit=10" for i in range(concurrency)],
+        "/player-stats": [f"/player-stats/{PLAYER_IDS[i % len(PLAYER_IDS)]}" for i in range(concurrency)],
+        "/compare-players": [
+            f"/compare-players?player1={PLAYER_IDS[i % 10]}&player2={PLAYER_IDS[(i + 3) % 10]}"
+            for i in range(concurrency)
+        ],
+        "/matches-of-the-day": [f"/matches-of-the-day?days_ago={first_day + i % 5}" for i in range(concurrency)],
+    }
+
+
+async def fire(port, urls):
+    limits = httpx.Limits(max_connections=len(urls))
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(url) for url in urls))
+        elapsed = time.perf_counter() - start
+    failed = [r for r in responses if r.status_code != 200]
+    assert not failed, f"{len(failed)} failed, e.g. {failed[0].url}: {failed[0].text[:200]}"
+    return elapsed
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    # The fake upstream gets its own process so it doesn't compete for our GIL
+    upstream = subprocess.Popen(
+        [sys.executable, "-m", "bench.fake_stats_server", "8700", str(latency), "10"],
+        stdout=subprocess.DEVNULL,
+    )
+    time.sleep(1.5)
+    use_fake_server("127.0.0.1:8700")
+
+    sync_server = serve(sync_app(), 8701)
+    async_server = serve(main.app, 8702)
+
+    print(f"{concurrency} concurrent requests per route, {latency * 1000:.0f} ms upstream latency")
+    print(f"  {'route':<22}{'sync req/s':>12}{'async req/s':>13}")
+    # Different dates per server so neither profits from the other's box score cache
+    sync_runs = workloads(concurrency, first_day=1)
+    async_runs = workloads(concurrency, first_day=11)
+    for route in sync_runs:
+        sync_secs = asyncio.run(fire(8701, sync_runs[route]))
+        async_secs = asyncio.run(fire(8702, async_runs[route]))
+        print(f"  {route:<22}{concurrency / sync_secs:12.1f}{concurrency / async_secs:13.1f}")
+    sync_server.should_exit = async_server.should_exit = True
+    upstream.terminate()
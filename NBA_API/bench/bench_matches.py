@@ -0,0 +1,67 @@
+# bench_matches.py
+# Offline wall-clock comparison of get_game_stats against the old serial loop.
+# Run from NBA_API/:  python -m bench.bench_matches [latency] [games]
+import sys
+import time
+from datetime import datetime, timedelta
+
+from nba_api.stats.endpoints import leaguegamelog, boxscoretraditionalv2
+from nba.matches import get_game_stats
+from nba.utils import clean_nans, get_season_string
+from bench.fake_stats_server import start_fake_server, use_fake_server
+
+
+def serial_game_stats(days_back: int):
+    """The pre-concurrency get_game_stats: one box score at a time, 0.6 s apart (plus team/opponent)."""
+    target_date = datetime.now().date() - timedelta(days=days_back)
+    date_str = target_date.strftime("%m/%d/%Y")
+    games_json = {"games": []}
+    games_df = leaguegamelog.LeagueGameLog(
+        date_from_nullable=date_str,
+        date_to_nullable=date_str,
+        season=get_season_string(target_date),
+    ).get_data_frames()[0]
+    for _, game in games_df.iterrows():
+        # The response has since gained each row's team and opponent; derived here the plain way
+        opponent = games_df[(games_df["GAME_ID"] == game["GAME_ID"])
+                            & (games_df["TEAM_ABBREVIATION"] != game["TEAM_ABBREVIATION"])]
+        time.sleep(0.6)
+        box = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game["GAME_ID"])
+        players_df = box.get_data_frames()[0]
+        stats_df = players_df[[
+            "PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "REB", "AST",
+            "STL", "BLK", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "PLUS_MINUS"
+        ]]
+        team_scores = box.get_data_frames()[1][["TEAM_ABBREVIATION", "PTS"]].to_dict(orient="records")
+        games_json["games"].append({
+            "date": date_str,
+            "matchup": game["MATCHUP"],
+            "team": game["TEAM_ABBREVIATION"],
+            "opponent": opponent["TEAM_ABBREVIATION"].iloc[0] if len(opponent) else None,
+            "final_score": " - ".join(str(team["PTS"]) for team in team_scores),
+            "players": stats_df.to_dict(orient="records"),
+        })
+    return clean_nans(games_json)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    server = start_fake_server(latency=latency, games=games)
+    use_fake_server(server)
+
+    old, old_secs = timed(serial_game_stats, 1)
+    new, new_secs = timed(get_game_stats, 1)
+
+    assert old == new, "get_game_stats output differs from the serial baseline"
+    print(f"{games} games, {latency * 1000:.0f} ms upstream latency")
+    print(f"  serial loop     : {old_secs:6.2f} s")
+    print(f"  get_game_stats  : {new_secs:6.2f} s  ({old_secs / new_secs:.1f}x faster)")
+    server.shutdown()
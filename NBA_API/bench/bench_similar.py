@@ -0,0 +1,54 @@
+# bench_similar.py
+# Build the similar-players index from 1..N synthetic league tables and time the build and
+# top-k queries (cosine and Euclidean) as the number of seasons grows.
+# The tables come from the fake stats server's generator in-process (no HTTP).
+# Run from NBA_API/:  python -m bench.bench_similar [max seasons] [queries] [k]
+import random
+import statistics
+import sys
+import time
+
+from bench import fake_stats_server
+from nba.fetch import result_set_frame
+from nba.similar import _query, build_index
+
+
+def league_tables(count):
+    tables = {}
+    for year in range(2024, 2024 - count, -1):
+        season = f"{year}-{str(year + 1)[-2:]}"
+        tables[season] = result_set_frame(fake_stats_server._league_leaders({"Season": season}, 0),
+                                          "LeagueLeaders")
+    return tables
+
+
+def timed(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+if __name__ == "__main__":
+    max_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    k = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    all_tables = league_tables(max_seasons)
+    build_index(dict(list(all_tables.items())[:1]))  # numpy/pandas warm-up
+    print(f"  {'seasons':>7}{'vectors':>9}{'build ms':>10}{'cosine p50':>12}{'p99':>8}{'euclid p50':>12}{'p99':>8}   (query ms)")
+    for count in sorted({1, 2, 5, 10, max_seasons}):
+        if count > max_seasons:
+            continue
+        tables = dict(list(all_tables.items())[:count])
+        build = statistics.median(timed(lambda: build_index(tables), 3)) * 1000
+        index = build_index(tables)
+        ids = random.Random(count).choices(list(index["player_ids"]), k=queries)
+        row = [f"  {count:>7}{len(index['player_ids']):>9}{build:10.1f}"]
+        for metric in ("cosine", "euclidean"):
+            it = iter(ids)
+            timings = sorted(timed(lambda: _query(index, next(it), k, metric, list(tables)), queries))
+            row.append(f"{statistics.median(timings) * 1000:12.2f}{timings[int(len(timings) * 0.99) - 1] * 1000:8.2f}")
+        print("".join(row))
@@ -0,0 +1,97 @@
+# bench_warm_start.py
+# Time from process start to the first good response of the routes people hit right after
+# a deploy, for three restarts against the same fake upstream:
+#   cold      empty cache directory
+#   restart   the previous run's on-disk stores (box scores, materialized days), no snapshot
+#   snapshot  the same, plus the warm-start snapshot the previous run saved on shutdown
+# Run from NBA_API/:  python -m bench.bench_warm_start [upstream latency]
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+UPSTREAM_PORT = 8730
+APP_PORT = 8731
+# Synthetic player ids (team_id * 100 + n) exist in the fake league
+ROUTES = {
+    "/autocomplete": "/autocomplete?prefix=ste&limit=10",
+    "/leaders": "/leaders?stat=PTS&limit=10",
+    "/player-of-the-day": "/player-of-the-day?days_ago=3",
+    "/player-stats": "/player-stats/161061273700",
+    "/search-player": "/search-player?name=atl",
+}
+
+
+def serve(port, upstream):
+    """Child process: the app, pointed at the fake upstream, on a real uvicorn server."""
+    import uvicorn
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    NBAStatsHTTP.base_url = f"http://{upstream}/stats/{{endpoint}}"
+    import main
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def first_good_responses(cache_dir):
+    """Seconds from spawn to the first 200 of each route (requested one after another)."""
+    env = dict(os.environ, NBA_CACHE_DIR=cache_dir, NBA_MATERIALIZE_DAYS="0",
+               NBA_STATS_RATE="10000", NBA_STATS_BURST="10000")
+    started = time.perf_counter()
+    app = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "-m", "bench.bench_warm_start", "--serve",
+         str(APP_PORT), f"127.0.0.1:{UPSTREAM_PORT}"],
+        env=env, stdout=subprocess.DEVNULL,
+    )
+    timings = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{APP_PORT}", timeout=60) as client:
+            while True:
+                try:
+                    client.get("/cache-stats")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            timings["listening"] = time.perf_counter() - started
+            for route, url in ROUTES.items():
+                while client.get(url).status_code != 200:
+                    time.sleep(0.05)
+                timings[route] = time.perf_counter() - started
+    finally:
+        # SIGINT lets uvicorn run the shutdown hook, which saves the snapshot
+        app.send_signal(signal.SIGINT)
+        app.wait(timeout=60)
+    return timings
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        serve(int(sys.argv[2]), sys.argv[3])
+        sys.exit(0)
+
+    latency = sys.argv[1] if len(sys.argv) > 1 else "0.2"
+    upstream = subprocess.Popen(
+        [sys.executable, "-m", "bench.fake_stats_server", str(UPSTREAM_PORT), latency, "10"],
+        stdout=subprocess.DEVNULL,
+    )
+    time.sleep(1.5)
+    cache_dir = tempfile.mkdtemp(prefix="nba-bench-")
+    try:
+        results = {"cold": first_good_responses(cache_dir)}
+        snapshot = os.path.join(cache_dir, "warm_snapshot.pickle")
+        saved = os.path.getsize(snapshot)
+        os.rename(snapshot, snapshot + ".saved")
+        results["restart"] = first_good_responses(cache_dir)
+        os.replace(snapshot + ".saved", snapshot)
+        results["snapshot"] = first_good_responses(cache_dir)
+    finally:
+        upstream.terminate()
+
+    print(f"{float(latency) * 1000:.0f} ms upstream latency, snapshot {saved / 1024:.0f} KiB; "
+          f"seconds from process start to the first 200")
+    print(f"  {'route':<20}" + "".join(f"{run:>10}" for run in results))
+    for route in ["listening"] + list(ROUTES):
+        print(f"  {route:<20}" + "".join(f"{timings[route]:10.2f}" for timings in results.values()))
@@ -0,0 +1,389 @@
+# fake_stats_server.py
+# Local stand-in for stats.nba.com so the nba/ modules can be benchmarked offline.
+import functools
+import json
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from nba_api.stats import endpoints as nba_endpoints
+from nba_api.stats.library.http import NBAStatsHTTP
+from nba.teams import all_teams
+from bench.replay import fixture_key, load_fixtures
+
+##AVAILABLE FUNCTIONS
+# start_fake_server(latency: float = 0.2, games: int = 15, port: int = 0, fixtures: str = None)
+# use_fake_server(server)
+#
+# Standalone:  python -m bench.fake_stats_server [port] [latency] [games] [fixtures dir]
+
+_TEAM_MAP = {team["team_id"]: team["abbr"] for team in all_teams()}
+_TEAM_IDS = sorted(_TEAM_MAP)
+
+_PLAYER_HEADERS = [
+    "GAME_ID", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_CITY", "PLAYER_ID", "PLAYER_NAME",
+    "START_POSITION", "COMMENT", "MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT",
+    "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS",
+    "PLUS_MINUS",
+]
+_TEAM_HEADERS = [
+    "GAME_ID", "TEAM_ID", "TEAM_NAME", "TEAM_ABBREVIATION", "TEAM_CITY", "MIN", "FGM", "FGA",
+    "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST",
+    "STL", "BLK", "TO", "PF", "PTS", "PLUS_MINUS",
+]
+_GAMELOG_HEADERS = [
+    "SEASON_ID", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_NAME", "GAME_ID", "GAME_DATE", "MATCHUP",
+    "WL", "MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT",
+    "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS", "PLUS_MINUS",
+    "VIDEO_AVAILABLE",
+]
+
+
+def _game_teams(game_id):
+    """Deterministic (home, away) team ids for a synthetic GAME_ID."""
+    n = int(game_id[-3:]) % 15
+    return _TEAM_IDS[2 * n], _TEAM_IDS[2 * n + 1]
+
+
+def _player_lines(game_id):
+    rng = random.Random(game_id)
+    rows = []
+    for team_id in _game_teams(game_id):
+        abbr = _TEAM_MAP[team_id]
+        for i in range(10):
+            fgm, fga = rng.randint(0, 12), rng.randint(12, 22)
+            fg3m, fg3a = rng.randint(0, 5), rng.randint(5, 10)
+            ftm, fta = rng.randint(0, 6), rng.randint(6, 8)
+            oreb, dreb = rng.randint(0, 4), rng.randint(0, 10)
+            pts = 2 * fgm + fg3m + ftm
+            rows.append([
+                game_id, team_id, abbr, abbr, team_id * 100 + i, f"{abbr} Player {i}",
+                "", "", "30:00", fgm, fga, round(fgm / fga, 3), fg3m, fg3a, round(fg3m / fg3a, 3),
+                ftm, fta, round(ftm / fta, 3), oreb, dreb, oreb + dreb, rng.randint(0, 12),
+                rng.randint(0, 4), rng.randint(0, 3), rng.randint(0, 5), rng.randint(0, 6), pts,
+                float(rng.randint(-20, 20)),
+            ])
+    # One DNP row per game, like the real feed (all stats null)
+    rows.append([game_id, rows[0][1], rows[0][2], rows[0][3], 99, "Bench Player", "",
+                 "DNP - Coach's Decision", None] + [None] * 19)
+    return rows
+
+
+def _team_lines(game_id):
+    players = _player_lines(game_id)
+    rows = []
+    for team_id in _game_teams(game_id):
+        abbr = _TEAM_MAP[team_id]
+        pts = sum(r[26] or 0 for r in players if r[1] == team_id)
+        rows.append([game_id, team_id, abbr, abbr, abbr, "240:00"] + [0] * 17 + [pts, 0.0])
+    return rows
+
+
+def _game_ids_for(date_str, games):
+    month, day, year = (int(x) for x in date_str.split("/"))
+    base = (year % 100) * 10000 + month * 100 + day
+    return [f"00{base % 100000:05d}{i:03d}" for i in range(games)]
+
+
+def _game_log_rows(season, day, games):
+    """Two team rows (home "vs.", away "@") per synthetic game on `day`."""
+    rows = []
+    for gid in _game_ids_for(day.strftime("%m/%d/%Y"), games):
+        home, away = _game_teams(gid)
+        team_pts = {r[1]: r[23] for r in _team_lines(gid)}
+        for team_id, matchup in (
+            (home, f"{_TEAM_MAP[home]} vs. {_TEAM_MAP[away]}"),
+            (away, f"{_TEAM_MAP[away]} @ {_TEAM_MAP[home]}"),
+        ):
+            other = away if team_id == home else home
+            wl = "W" if team_pts[team_id] > team_pts[other] else "L"
+            # Like the real feed, GAME_DATE is YYYY-MM-DD
+            rows.append(["2" + season[:4], team_id, _TEAM_MAP[team_id], _TEAM_MAP[team_id], gid,
+                         day.isoformat(), matchup, wl, 240] + [0] * 17 + [team_pts[team_id], 0, 1])
+    return rows
+
+
+def _league_game_log(params, games):
+    rows = []
+    # Only regular-season games exist in the fake league
+    if params.get("SeasonType") in (None, "", "Regular Season"):
+        day = datetime.strptime(params["DateFrom"], "%m/%d/%Y").date()
+        last = datetime.strptime(params.get("DateTo") or params["DateFrom"], "%m/%d/%Y").date()
+        while day <= last:
+            rows += _game_log_rows(params.get("Season", "2024-25"), day, games)
+            day += timedelta(days=1)
+    return {"resultSets": [{"name": "LeagueGameLog", "headers": _GAMELOG_HEADERS, "rowSet": rows}]}
+
+
+# Today's games in the fake league are "live": their box scores grow from zero to the
+# full line over this many seconds after the server starts (see bench/bench_live.py)
+LIVE_GAME_SECONDS = 120
+_started = time.time()
+
+
+def _live_progress(game_id):
+    """0..1 for today's games, None for every other date."""
+    if game_id[2:7] != _game_ids_for(date.today().strftime("%m/%d/%Y"), 1)[0][2:7]:
+        return None
+    return min(1.0, (time.time() - _started) / LIVE_GAME_SECONDS)
+
+
+def _scale_line(row, progress):
+    """A player line as it stood `progress` of the way through the game."""
+    if row[8] is None or progress >= 1:
+        return row
+    row = list(row)
+    for i in (9, 10, 12, 13, 15, 16, 18, 19, 21, 22, 23, 24, 25):
+        row[i] = int(row[i] * progress)
+    row[20] = row[18] + row[19]
+    row[26] = 2 * row[9] + row[12] + row[15]
+    row[8] = f"{int(30 * progress)}:00"
+    return row
+
+
+def _live_box_score(game_id, progress):
+    players = [_scale_line(row, progress) for row in _player_lines(game_id)]
+    teams = []
+    for row in _team_lines(game_id):
+        teams.append(row[:23] + [sum(p[26] or 0 for p in players if p[1] == row[1])] + row[24:])
+    return {"resultSets": [
+        {"name": "PlayerStats", "headers": _PLAYER_HEADERS, "rowSet": players},
+        {"name": "TeamStats", "headers": _TEAM_HEADERS, "rowSet": teams},
+    ]}
+
+
+def _scoreboard(params, games):
+    day = datetime.strptime(params["GameDate"], "%Y-%m-%d").date()
+    game_header = nba_endpoints.ScoreboardV2.expected_data["GameHeader"]
+    line_score = nba_endpoints.ScoreboardV2.expected_data["LineScore"]
+    headers, lines = [], []
+    for seq, gid in enumerate(_game_ids_for(day.strftime("%m/%d/%Y"), games), start=1):
+        home, away = _game_teams(gid)
+        progress = _live_progress(gid)
+        if progress is None or progress >= 1:
+            status, text, teams = 3, "Final", _team_lines(gid)
+        else:
+            status, text = 2, f"Q{1 + int(progress * 4)}"
+            teams = _live_box_score(gid, progress)["resultSets"][1]["rowSet"]
+        header = dict(GAME_DATE_EST=f"{day}T00:00:00", GAME_SEQUENCE=seq, GAME_ID=gid,
+                      GAME_STATUS_ID=status, GAME_STATUS_TEXT=text, HOME_TEAM_ID=home,
+                      VISITOR_TEAM_ID=away)
+        headers.append([header.get(h) for h in game_header])
+        for row in teams:
+            line = dict(GAME_ID=gid, TEAM_ID=row[1], TEAM_ABBREVIATION=row[3], PTS=row[23])
+            lines.append([line.get(h) for h in line_score])
+    return {"resultSets": [
+        {"name": "GameHeader", "headers": game_header, "rowSet": headers},
+        {"name": "LineScore", "headers": line_score, "rowSet": lines},
+    ]}
+
+
+def _box_score(params, games):
+    gid = params["GameID"]
+    return {"resultSets": [
+        {"name": "PlayerStats", "headers": _PLAYER_HEADERS, "rowSet": _player_lines(gid)},
+        {"name": "TeamStats", "headers": _TEAM_HEADERS, "rowSet": _team_lines(gid)},
+    ]}
+
+
+def _box_summary(params, games):
+    gid = params["GameID"]
+    home, away = _game_teams(gid)
+    team_pts = {r[1]: r[23] for r in _team_lines(gid)}
+    return {"resultSets": [
+        {"name": "GameSummary",
+         "headers": ["GAME_ID", "GAME_STATUS_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID"],
+         "rowSet": [[gid, 3, home, away]]},
+        {"name": "LineScore",
+         "headers": ["GAME_ID", "TEAM_ID", "TEAM_ABBREVIATION", "PTS"],
+         "rowSet": [[gid, t, _TEAM_MAP[t], team_pts[t]] for t in (away, home)]},
+    ]}
+
+
+def _season_totals(player_id, season):
+    """Deterministic season totals for a synthetic player."""
+    rng = random.Random(f"{player_id}-{season}")
+    gp = rng.randint(20, 82)
+    per_game = {
+        "FGM": rng.uniform(1, 11), "FG3M": rng.uniform(0, 4), "FTM": rng.uniform(0, 7),
+        "OREB": rng.uniform(0, 4), "DREB": rng.uniform(1, 10), "AST": rng.uniform(0, 10),
+        "STL": rng.uniform(0, 2), "BLK": rng.uniform(0, 2.5), "TOV": rng.uniform(0.5, 4),
+        "PF": rng.uniform(1, 4),
+    }
+    per_game["FGA"] = per_game["FGM"] * rng.uniform(1.8, 2.4)
+    per_game["FG3A"] = per_game["FG3M"] * rng.uniform(2.4, 3.2)
+    per_game["FTA"] = per_game["FTM"] * rng.uniform(1.1, 1.4)
+    totals = {k: round(v * gp) for k, v in per_game.items()}
+    totals["GP"] = gp
+    totals["MIN"] = round(gp * rng.uniform(12, 38))
+    totals["REB"] = totals["OREB"] + totals["DREB"]
+    totals["PTS"] = 2 * totals["FGM"] + totals["FG3M"] + totals["FTM"]
+    for made, att, pct in (("FGM", "FGA", "FG_PCT"), ("FG3M", "FG3A", "FG3_PCT"), ("FTM", "FTA", "FT_PCT")):
+        totals[pct] = round(totals[made] / totals[att], 3) if totals[att] else 0.0
+    return totals
+
+
+def _league_players():
+    return [(team_id * 100 + i, team_id) for team_id in _TEAM_IDS for i in range(10)]
+
+
+def _league_leaders(params, games):
+    season = params.get("Season", "2024-25")
+    stat = params.get("StatCategory", "PTS")
+    headers = nba_endpoints.LeagueLeaders.expected_data["LeagueLeaders"]
+    rows = []
+    for pid, team_id in _league_players():
+        t = _season_totals(pid, season)
+        gp = t["GP"]
+        row = {k: (t[k] if k == "GP" or k.endswith("PCT") else round(t[k] / gp, 1)) for k in t}
+        row.update(PLAYER_ID=pid, PLAYER=f"{_TEAM_MAP[team_id]} Player {pid % 100}",
+                   TEAM=_TEAM_MAP[team_id], EFF=0.0, AST_TOV=0.0, STL_TOV=0.0)
+        rows.append(row)
+    rows.sort(key=lambda r: r.get(stat, 0), reverse=True)
+    for rank, row in enumerate(rows, start=1):
+        row["RANK"] = rank
+    return {"resultSet": {"name": "LeagueLeaders", "headers": headers,
+                          "rowSet": [[row.get(h) for h in headers] for row in rows]}}
+
+
+def _career_stats(params, games):
+    pid = int(params["PlayerID"])
+    team_id = pid // 100 if pid // 100 in _TEAM_MAP else _TEAM_IDS[0]
+    headers = nba_endpoints.PlayerCareerStats.expected_data["SeasonTotalsRegularSeason"]
+    rows = []
+    for year in range(2015, 2027):
+        season = f"{year}-{str(year + 1)[-2:]}"
+        t = _season_totals(pid, season)
+        t.update(PLAYER_ID=pid, SEASON_ID=season, LEAGUE_ID="00", TEAM_ID=team_id,
+                 TEAM_ABBREVIATION=_TEAM_MAP[team_id], PLAYER_AGE=20.0 + year - 2015,
+                 GS=t["GP"] // 2)
+        rows.append([t.get(h) for h in headers])
+    return {"resultSets": [{"name": "SeasonTotalsRegularSeason", "headers": headers, "rowSet": rows}]}
+
+
+def _fill_expected(endpoint, payload):
+    """Add empty result sets for anything nba_api expects but the fake doesn't model."""
+    endpoint_cls = next(
+        (getattr(nba_endpoints, name) for name in dir(nba_endpoints)
+         if getattr(getattr(nba_endpoints, name), "endpoint", None) == endpoint),
+        None,
+    )
+    expected = getattr(endpoint_cls, "expected_data", {})
+    if "resultSet" in payload:
+        return payload
+    present = {rs["name"] for rs in payload["resultSets"]}
+    for name, headers in expected.items():
+        if name not in present:
+            payload["resultSets"].append({"name": name, "headers": headers, "rowSet": []})
+    return payload
+
+
+def _all_players(params, games):
+    rows = [
+        [team_id * 100 + i, f"Player {i}, {abbr}", f"{abbr} Player {i}", 1, "2015", "2025",
+         "", "", team_id, abbr, abbr, abbr, abbr.lower(), abbr.lower(), "Y", "00"]
+        for team_id, abbr in _TEAM_MAP.items() for i in range(10)
+    ]
+    headers = nba_endpoints.CommonAllPlayers.expected_data["CommonAllPlayers"]
+    return {"resultSets": [{"name": "CommonAllPlayers", "headers": headers, "rowSet": rows}]}
+
+
+def _player_info(params, games):
+    pid = int(params["PlayerID"])
+    team_id = pid // 100 if pid // 100 in _TEAM_MAP else _TEAM_IDS[0]
+    abbr = _TEAM_MAP[team_id]
+    headers = nba_endpoints.CommonPlayerInfo.expected_data["CommonPlayerInfo"]
+    row = dict(PERSON_ID=pid, DISPLAY_FIRST_LAST=f"{abbr} Player {pid % 100}", TEAM_ID=team_id,
+               TEAM_ABBREVIATION=abbr, TEAM_CITY=abbr, TEAM_NAME=abbr, ROSTERSTATUS="Active")
+    return {"resultSets": [{"name": "CommonPlayerInfo", "headers": headers,
+                            "rowSet": [[row.get(h) for h in headers]]}]}
+
+
+_HANDLERS = {
+    "leaguegamelog": _league_game_log,
+    "boxscoretraditionalv2": _box_score,
+    "boxscoresummaryv2": _box_summary,
+    "commonallplayers": _all_players,
+    "leagueleaders": _league_leaders,
+    "playercareerstats": _career_stats,
+    "commonplayerinfo": _player_info,
+    "scoreboardv2": _scoreboard,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _response_body(endpoint, params, games):
+    # Payloads are deterministic, so build each one once and keep the server cheap
+    return json.dumps(_fill_expected(endpoint, _HANDLERS[endpoint](dict(params), games))).encode()
+
+
+def start_fake_server(latency: float = 0.2, games: int = 15, port: int = 0, fixtures: str = None):
+    """
+    Start a threaded fake stats server in the background.
+    Every response is delayed by `latency` seconds to mimic stats.nba.com.
+    With `fixtures` (a directory written by bench.replay), recorded responses are
+    replayed and only requests that were never recorded get synthetic data.
+    """
+    recorded = load_fixtures(fixtures) if fixtures else {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            endpoint = url.path.rstrip("/").split("/")[-1].lower()
+            params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+            time.sleep(latency)
+            body = recorded.get(fixture_key(endpoint, params))
+            if body is None and endpoint not in _HANDLERS:
+                self.send_error(404, f"Unknown endpoint {endpoint}")
+                return
+            if body is None and endpoint in ("scoreboardv2", "boxscoretraditionalv2"):
+                # Live games change between calls, so they can't come from the cache
+                gid = params.get("GameID") or _game_ids_for(
+                    datetime.strptime(params["GameDate"], "%Y-%m-%d").strftime("%m/%d/%Y"), 1)[0]
+                progress = _live_progress(gid)
+                if progress is not None and progress < 1:
+                    payload = (_scoreboard(params, games) if endpoint == "scoreboardv2"
+                               else _live_box_score(gid, progress))
+                    body = json.dumps(_fill_expected(endpoint, payload)).encode()
+            if body is None:
+                body = _response_body(endpoint, tuple(sorted(params.items())), games)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def use_fake_server(server):
+    """Point nba_api at the fake server (a server object or "host:port") instead of stats.nba.com."""
+    if isinstance(server, str):
+        address = server
+    else:
+        address = "{}:{}".format(*server.server_address[:2])
+    NBAStatsHTTP.base_url = f"http://{address}/stats/{{endpoint}}"
+
+
+if __name__ == "__main__":
+    # Standalone:  python -m bench.fake_stats_server [port] [latency] [games]
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8700
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    games = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+    fixtures = sys.argv[4] if len(sys.argv) > 4 else None
+    server = start_fake_server(latency=latency, games=games, port=port, fixtures=fixtures)
+    print(f"Fake stats server on http://127.0.0.1:{port} ({latency * 1000:.0f} ms latency)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
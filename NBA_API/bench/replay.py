@@ -0,0 +1,134 @@
+# replay.py
+# Record real stats.nba.com responses into fixture files, so the fake stats server can
+# replay them offline (python -m bench.fake_stats_server 8700 0.2 15 <fixtures dir>).
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP
+
+##AVAILABLE FUNCTIONS
+# fixture_key(endpoint: str, params: dict)
+# load_fixtures(fixtures_dir: str)
+# start_recorder(fixtures_dir: str = FIXTURES_DIR, port: int = 0)
+# record_session(fixtures_dir: str = FIXTURES_DIR, days_ago=(1,), player_ids=RECORD_PLAYER_IDS)
+#
+# CLI:  python -m bench.replay [fixtures dir] [days_ago ...]
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+# Where the recorder forwards to (captured before anything points nba_api elsewhere)
+UPSTREAM_URL = NBAStatsHTTP.base_url
+# LeBron James, Stephen Curry, Nikola Jokic: enough for player-stats / compare / search
+RECORD_PLAYER_IDS = (2544, 201939, 203999)
+
+
+def fixture_key(endpoint, params):
+    """File name for one (endpoint, query) pair; the same for the recorder and the fake server."""
+    query = json.dumps(sorted(params.items()), separators=(",", ":"))
+    return f"{endpoint.lower()}-{hashlib.sha1(query.encode()).hexdigest()[:16]}.json"
+
+
+def load_fixtures(fixtures_dir):
+    """{fixture file name: response body bytes} for every recorded response."""
+    fixtures = {}
+    if not os.path.isdir(fixtures_dir):
+        return fixtures
+    for name in os.listdir(fixtures_dir):
+        if name.endswith(".json"):
+            with open(os.path.join(fixtures_dir, name)) as f:
+                fixtures[name] = json.dumps(json.load(f)["response"]).encode()
+    return fixtures
+
+
+def _save(fixtures_dir, endpoint, params, response):
+    path = os.path.join(fixtures_dir, fixture_key(endpoint, params))
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"endpoint": endpoint, "params": params, "response": response}, f)
+    os.replace(tmp, path)
+
+
+def start_recorder(fixtures_dir: str = FIXTURES_DIR, port: int = 0):
+    """
+    Start a recording proxy in the background: every request is forwarded to stats.nba.com
+    and the JSON response is written to `fixtures_dir` before being passed back.
+    Point nba_api at it with bench.fake_stats_server.use_fake_server(server).
+    """
+    os.makedirs(fixtures_dir, exist_ok=True)
+    session = requests.Session()
+    session.headers.update(NBAStatsHTTP.headers)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            endpoint = url.path.rstrip("/").split("/")[-1]
+            params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+            try:
+                response = session.get(UPSTREAM_URL.format(endpoint=endpoint), params=params, timeout=30)
+                response.raise_for_status()
+                payload = response.json()
+            except Exception as e:
+                print(f"   Could not record {endpoint}: {e}")
+                self.send_error(502, str(e))
+                return
+            _save(fixtures_dir, endpoint, params, payload)
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def record_session(fixtures_dir: str = FIXTURES_DIR, days_ago=(1,), player_ids=RECORD_PLAYER_IDS):
+    """
+    Run the nba/ entry points once through the recorder, capturing LeagueGameLog,
+    BoxScoreTraditionalV2, BoxScoreSummaryV2, LeagueLeaders, PlayerCareerStats,
+    CommonAllPlayers and CommonPlayerInfo responses for the given days and players.
+    """
+    from bench.fake_stats_server import use_fake_server
+    from nba.matches import get_game_stats
+    from nba.player_of_the_day import get_player_of_the_day
+    from nba.leaders import get_league_leaders
+    from nba.player import get_player_stats, do_player_search
+    from nba.rosters import _team_from_player_info
+
+    server = start_recorder(fixtures_dir)
+    use_fake_server(server)
+    try:
+        for days in days_ago:
+            get_game_stats(days)
+            get_player_of_the_day(days)
+        get_league_leaders("PTS")
+        for pid in player_ids:
+            get_player_stats(pid)
+            # CommonPlayerInfo is only used when the roster snapshot is missing
+            _team_from_player_info(pid)
+        do_player_search("lebron")
+    finally:
+        server.shutdown()
+        NBAStatsHTTP.base_url = UPSTREAM_URL
+    print(f"{len(load_fixtures(fixtures_dir))} fixtures in {fixtures_dir}")
+
+
+if __name__ == "__main__":
+    # CLI:  python -m bench.replay [fixtures dir] [days_ago ...]
+    # Start from empty caches so every upstream call actually goes through the recorder
+    os.environ.setdefault("NBA_CACHE_DIR", tempfile.mkdtemp(prefix="nba-record-"))
+    target = sys.argv[1] if len(sys.argv) > 1 else FIXTURES_DIR
+    days = [int(d) for d in sys.argv[2:]] or [1]
+    record_session(target, days_ago=days)
@@ -3,18 +3,58 @@ from fastapi import (
     HTTPException,
     Query,)
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime, timedelta
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
 import time
 from fastapi.encoders import jsonable_encoder
 import json
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
-from nba.matches import get_game_stats
-from nba.leaders import get_league_leaders
-from nba.player_of_the_day import get_player_of_the_day
-from nba.player import (do_player_search, do_players_comparison, do_players_autocomplete, get_player_stats)
+from nba.matches import iter_game_stats_async, iter_game_stats_range_async
+from nba.leaders import get_league_leaders_async
+from nba.player_of_the_day import get_player_of_the_day_async, iter_player_of_the_day_range_async
+from nba.day_summary import get_day_summary_async, matches_view, player_of_the_day_view
+from nba.player import (do_player_search_async, do_players_comparison_async, do_players_autocomplete, get_player_stats_async,
+                        compare_players_batch_async)
+from nba.stats_client import close_stats_client
+from nba.materialize import get_or_compute_async, read_materialized, start_materializer
+from nba.boxscores import cache_stats
+from nba.name_index import get_name_index
+from nba.rosters import start_roster_refresher
+from nba.metrics import MetricsMiddleware, render as render_metrics
+from nba.responses import FastJSONResponse, dumps
+from nba.live import get_live_tracker
+from nba.teams import all_teams, get_team
+from nba.seasons import current_season, season_bounds, season_for
+from nba.history import best_performances, history_stats, streaks, team_history
+from nba.snapshot import load_snapshot, save_snapshot, warm_imports
+from nba.route_cache import RouteCacheMiddleware, route_cache_stats
+from nba.similar import get_similar_players_async
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick up the caches the previous process left behind, then pull in pandas & co. off the
+    # critical path (the modules import them lazily)
+    restored = load_snapshot()
+    if restored:
+        print(f"Restored {', '.join(restored)} from the warm-start snapshot")
+    warm_imports()
+    # Build the autocomplete name index before the first keystroke arrives
+    get_name_index()
+    # Keep the player -> team snapshot used by /search-player fresh
+    start_roster_refresher()
+    # Precompute matches / player of the day for recent finished dates, then nightly
+    start_materializer()
+    yield
+    await close_stats_client()
+    try:
+        save_snapshot()
+    except Exception as e:
+        print(f"Could not save the warm-start snapshot: {e}")
+
+app = FastAPI(lifespan=lifespan)
 
 # 1. List of allowed origins (your front-end URL)
 origins = [
@@ -24,7 +64,31 @@ origins = [
     "http://127.0.0.1:51711"
 ]
 
-# 2. Add the middleware
+# Per-route response cache: (fresh seconds, extra seconds served stale while refreshing).
+# Live feeds, streams and the stats endpoints themselves are never cached.
+ROUTE_CACHE_TTLS = {
+    "/search-player": (600, 6 * 3600),
+    "/player-stats/{player_id}": (600, 6 * 3600),
+    "/player-of-the-day": (300, 3600),
+    "/matches-of-the-day": (60, 600),
+    "/day-summary": (60, 600),
+    "/compare-players": (600, 6 * 3600),
+    "/compare": (600, 6 * 3600),
+    "/similar-players/{player_id}": (600, 6 * 3600),
+    "/leaders": (600, 6 * 3600),
+    "/autocomplete": (3600, 24 * 3600),
+    "/teams": (24 * 3600, 7 * 24 * 3600),
+    "/teams/{team}": (24 * 3600, 7 * 24 * 3600),
+    "/history": (60, 3600),
+    "/history/best-performances": (60, 3600),
+    "/history/streaks": (60, 3600),
+    "/history/teams/{team}": (60, 3600),
+}
+# Routes whose days_ago means a different date after midnight (see RouteCacheMiddleware)
+ROUTE_CACHE_DATED = ("/player-of-the-day", "/matches-of-the-day", "/day-summary")
+
+# 2. Add the middleware (the route cache sits inside CORS, so cached answers get CORS headers too)
+app.add_middleware(RouteCacheMiddleware, ttls=ROUTE_CACHE_TTLS, dated=ROUTE_CACHE_DATED)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,            # ← only these OR ["*"] to allow any
@@ -33,8 +97,50 @@ app.add_middleware(
     allow_headers=["*"],              # or specify only the headers you need
 )
 
+# 3. Per-route latency histograms (see /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Longest start_date/end_date range the day-by-day endpoints accept
+MAX_RANGE_DAYS = 31
+# mode= of the stats endpoints (see nba/derived_stats.py)
+MODE_PATTERN = "^(totals|per_game|per_36|advanced)$"
+# formula= of /player-of-the-day (see nba/scoring.py)
+FORMULA_PATTERN = "^(pra|game_score|fantasy)$"
+
+
+def _check_range(start_date, end_date):
+    if start_date is None or end_date is None:
+        raise HTTPException(status_code=400, detail="start_date and end_date must be given together.")
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date.")
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Ranges are limited to {MAX_RANGE_DAYS} days.")
+
+
+def _ndjson(items):
+    """Stream an async generator as NDJSON, one line per item."""
+    async def lines():
+        async for item in items:
+            yield dumps(item) + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _sse(items, event=None):
+    """
+    Stream an async generator as server-sent events, then a final `done` event.
+    Without `event`, the generator yields (event, data) pairs.
+    """
+    async def events():
+        async for item in items:
+            name, data = (event, item) if event else item
+            yield b"event: " + name.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+        yield b"event: done\ndata: {}\n\n"
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
 @app.get("/search-player")
-def search_player(name: str = Query(..., description="Full or partial player name")):
+async def search_player(name: str = Query(..., description="Full or partial player name")):
     """
     Search for players whose names contain the given string (case‐insensitive).
     Returns a list of matching players with:
@@ -44,7 +150,7 @@ def search_player(name: str = Query(..., description="Full or partial player nam
     """
     try:
         print(f"Retriving {name}'s details...")
-        results = do_player_search(name)
+        results = await do_player_search_async(name)
         return results
     except Exception as exc:
         raise HTTPException(
@@ -53,15 +159,21 @@ def search_player(name: str = Query(..., description="Full or partial player nam
         )
 
 @app.get("/player-stats/{player_id}")
-def player_stats(player_id: int):
+async def player_stats(
+    player_id: int,
+    mode: str = Query("totals", pattern=MODE_PATTERN,
+                      description="per_game, per_36 or advanced add those numbers as `derived`"),
+):
     """
     Returns the current season stats for the requested player_id.
     Uses PlayerCareerStats to fetch per‐season splits and filters for the 2024-25 season.
     If no row for 2024-25 is found, returns a 404.
+    With mode=per_game / per_36 / advanced (TS%, eFG%, usage estimate...), the raw totals
+    come with a `derived` object of those numbers.
     """
     try:
         print(f"Retriving {player_id}'s stats...")
-        results = get_player_stats(player_id)
+        results = await get_player_stats_async(player_id, mode)
         return results
     except Exception as exc:
         raise HTTPException(
@@ -72,19 +184,38 @@ def player_stats(player_id: int):
 
 
 @app.get("/player-of-the-day")
-def player_of_the_day(days_ago: int = 155):#!!CHANGE int= BACK TO 1 AFTER TESTING
+async def player_of_the_day(
+    days_ago: int = 155,#!!CHANGE int= BACK TO 1 AFTER TESTING
+    formula: str = Query("pra", pattern=FORMULA_PATTERN, description="Scoring formula: pra, game_score or fantasy"),
+    top: int = Query(1, ge=1, le=50, description="Also list the top N players of the day"),
+    start_date: Optional[date] = Query(None, description="Range mode: first date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Range mode: last date (YYYY-MM-DD)"),
+):
     """
     Returns the “best” player of a given day (default = yesterday),
     across Regular Season, Playoffs, and In-Season Tournament games.
-    The “best” player is determined by the sum of (PTS + REB + AST).
+    The “best” player is determined by the sum of (PTS + REB + AST),
+    or by Game Score / fantasy points when `formula` says so.
     Response includes:
       - player’s name, team, points, rebounds, assists
       - opponent team abbreviation
       - final score in the format “TEAM_A @ TEAM_B: A_SCORE–B_SCORE”
+      - top_players (only when top > 1)
+    With start_date/end_date, streams one such result per day as NDJSON instead.
     """
+    if start_date is not None or end_date is not None:
+        _check_range(start_date, end_date)
+        print(f"Retriving players of the day...")
+        return _ndjson(iter_player_of_the_day_range_async(start_date, end_date, formula=formula, top_n=top))
     try:
         print(f"Retriving player of the day...")
-        results = get_player_of_the_day(days_ago)
+        if formula == "pra" and top == 1:
+            # The homepage view over the day summary (materialized for finished dates)
+            results = player_of_the_day_view(await get_or_compute_async(
+                "day_summary", days_ago, lambda: get_day_summary_async(days_ago)
+            ))
+        else:
+            results = await get_player_of_the_day_async(days_ago, formula=formula, top_n=top)
         return results
     except Exception as exc:
         raise HTTPException(
@@ -94,21 +225,131 @@ def player_of_the_day(days_ago: int = 155):#!!CHANGE int= BACK TO 1 AFTER TESTIN
 
 
 @app.get("/matches-of-the-day")
-def matches_of_the_day(days_ago: int = 155):
+async def matches_of_the_day(
+    days_ago: int = 155,
+    format: str = Query("records", pattern="^(records|columnar)$",
+                        description="columnar = each game's players as {columns, rows}"),
+    start_date: Optional[date] = Query(None, description="Range mode: first date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Range mode: last date (YYYY-MM-DD)"),
+):
+    """
+    Every game of a day with its final score and player lines.
+    With start_date/end_date, streams one {"date", "games"} object per day as NDJSON.
+    format=columnar sends each game's players as {"columns": [...], "rows": [[...]]},
+    without repeating the column names for every player.
+    """
+    if start_date is not None or end_date is not None:
+        _check_range(start_date, end_date)
+        print(f"Retriving matches...")
+        return _ndjson(iter_game_stats_range_async(start_date, end_date, columnar=format == "columnar"))
     try:
         print(f"Retriving today's matches...")
-        results = get_game_stats(days_ago)
-        return results
+        results = await get_or_compute_async(
+            "day_summary", days_ago, lambda: get_day_summary_async(days_ago)
+        )
+        # Every player line of the day: serialize it once, without jsonable_encoder's copy
+        return FastJSONResponse(matches_view(results, columnar=format == "columnar"))
     except Exception as exc:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve matches today: {str(exc)}"
         )
 
+@app.get("/day-summary")
+async def day_summary(
+    days_ago: int = 155,
+    format: str = Query("records", pattern="^(records|columnar)$",
+                        description="columnar = each game's players as {columns, rows}"),
+):
+    """
+    Everything about one day in one response: the games of /matches-of-the-day,
+    the /player-of-the-day result and the day's top 5 single-game lines in
+    PTS, REB, AST, STL, BLK and FG3M. Each box score is fetched once for all three.
+    """
+    try:
+        print(f"Retriving the day summary...")
+        results = await get_or_compute_async(
+            "day_summary", days_ago, lambda: get_day_summary_async(days_ago)
+        )
+        return FastJSONResponse({**results, **matches_view(results, columnar=format == "columnar")})
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve the day summary: {str(exc)}"
+        )
+
+@app.get("/matches-of-the-day/stream")
+async def matches_of_the_day_stream(
+    days_ago: int = 155,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson or sse"),
+):
+    """
+    The games of /matches-of-the-day, one at a time as each box score arrives
+    (NDJSON lines or server-sent `game` events), so the first game shows up
+    after one upstream round-trip instead of after the whole day.
+    """
+    print(f"Streaming today's matches...")
+    target_date = (datetime.now() - timedelta(days=days_ago)).date()
+
+    async def games():
+        stored = read_materialized("day_summary", target_date)
+        if stored is not None:
+            for game in matches_view(stored)["games"]:
+                yield game
+            return
+        async for game in iter_game_stats_async(days_ago):
+            yield game
+
+    return _sse(games(), "game") if format == "sse" else _ndjson(games())
+
+@app.get("/live")
+async def live_updates(
+    since: int = Query(0, ge=0, description="Last version you have; 0 = send a full snapshot"),
+    timeout: float = Query(25, ge=0, le=30, description="Seconds to wait for a change"),
+):
+    """
+    Long-poll view of today's games. Returns the full snapshot for since=0, otherwise
+    only the per-player changes (new totals + deltas) after `since`, waiting up to
+    `timeout` seconds for one. Every viewer shares the same background poller.
+    """
+    try:
+        return FastJSONResponse(await get_live_tracker().updates(since, timeout))
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve live games: {str(exc)}"
+        )
+
+@app.get("/live/stream")
+async def live_stream():
+    """
+    Today's games as server-sent events: one `snapshot`, then an `update` event per
+    changed game (changed players only, with deltas), and `ping` keep-alives.
+    """
+    print(f"Streaming live games...")
+    return _sse(get_live_tracker().subscribe())
+
+@app.get("/cache-stats")
+async def box_score_cache_stats():
+    """
+    Hit/miss counters for the local box score store, plus the route cache's size.
+    """
+    return {**cache_stats(), "route_cache": route_cache_stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Route latencies, upstream calls per nba_api endpoint, rate-limit waits and
+    cache hit ratios in the Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.get("/compare-players")
-def compare_players(
+async def compare_players(
     player1: int = Query(..., description="First player’s NBA ID"),
     player2: int = Query(..., description="Second player’s NBA ID"),
+    mode: str = Query("totals", pattern=MODE_PATTERN,
+                      description="per_game, per_36 or advanced add those numbers as `derived`"),
 ):
     """
     Compare two players’ per-game averages for the *current* season.
@@ -116,7 +357,27 @@ def compare_players(
     """
     try:
         print(f"Retriving players' stats...")
-        results = do_players_comparison(player1, player2)
+        results = await do_players_comparison_async(player1, player2, mode)
+        return results
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve players' stats: {str(exc)}"
+        )
+
+@app.get("/compare")
+async def compare_many_players(
+    player_ids: List[int] = Query(..., min_length=2, max_length=10, description="2 to 10 NBA player IDs"),
+    mode: str = Query("per_game", pattern=MODE_PATTERN, description="totals, per_game, per_36 or advanced"),
+):
+    """
+    Compare 2-10 players’ per-game averages (or `mode` numbers) for the *current* season in one call.
+    Every player gets the same columns, in the order the IDs were given.
+    Players already looked up recently are served from cache.
+    """
+    try:
+        print(f"Retriving players' stats...")
+        results = await compare_players_batch_async(player_ids, mode)
         return results
     except Exception as exc:
         raise HTTPException(
@@ -125,27 +386,156 @@ def compare_players(
         )
 
 
+@app.get("/similar-players/{player_id}")
+async def similar_players(
+    player_id: int,
+    k: int = Query(10, ge=1, le=50, description="Number of similar player-seasons to return"),
+    metric: str = Query("cosine", pattern="^(cosine|euclidean)$", description="cosine or euclidean"),
+    seasons: int = Query(1, ge=1, le=10, description="Search this many seasons back (1 = current only)"),
+):
+    """
+    The `k` player-seasons whose per-36 production and shooting efficiency are closest to
+    the player's latest season (cosine: higher score is closer; euclidean: lower is closer).
+    Returns a 404 if the player has no qualifying season in the searched seasons.
+    """
+    try:
+        print(f"Retriving players similar to {player_id}...")
+        results = await get_similar_players_async(player_id, k, metric, seasons)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to find similar players: {str(exc)}"
+        )
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"No qualifying season for player {player_id}.")
+    return results
+
+
 @app.get("/leaders")
-def league_leaders(
+async def league_leaders(
     stat: str = Query(..., description="Stat category (e.g., PTS, REB, AST, BLK, STL, FG3M, etc.)"),
-    limit: int = Query(5, description="Number of top players to return"),
+    limit: int = Query(5, ge=1, description="Number of top players to return"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc = highest first"),
+    min_games: int = Query(0, ge=0, description="Only players with at least this many games"),
+    mode: str = Query("per_game", pattern=MODE_PATTERN,
+                      description="Rank totals, per_36 numbers or advanced stats (TS_PCT, EFG_PCT, USG_PCT...)"),
 ):
     """
     Returns the top `limit` players for the current season’s Regular Season, 
     ranked by the given stat category (per game).
+    Composite categories like PTS+REB+AST (or PRA / STOCKS) are accepted too.
     """
     try:
         print(f"Retriving league leaders in {stat}...")
-        results = get_league_leaders(stat, limit)
+        results = await get_league_leaders_async(stat, limit, ascending=order == "asc", min_games=min_games,
+                                                 mode=mode)
         return results
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve league leaders in {stat}: {str(exc)}"
         )
 
+@app.get("/teams")
+async def teams(
+    conference: Optional[str] = Query(None, pattern="^(?i)(east|west)$", description="East or West"),
+):
+    """Every team with its id, abbreviation, name and conference (from the local team index)."""
+    return {"teams": all_teams(conference)}
+
+@app.get("/teams/{team}")
+async def team(team: str):
+    """One team by id, abbreviation, full name or nickname."""
+    found = get_team(team)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Unknown team: {team}")
+    return found
+
+@app.get("/season")
+async def season(day: Optional[date] = Query(None, alias="date", description="Defaults to today")):
+    """The season a date belongs to, with its first and last day."""
+    if day is None:
+        name, (start, end) = current_season()
+    else:
+        name = season_for(day)
+        start, end = season_bounds(name)
+    return {"season": name, "start": start, "end": end}
+
+# The /history routes are plain def: their SQLite queries block, so FastAPI runs them on its
+# threadpool instead of the event loop
+@app.get("/history")
+def history():
+    """What the local history store holds: games and player lines per season."""
+    return history_stats()
+
+@app.get("/history/best-performances")
+def history_best_performances(
+    stat: str = Query("PRA", description="Box score stat, composite (PRA, STOCKS) or sum like PTS+AST"),
+    season: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="e.g. 2024-25; defaults to the current season"),
+    limit: int = Query(10, ge=1, le=100),
+    team: Optional[str] = Query(None, description="Only this team (id, abbreviation or name)"),
+    season_type: Optional[str] = Query(None, description="e.g. Regular Season, Playoffs"),
+):
+    """Best single-game performances of a season, from finished games already ingested."""
+    abbr = _team_abbr_or_404(team)
+    try:
+        return best_performances(stat, season, limit, abbr, season_type)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to query best performances in {stat}: {str(exc)}"
+        )
+
+@app.get("/history/streaks")
+def history_streaks(
+    stat: str = Query("PTS", description="Box score stat, composite or sum like PTS+AST"),
+    threshold: float = Query(30, description="Minimum value in every game of the streak"),
+    season: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Defaults to the current season"),
+    limit: int = Query(10, ge=1, le=100),
+    team: Optional[str] = Query(None, description="Only this team (id, abbreviation or name)"),
+):
+    """Longest runs of consecutive games at or above `threshold` in `stat`."""
+    abbr = _team_abbr_or_404(team)
+    try:
+        return streaks(stat, threshold, season, limit, abbr)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to query streaks in {stat}: {str(exc)}"
+        )
+
+@app.get("/history/teams/{team}")
+def history_team(
+    team: str,
+    season: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Defaults to the current season"),
+    limit: int = Query(5, ge=1, le=50),
+):
+    """A team's record, leading scorers and best games over the ingested games of a season."""
+    abbr = _team_abbr_or_404(team)
+    try:
+        return team_history(abbr, season, limit)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to query history for {team}: {str(exc)}"
+        )
+
+def _team_abbr_or_404(team):
+    if team is None:
+        return None
+    found = get_team(team)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Unknown team: {team}")
+    return found["abbr"]
+
 @app.get("/autocomplete")
-def autocomplete_players(
+async def autocomplete_players(
     prefix: str = Query(..., min_length=1, description="Name prefix to search"),
     limit: int = Query(10, ge=1, le=50, description="Max number of suggestions")
 ):
@@ -0,0 +1,158 @@
+# boxscores.py
+import asyncio
+import os
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from nba.fetch import call_endpoint, fetch_all
+from nba.stats_client import get_stats_client
+from nba.metrics import count_cache
+from nba.utils import lazy_module
+
+boxscoretraditionalv2 = lazy_module("nba_api.stats.endpoints.boxscoretraditionalv2")
+
+##AVAILABLE FUNCTIONS
+# get_box_score(game_id: str, final: bool = True)
+# get_box_scores(game_ids, final: bool = True)
+# get_box_scores_async(game_ids, final: bool = True)
+# refresh_box_scores_async(game_ids, final: bool = False)
+# cache_stats()
+
+# Finished games never change, so they are kept forever.
+# Games still being played are only trusted for a short while.
+LIVE_TTL_SECONDS = 60
+CACHE_DIR = os.environ.get(
+    "NBA_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache")
+)
+CACHE_PATH = os.path.join(CACHE_DIR, "boxscores.sqlite3")
+
+_lock = threading.Lock()
+_conn = None
+_stats = {"hits": 0, "misses": 0, "expired": 0}
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            """CREATE TABLE IF NOT EXISTS boxscores (
+                   game_id TEXT PRIMARY KEY,
+                   payload BLOB NOT NULL,
+                   final INTEGER NOT NULL,
+                   fetched_at REAL NOT NULL
+               )"""
+        )
+    return _conn
+
+
+def _read(game_id):
+    with _lock:
+        row = _db().execute(
+            "SELECT payload, final, fetched_at FROM boxscores WHERE game_id = ?", (game_id,)
+        ).fetchone()
+        if row is None:
+            _stats["misses"] += 1
+            count_cache("boxscores", False)
+            return None
+        payload, final, fetched_at = row
+        if not final and time.time() - fetched_at > LIVE_TTL_SECONDS:
+            _stats["expired"] += 1
+            _stats["misses"] += 1
+            count_cache("boxscores", False)
+            return None
+        _stats["hits"] += 1
+        count_cache("boxscores", True)
+    return json.loads(zlib.decompress(payload))
+
+
+def _write(game_id, payload, final):
+    blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+    with _lock:
+        _db().execute(
+            "INSERT OR REPLACE INTO boxscores (game_id, payload, final, fetched_at) VALUES (?, ?, ?, ?)",
+            (game_id, blob, int(final), time.time()),
+        )
+        _db().commit()
+
+
+def _download(game_id, final):
+    payload = call_endpoint(boxscoretraditionalv2.BoxScoreTraditionalV2, game_id=game_id)
+    _write(game_id, payload, final)
+    return payload
+
+
+def get_box_score(game_id: str, final: bool = True):
+    """
+    Raw BoxScoreTraditionalV2 response for a game, read from the local store when possible.
+    `final` marks a finished game: it is stored without expiry.
+    """
+    payload = _read(game_id)
+    if payload is None:
+        payload = _download(game_id, final)
+    return payload
+
+
+def _read_many(game_ids):
+    """{game_id: stored payload or None}, one entry per distinct id, in order."""
+    return {gid: _read(gid) for gid in dict.fromkeys(game_ids)}
+
+
+def get_box_scores(game_ids, final: bool = True):
+    """
+    Box scores for many games; only the ones missing from the store are fetched (in parallel).
+    Returns {game_id: payload}; games that failed to download map to None.
+    """
+    def fetch(game_id):
+        try:
+            return _download(game_id, final)
+        except Exception as e:
+            print(f"   Error fetching box score for game {game_id}: {e}")
+            return None
+
+    boxes = _read_many(game_ids)
+    missing = [gid for gid, payload in boxes.items() if payload is None]
+    boxes.update(zip(missing, fetch_all(fetch, missing)))
+    return boxes
+
+
+async def _download_async(game_id, final):
+    try:
+        payload = await get_stats_client().get(boxscoretraditionalv2.BoxScoreTraditionalV2, game_id=game_id)
+    except Exception as e:
+        print(f"   Error fetching box score for game {game_id}: {e}")
+        return None
+    _write(game_id, payload, final)
+    return payload
+
+
+async def get_box_scores_async(game_ids, final: bool = True):
+    """get_box_scores for the async routes: missing games are fetched concurrently on the event loop."""
+    boxes = await asyncio.to_thread(_read_many, game_ids)
+    missing = [gid for gid, payload in boxes.items() if payload is None]
+    boxes.update(zip(missing, await asyncio.gather(*(_download_async(gid, final) for gid in missing))))
+    return boxes
+
+
+async def refresh_box_scores_async(game_ids, final: bool = False):
+    """
+    Always download (live games), then store the result like get_box_scores_async would.
+    Returns {game_id: payload}; failed downloads map to None.
+    """
+    game_ids = list(dict.fromkeys(game_ids))
+    return dict(zip(game_ids, await asyncio.gather(*(_download_async(gid, final) for gid in game_ids))))
+
+
+def cache_stats():
+    """Hit/miss counters for the box score store."""
+    with _lock:
+        entries = _db().execute("SELECT COUNT(*) FROM boxscores").fetchone()[0]
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["entries"] = entries
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+    return stats
@@ -0,0 +1,140 @@
+# day_summary.py
+import asyncio
+from datetime import datetime, timedelta
+import json
+from nba.boxscores import get_box_scores, get_box_scores_async
+from nba.history import ingest_box_scores
+from nba.game_index import date_settled, get_games_for_date, get_games_for_date_async
+from nba.matches import _build_games_json, games_view
+from nba.player_of_the_day import player_of_the_day_from, player_of_the_day_from_async
+from nba.scoring import player_lines
+
+##AVAILABLE FUNCTIONS
+# get_day_summary(days_back: int, formula: str = "pra", top_n: int = 1)
+# get_day_summary_async(days_back: int, formula: str = "pra", top_n: int = 1)
+# day_leaders(players_df, limit: int = DAY_LEADERS_LIMIT)
+# matches_view(summary: dict, columnar: bool = False)
+# player_of_the_day_view(summary: dict)
+
+# Everything the front-end shows for a date, from one game log lookup and one box score
+# per game: the matches payload (games, stored columnar), the player of the day and the
+# day's best single-game lines per stat. /matches-of-the-day and /player-of-the-day are
+# views over it, so they share one fetch, one stored copy and one parse of the box scores.
+DAY_LEADER_STATS = ["PTS", "REB", "AST", "STL", "BLK", "FG3M"]
+DAY_LEADERS_LIMIT = 5
+
+
+def _day(days_back):
+    today = datetime.now().date()
+    target_date = today - timedelta(days=days_back)
+    return target_date, target_date.strftime("%m/%d/%Y"), date_settled(target_date)
+
+
+def day_leaders(players_df, limit: int = DAY_LEADERS_LIMIT):
+    """{stat: top `limit` player lines of the day}, from player_lines' frame."""
+    if players_df.empty:
+        return {stat: [] for stat in DAY_LEADER_STATS}
+    leaders = {}
+    for stat in DAY_LEADER_STATS:
+        top_df = players_df.nlargest(limit, stat)
+        leaders[stat] = [
+            {"player_id": int(player_id), "player_name": name, "team_abbr": team, "value": int(value)}
+            for player_id, name, team, value in zip(top_df["PLAYER_ID"], top_df["PLAYER_NAME"],
+                                                    top_df["TEAM_ABBREVIATION"], top_df[stat])
+        ]
+    return leaders
+
+
+def _empty(date_str, complete=True):
+    return {
+        "date": date_str,
+        "games": [],
+        "complete": complete,
+        "player_of_the_day": {"message": f"No NBA games were played on {date_str}."},
+        "leaders": {stat: [] for stat in DAY_LEADER_STATS},
+    }
+
+
+def _failed(date_str, exc):
+    """The day's game log could not be loaded: an empty day that says why (never stored)."""
+    error = f"NBA API error: {str(exc)}"
+    return {**_empty(date_str), "complete": False, "error": error, "player_of_the_day": {"error": error}}
+
+
+def _summary(date_str, games_df, boxes, players_df, potd):
+    # The player lines are already NaN-free ("Nil", see matches.nil_rows), so no clean_nans walk
+    games = _build_games_json(date_str, games_df, boxes)["games"]
+    return {
+        "date": date_str,
+        "games": games,
+        # One entry per game log row, unless a box score failed to download or parse
+        # (or a season type's game log failed, so games may be missing altogether)
+        "complete": len(games) == len(games_df) and not games_df.attrs.get("partial", False),
+        "player_of_the_day": potd,
+        "leaders": day_leaders(players_df),
+    }
+
+
+def get_day_summary(days_back: int, formula: str = "pra", top_n: int = 1):
+    """
+    The day's games (players as {"columns", "rows"}), player of the day and per-stat
+    leaders, from one box score per game (past dates come from the local store).
+    """
+    target_date, date_str, final = _day(days_back)
+    try:
+        games_df = get_games_for_date(target_date)
+    except Exception as e:
+        print(f"Error fetching data for {date_str}: {e}")
+        return _failed(date_str, e)
+    if games_df.empty:
+        return _empty(date_str, complete=not games_df.attrs.get("partial", False))
+
+    # Sorted like player of the day always fetched them: ties go to the earlier game
+    boxes = get_box_scores(sorted(games_df["GAME_ID"].unique()), final=final)
+    if final:
+        ingest_box_scores(target_date, boxes)
+    players_df = player_lines(boxes)
+    potd = player_of_the_day_from(date_str, games_df, boxes, players_df, formula=formula, top_n=top_n)
+    return _summary(date_str, games_df, boxes, players_df, potd)
+
+
+async def get_day_summary_async(days_back: int, formula: str = "pra", top_n: int = 1):
+    """get_day_summary on the async stats client."""
+    target_date, date_str, final = _day(days_back)
+    try:
+        games_df = await get_games_for_date_async(target_date)
+    except Exception as e:
+        print(f"Error fetching data for {date_str}: {e}")
+        return _failed(date_str, e)
+    if games_df.empty:
+        return _empty(date_str, complete=not games_df.attrs.get("partial", False))
+
+    boxes = await get_box_scores_async(sorted(games_df["GAME_ID"].unique()), final=final)
+    if final:
+        # On a worker thread: the history store's lock may be held by a /history query
+        await asyncio.to_thread(ingest_box_scores, target_date, boxes)
+    players_df = player_lines(boxes)
+    potd = await player_of_the_day_from_async(date_str, games_df, boxes, players_df, formula=formula, top_n=top_n)
+    return _summary(date_str, games_df, boxes, players_df, potd)
+
+
+def matches_view(summary: dict, columnar: bool = False):
+    """
+    /matches-of-the-day's payload ({"games": [...]}) from a day summary. A failed or partial
+    day also carries its "error" / "complete": false, so the route cache won't keep it.
+    """
+    view = {"games": summary["games"]}
+    if "error" in summary:
+        view["error"] = summary["error"]
+    if summary.get("complete") is False:
+        view["complete"] = False
+    return games_view(view, columnar)
+
+
+def player_of_the_day_view(summary: dict):
+    """/player-of-the-day's payload from a day summary."""
+    return summary["player_of_the_day"]
+
+
+if __name__ == "__main__":#TEST CODE
+    print(json.dumps(matches_view(get_day_summary(155)), indent=2)[:2000])
@@ -0,0 +1,93 @@
+# derived_stats.py
+from nba.utils import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+##AVAILABLE FUNCTIONS
+# derive(df, mode: str = "per_game", per_game: bool = False, league_rate: float = None)
+# mode_columns(mode: str)
+
+# Derived numbers for many players' season rows at once: the counting columns are pulled
+# into one float matrix and every player is computed with array arithmetic, instead of a
+# division per player per stat (index.js used to do this in the browser, one player at a time).
+MODES = ["totals", "per_game", "per_36", "advanced"]
+COUNTING_COLUMNS = ["MIN", "PTS", "REB", "OREB", "DREB", "AST", "STL", "BLK", "TOV", "PF",
+                    "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA"]
+# made, attempted
+PCT_COLUMNS = {"FG_PCT": ("FGM", "FGA"), "FG3_PCT": ("FG3M", "FG3A"), "FT_PCT": ("FTM", "FTA")}
+ADVANCED_COLUMNS = ["TS_PCT", "EFG_PCT", "USG_PCT", "PLAYS_PER_36", "AST_TOV", "PTS_PER_SHOT"]
+# Possessions a player "uses": shots, trips to the line (0.44 FTA per trip) and turnovers
+FTA_WEIGHT = 0.44
+# League plays (FGA + 0.44 FTA + TOV) per player-minute, used for USG_PCT when the rows
+# aren't a whole league to measure it from (~112 plays per 240 team minutes)
+LEAGUE_PLAYS_PER_MINUTE = 0.465
+# Rows needed before the batch's own plays-per-minute is trusted as the league's
+LEAGUE_SAMPLE = 100
+
+
+def mode_columns(mode: str):
+    """Columns derive() returns for `mode`."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}. Use one of {', '.join(MODES)}.")
+    if mode == "advanced":
+        return list(ADVANCED_COLUMNS)
+    return COUNTING_COLUMNS + list(PCT_COLUMNS)
+
+
+def _divide(numerator, denominator):
+    """Element-wise division with NaN wherever the denominator is 0 (no games, no shots)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator != 0, numerator / denominator, np.nan)
+
+
+def derive(df, mode: str = "per_game", per_game: bool = False, league_rate: float = None):
+    """
+    DataFrame (same index as `df`) of `mode` numbers for every row:
+      totals     season totals
+      per_game   totals / GP
+      per_36     totals / MIN * 36
+      advanced   TS%, eFG%, a usage estimate, plays used per 36, AST/TOV, points per shot
+    `df` holds season totals (PlayerCareerStats) or, with per_game=True, per-game averages
+    (LeagueLeaders); both need GP. Missing counting columns count as 0; percentages are NaN
+    where there were no attempts. Percentages given in `df` are kept as they are.
+    """
+    columns = mode_columns(mode)
+    gp = pd.to_numeric(df["GP"], errors="coerce").to_numpy(dtype=float)
+    counting = np.column_stack([
+        pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) if col in df else np.zeros(len(df))
+        for col in COUNTING_COLUMNS
+    ]) if len(df) else np.zeros((0, len(COUNTING_COLUMNS)))
+    counting = np.nan_to_num(counting)
+    totals = counting * gp[:, None] if per_game else counting
+    c = {col: totals[:, i] for i, col in enumerate(COUNTING_COLUMNS)}
+
+    if mode == "advanced":
+        plays = c["FGA"] + FTA_WEIGHT * c["FTA"] + c["TOV"]
+        if league_rate is None:
+            league_rate = (plays.sum() / c["MIN"].sum()
+                           if len(df) >= LEAGUE_SAMPLE and c["MIN"].sum() else LEAGUE_PLAYS_PER_MINUTE)
+        values = np.column_stack([
+            _divide(c["PTS"], 2 * (c["FGA"] + FTA_WEIGHT * c["FTA"])).round(3),
+            _divide(c["FGM"] + 0.5 * c["FG3M"], c["FGA"]).round(3),
+            # Share of the team's plays while on the floor, against a league-average team
+            (_divide(plays, c["MIN"]) / (5 * league_rate) * 100).round(1),
+            (_divide(plays, c["MIN"]) * 36).round(1),
+            _divide(c["AST"], c["TOV"]).round(2),
+            _divide(c["PTS"], c["FGA"]).round(2),
+        ])
+        return pd.DataFrame(values, index=df.index, columns=columns)
+
+    if mode == "per_game":
+        scaled = _divide(totals, gp[:, None]).round(1)
+    elif mode == "per_36":
+        scaled = (_divide(totals, c["MIN"][:, None]) * 36).round(1)
+    else:
+        # From per-game input these are the averages times GP, so only as exact as the averages
+        scaled = totals.round(1)
+    pcts = np.column_stack([
+        pd.to_numeric(df[pct], errors="coerce").to_numpy(dtype=float) if pct in df
+        else _divide(c[made], c[attempted]).round(3)
+        for pct, (made, attempted) in PCT_COLUMNS.items()
+    ]) if len(df) else np.zeros((0, len(PCT_COLUMNS)))
+    return pd.DataFrame(np.hstack([scaled, pcts]), index=df.index, columns=columns)
@@ -0,0 +1,146 @@
+# fetch.py
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from nba.metrics import observe_rate_wait, observe_upstream
+from nba.utils import lazy_module
+
+pd = lazy_module("pandas")
+
+##AVAILABLE FUNCTIONS
+# call_endpoint(endpoint_cls, **params)
+# fetch_all(func, items, max_workers: int = MAX_WORKERS)
+# fetch_as_completed(func, items, max_workers: int = MAX_WORKERS)
+# coalesce(key, func)
+# result_set(payload: dict, name: str)
+# result_set_frame(payload: dict, name: str)
+
+# stats.nba.com starts throttling (and eventually blocking) clients that fire
+# too many requests, so every call goes through one shared token bucket.
+RATE_PER_SEC = float(os.environ.get("NBA_STATS_RATE", "4"))
+BURST = int(os.environ.get("NBA_STATS_BURST", "4"))
+MAX_WORKERS = int(os.environ.get("NBA_STATS_WORKERS", "6"))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    `rate` tokens are added per second, up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # Token is borrowed from the future; the deficit tells us how long to wait
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        observe_rate_wait(wait)
+        return wait
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+STATS_LIMITER = TokenBucket(RATE_PER_SEC, BURST)
+
+
+def call_endpoint(endpoint_cls, **params):
+    """
+    Call an nba_api stats endpoint under the shared rate limit.
+    Returns the raw response dict (same as endpoint.get_dict()).
+    """
+    STATS_LIMITER.acquire()
+    start = time.perf_counter()
+    ok = False
+    try:
+        payload = endpoint_cls(**params).get_dict()
+        ok = True
+        return payload
+    finally:
+        observe_upstream(endpoint_cls.__name__, time.perf_counter() - start, ok)
+
+
+def fetch_all(func, items, max_workers: int = MAX_WORKERS):
+    """
+    Run func(item) for every item on a bounded thread pool.
+    Results come back in the same order as `items`.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def fetch_as_completed(func, items, max_workers: int = MAX_WORKERS):
+    """
+    Like fetch_all, but a generator of (item, func(item)) in completion order,
+    so callers can use the first result while the rest are still running.
+    """
+    items = list(items)
+    if not items:
+        return
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    try:
+        futures = {pool.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # A consumer that stops early should not wait for (or pay for) the rest
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def coalesce(key, func):
+    """
+    Single-flight: concurrent callers with the same key share one func() call.
+    The first caller runs it; the rest wait for its result (or its exception).
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    try:
+        future.set_result(func())
+    except BaseException as exc:
+        future.set_exception(exc)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+    return future.result()
+
+
+def result_set(payload: dict, name: str):
+    """The named result set ({"name", "headers", "rowSet"}) of a raw stats response."""
+    result_sets = payload.get("resultSets") or payload.get("resultSet") or []
+    if isinstance(result_sets, dict):
+        result_sets = [result_sets]
+    rs = next((rs for rs in result_sets if rs.get("name") == name), None)
+    if rs is None:
+        raise KeyError(f"Result set {name} missing from response.")
+    return rs
+
+
+def result_set_frame(payload: dict, name: str):
+    """Build a DataFrame for the named result set of a raw stats response."""
+    rs = result_set(payload, name)
+    return pd.DataFrame(rs["rowSet"], columns=rs["headers"])
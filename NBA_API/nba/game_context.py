@@ -0,0 +1,93 @@
+# game_context.py
+from nba.fetch import result_set
+
+##AVAILABLE FUNCTIONS
+# resolve_game_contexts(games_df, box_dicts: dict)
+# context_from_summary(summary: dict)
+# opponent_of(context: dict, team_abbr: str)
+# final_score(context: dict)
+
+# Home/away, teams and points for every game of a date, from what the day's endpoints
+# already downloaded: the LeagueGameLog rows (one per team, MATCHUP "LAL vs. BOS" at
+# home, "LAL @ BOS" on the road) and each box score's TeamStats. BoxScoreSummaryV2 is
+# only needed for games this can't settle (see context_from_summary).
+
+
+def _side(matchup):
+    if " vs. " in matchup:
+        return "home"
+    if " @ " in matchup:
+        return "away"
+    return None
+
+
+def _team_points(box):
+    """TEAM_ABBREVIATION -> PTS from a raw box score's TeamStats, or {} if unreadable."""
+    try:
+        rs = result_set(box, "TeamStats")
+    except Exception:
+        return {}
+    abbr, pts = rs["headers"].index("TEAM_ABBREVIATION"), rs["headers"].index("PTS")
+    return {row[abbr]: row[pts] for row in rs["rowSet"]}
+
+
+def resolve_game_contexts(games_df, box_dicts: dict):
+    """
+    {game_id: {"home", "away", "home_pts", "away_pts"}} in one pass over the game log.
+    A game whose two rows don't name exactly one home and one away team, or whose score
+    is missing from both the box score and the game log, maps to None (ambiguous).
+    """
+    sides = {}
+    log_pts = {}
+    for game_id, team, matchup, pts in zip(games_df["GAME_ID"], games_df["TEAM_ABBREVIATION"],
+                                           games_df["MATCHUP"], games_df["PTS"]):
+        sides.setdefault(game_id, []).append((_side(str(matchup)), team))
+        log_pts[(game_id, team)] = pts
+
+    contexts = {}
+    for game_id, rows in sides.items():
+        by_side = dict(rows)
+        if len(rows) != 2 or set(by_side) != {"home", "away"}:
+            contexts[game_id] = None
+            continue
+        home, away = by_side["home"], by_side["away"]
+        box_pts = _team_points(box_dicts.get(game_id)) if box_dicts.get(game_id) else {}
+        points = []
+        for team in (home, away):
+            value = box_pts.get(team, log_pts.get((game_id, team)))
+            points.append(None if value is None or value != value else int(value))  # NaN check
+        if None in points:
+            contexts[game_id] = None
+            continue
+        contexts[game_id] = {"home": home, "away": away, "home_pts": points[0], "away_pts": points[1]}
+    return contexts
+
+
+def context_from_summary(summary: dict):
+    """The same context from a raw BoxScoreSummaryV2 response (GameSummary + LineScore), or None."""
+    try:
+        gs, ls = result_set(summary, "GameSummary"), result_set(summary, "LineScore")
+        game = dict(zip(gs["headers"], gs["rowSet"][0]))
+        teams = {}
+        for row in ls["rowSet"]:
+            line = dict(zip(ls["headers"], row))
+            teams[line["TEAM_ID"]] = (line["TEAM_ABBREVIATION"], line["PTS"])
+        (home, home_pts), (away, away_pts) = teams[game["HOME_TEAM_ID"]], teams[game["VISITOR_TEAM_ID"]]
+    except Exception:
+        return None
+    if home_pts is None or away_pts is None:
+        return None
+    return {"home": home, "away": away, "home_pts": int(home_pts), "away_pts": int(away_pts)}
+
+
+def opponent_of(context: dict, team_abbr: str):
+    if team_abbr == context["home"]:
+        return context["away"]
+    if team_abbr == context["away"]:
+        return context["home"]
+    return "N/A"
+
+
+def final_score(context: dict):
+    """'AWY@HOM: away_pts-home_pts', the format player of the day has always used."""
+    return f"{context['away']}@{context['home']}: {context['away_pts']}-{context['home_pts']}"
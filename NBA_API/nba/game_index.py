@@ -0,0 +1,248 @@
+# game_index.py
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from nba.utils import get_season_string, lazy_module
+from nba.seasons import season_bounds, season_for
+from nba.fetch import call_endpoint, fetch_all, coalesce, result_set_frame
+from nba.stats_client import get_stats_client
+from nba.metrics import count_cache
+
+pd = lazy_module("pandas")
+leaguegamelog = lazy_module("nba_api.stats.endpoints.leaguegamelog")
+
+##AVAILABLE FUNCTIONS
+# get_games_for_date(target_date: datetime.date)
+# get_games_for_date_async(target_date: datetime.date)
+# get_games_for_range(start_date: datetime.date, end_date: datetime.date)
+# get_games_for_range_async(start_date: datetime.date, end_date: datetime.date)
+# date_settled(target_date: datetime.date)
+
+SEASON_TYPES = ["Regular Season", "Playoffs", "Pre Season", "In Season Tournament", "All Star"]
+# Months each season type is played in; a date only queries the types it can belong to.
+# 2019-20 and 2020-21 ran off this calendar (bubble, late start), so they query every type.
+SEASON_TYPE_MONTHS = {
+    "Regular Season": {10, 11, 12, 1, 2, 3, 4},
+    "Playoffs": {4, 5, 6},
+    "Pre Season": {9, 10},
+    "In Season Tournament": {11, 12},
+    "All Star": {2},
+}
+IRREGULAR_SEASONS = {"2019-20", "2020-21"}
+# A slate that can still grow (late games get logged) is re-read after this long
+TODAY_TTL_SECONDS = 60
+# Hours past midnight after which a date's games are all over and logged (late tip-offs
+# run past midnight); before that its game log is treated like today's
+FINAL_GRACE_HOURS = int(os.environ.get("NBA_FINAL_GRACE_HOURS", "6"))
+
+_index = {}  # date -> (games_df, fetched_at)
+_lock = threading.Lock()
+
+
+def _game_log_params(target_date, stype, end_date=None):
+    return dict(
+        season=get_season_string(target_date),
+        season_type_all_star=stype,
+        date_from_nullable=target_date.strftime("%m/%d/%Y"),
+        date_to_nullable=(end_date or target_date).strftime("%m/%d/%Y"),
+    )
+
+
+def date_settled(target_date):
+    """True once `target_date` is over and FINAL_GRACE_HOURS have passed since midnight."""
+    settled_at = datetime.combine(target_date + timedelta(days=1), datetime.min.time())
+    return datetime.now() >= settled_at + timedelta(hours=FINAL_GRACE_HOURS)
+
+
+def _season_types(start_date, end_date=None):
+    """The SEASON_TYPES that can have games from `start_date` to `end_date` (one season)."""
+    if get_season_string(start_date) in IRREGULAR_SEASONS:
+        return list(SEASON_TYPES)
+    months = {day.month for day in _dates(start_date, end_date or start_date)}
+    return [stype for stype in SEASON_TYPES if SEASON_TYPE_MONTHS[stype] & months]
+
+
+def _concat_game_logs(label, payloads):
+    """
+    Merge [(season_type, LeagueGameLog response or the exception it raised)] into one DataFrame.
+    No payloads (no season type is played then) is an empty game log. When some season
+    types failed to load, the result has attrs["partial"] set: it may be missing games.
+    """
+    if not payloads:
+        return pd.DataFrame(columns=leaguegamelog.LeagueGameLog.expected_data["LeagueGameLog"] + ["SEASON_TYPE"])
+    frames = []
+    failed = False
+    for stype, gl in payloads:
+        try:
+            if isinstance(gl, Exception):
+                raise gl
+            df = result_set_frame(gl, "LeagueGameLog")
+            df["SEASON_TYPE"] = stype
+            frames.append(df)
+        except Exception as e:
+            # If a season type isn't valid on that day, just skip it
+            # (e.g., no Playoffs that date).
+            print(f"   No {stype} game log for {label}: {e}")
+            failed = True
+    if not frames:
+        raise Exception(f"Could not load the game log for {label}.")
+    # A game can be listed under two season types (NBA Cup games are regular season games too)
+    games_df = pd.concat(frames, ignore_index=True).drop_duplicates(["GAME_ID", "TEAM_ID"], ignore_index=True)
+    games_df.attrs["partial"] = failed
+    return games_df
+
+
+def _merge_game_logs(target_date, payloads):
+    """_concat_game_logs for one date, memoized for the date."""
+    games_df = _concat_game_logs(f"{target_date:%m/%d/%Y}", payloads.items())
+    with _lock:
+        _index[target_date] = (games_df, time.time())
+    return games_df
+
+
+def _memoized(target_date):
+    with _lock:
+        cached = _index.get(target_date)
+    if cached is not None:
+        games_df, fetched_at = cached
+        # A partial log (a season type failed) is retried like today's, never kept for good
+        settled = date_settled(target_date) and not games_df.attrs.get("partial", False)
+        if settled or time.time() - fetched_at < TODAY_TTL_SECONDS:
+            count_cache("game_index", True)
+            return games_df.copy()
+    count_cache("game_index", False)
+    return None
+
+
+def get_games_for_date(target_date):
+    """
+    LeagueGameLog team rows (two per game) for every season type played on `target_date`,
+    plus a SEASON_TYPE column. Memoized per date; concurrent callers share one fetch.
+    """
+    games_df = _memoized(target_date)
+    if games_df is not None:
+        return games_df
+
+    def fetch(stype):
+        try:
+            return call_endpoint(leaguegamelog.LeagueGameLog, **_game_log_params(target_date, stype))
+        except Exception as e:
+            return e
+
+    def load():
+        stypes = _season_types(target_date)
+        return _merge_game_logs(target_date, dict(zip(stypes, fetch_all(fetch, stypes))))
+
+    return coalesce(("game_index", target_date), load).copy()
+
+
+async def get_games_for_date_async(target_date):
+    """get_games_for_date for the async routes (the stats client coalesces identical calls)."""
+    games_df = _memoized(target_date)
+    if games_df is not None:
+        return games_df
+
+    client = get_stats_client()
+    stypes = _season_types(target_date)
+    payloads = await asyncio.gather(
+        *(client.get(leaguegamelog.LeagueGameLog, **_game_log_params(target_date, stype))
+          for stype in stypes),
+        return_exceptions=True,
+    )
+    return _merge_game_logs(target_date, dict(zip(stypes, payloads))).copy()
+
+
+def _dates(start_date, end_date):
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _season_spans(start_date, end_date):
+    """
+    Split a date range at season boundaries: LeagueGameLog takes one season per call.
+    Returns [(span_start, span_end), ...].
+    """
+    spans = []
+    day = start_date
+    while day <= end_date:
+        last = min(end_date, season_bounds(season_for(day))[1])
+        spans.append((day, last))
+        day = last + timedelta(days=1)
+    return spans
+
+
+def _split_by_date(start_date, end_date, games_df):
+    """
+    Memoize a range's game log under each of its dates (dates without games get an
+    empty frame) and return {date: games_df} in date order.
+    """
+    game_dates = pd.to_datetime(games_df["GAME_DATE"], format="mixed").dt.date
+    now = time.time()
+    by_date = {}
+    with _lock:
+        for day in _dates(start_date, end_date):
+            day_df = games_df[game_dates == day].reset_index(drop=True)
+            _index[day] = (day_df, now)
+            by_date[day] = day_df.copy()
+    return by_date
+
+
+def _memoized_range(start_date, end_date):
+    by_date = {}
+    for day in _dates(start_date, end_date):
+        games_df = _memoized(day)
+        if games_df is None:
+            return None
+        by_date[day] = games_df
+    return by_date
+
+
+def get_games_for_range(start_date, end_date):
+    """
+    {date: games_df} for every date from `start_date` to `end_date` (inclusive), from one
+    LeagueGameLog call per season type played in it (per season, if the range crosses one).
+    Every date is memoized as if get_games_for_date had loaded it.
+    """
+    by_date = _memoized_range(start_date, end_date)
+    if by_date is not None:
+        return by_date
+
+    requests = [(span, stype) for span in _season_spans(start_date, end_date) for stype in _season_types(*span)]
+
+    def fetch(request):
+        (span_start, span_end), stype = request
+        try:
+            return call_endpoint(leaguegamelog.LeagueGameLog, **_game_log_params(span_start, stype, span_end))
+        except Exception as e:
+            return e
+
+    def load():
+        payloads = fetch_all(fetch, requests)
+        games_df = _concat_game_logs(
+            f"{start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}",
+            [(stype, gl) for (_, stype), gl in zip(requests, payloads)],
+        )
+        return _split_by_date(start_date, end_date, games_df)
+
+    return coalesce(("game_range", start_date, end_date), load)
+
+
+async def get_games_for_range_async(start_date, end_date):
+    """get_games_for_range on the async stats client."""
+    by_date = _memoized_range(start_date, end_date)
+    if by_date is not None:
+        return by_date
+
+    client = get_stats_client()
+    requests = [(span, stype) for span in _season_spans(start_date, end_date) for stype in _season_types(*span)]
+    payloads = await asyncio.gather(
+        *(client.get(leaguegamelog.LeagueGameLog, **_game_log_params(span[0], stype, span[1]))
+          for span, stype in requests),
+        return_exceptions=True,
+    )
+    games_df = _concat_game_logs(
+        f"{start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}",
+        [(stype, gl) for (_, stype), gl in zip(requests, payloads)],
+    )
+    return _split_by_date(start_date, end_date, games_df)
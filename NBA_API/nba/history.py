@@ -0,0 +1,287 @@
+# history.py
+import os
+import sys
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from nba.boxscores import CACHE_DIR, get_box_scores
+from nba.game_index import date_settled, get_games_for_range
+from nba.leaders import COMPOSITE_STATS
+from nba.seasons import season_for
+from nba.utils import get_season_string
+
+##AVAILABLE FUNCTIONS
+# ingest_box_scores(target_date: datetime.date, boxes: dict)
+# backfill(start_date: datetime.date, end_date: datetime.date)
+# best_performances(stat: str = "PRA", season: str = None, limit: int = 10, team: str = None, season_type: str = None)
+# streaks(stat: str = "PTS", threshold: float = 30, season: str = None, limit: int = 10, team: str = None)
+# team_history(team: str, season: str = None, limit: int = 5)
+# history_stats()
+#
+# CLI:  python -m nba.history START_DATE END_DATE   (YYYY-MM-DD, backfills from the box score store)
+
+# One row per player per finished game, clustered by season (then player and date, the
+# order streaks are counted in), so season-wide questions
+# ("top 10 PTS+REB+AST games this season") are one local query instead of
+# thousands of upstream calls. Only finished games are ingested; they never change.
+HISTORY_PATH = os.path.join(CACHE_DIR, "history.sqlite3")
+
+# Box score columns kept per player line (quoted in SQL: "TO" is a keyword)
+STAT_COLUMNS = ["PTS", "REB", "AST", "STL", "BLK", "TO", "PF", "FGM", "FGA",
+                "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "PLUS_MINUS"]
+# Third digit of a GAME_ID
+SEASON_TYPES = {"1": "Pre Season", "2": "Regular Season", "3": "All Star", "4": "Playoffs",
+                "5": "PlayIn", "6": "In Season Tournament"}
+
+_lock = threading.Lock()
+_conn = None
+_ingested = None  # game ids already in the store, loaded on first use
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _conn = sqlite3.connect(HISTORY_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        stats = ", ".join(f'"{s}" REAL' for s in STAT_COLUMNS)
+        _conn.executescript(
+            f"""CREATE TABLE IF NOT EXISTS player_games (
+                    game_id TEXT NOT NULL,
+                    game_date TEXT NOT NULL,
+                    season TEXT NOT NULL,
+                    season_type TEXT NOT NULL,
+                    player_id INTEGER NOT NULL,
+                    player_name TEXT NOT NULL,
+                    team_abbr TEXT NOT NULL,
+                    opponent_abbr TEXT,
+                    minutes REAL NOT NULL,
+                    {stats},
+                    PRIMARY KEY (season, player_id, game_date, game_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS player_games_team
+                    ON player_games (season, team_abbr, player_id);
+                CREATE TABLE IF NOT EXISTS team_games (
+                    game_id TEXT NOT NULL,
+                    game_date TEXT NOT NULL,
+                    season TEXT NOT NULL,
+                    season_type TEXT NOT NULL,
+                    team_abbr TEXT NOT NULL,
+                    opponent_abbr TEXT,
+                    pts INTEGER,
+                    opponent_pts INTEGER,
+                    PRIMARY KEY (season, team_abbr, game_date, game_id)
+                ) WITHOUT ROWID;"""
+        )
+    return _conn
+
+
+def _minutes(value):
+    """'34:12' (or '34.000000:12', or a number) -> 34.2; None for DNP rows."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    minutes, _, seconds = str(value).partition(":")
+    return float(minutes) + (float(seconds) / 60 if seconds else 0.0)
+
+
+def _rows(game_id, game_date, box):
+    """(player rows, team rows) for player_games / team_games from one raw box score."""
+    sets = {rs.get("name"): rs for rs in box["resultSets"]}
+    teams = sets["TeamStats"]
+    t = {h: i for i, h in enumerate(teams["headers"])}
+    team_pts = {row[t["TEAM_ABBREVIATION"]]: row[t["PTS"]] for row in teams["rowSet"]}
+
+    def opponent(abbr):
+        return next((other for other in team_pts if other != abbr), None)
+
+    season = season_for(game_date)
+    season_type = SEASON_TYPES.get(str(game_id)[2:3], "Unknown")
+    day = game_date.isoformat()
+
+    players = sets["PlayerStats"]
+    p = {h: i for i, h in enumerate(players["headers"])}
+    player_rows = []
+    for row in players["rowSet"]:
+        minutes = _minutes(row[p["MIN"]])
+        if minutes is None:
+            continue  # DNP
+        abbr = row[p["TEAM_ABBREVIATION"]]
+        player_rows.append(
+            (game_id, day, season, season_type, int(row[p["PLAYER_ID"]]), row[p["PLAYER_NAME"]],
+             abbr, opponent(abbr), minutes) + tuple(row[p[s]] for s in STAT_COLUMNS)
+        )
+    team_rows = [
+        (game_id, day, season, season_type, abbr, opponent(abbr), pts, team_pts.get(opponent(abbr)))
+        for abbr, pts in team_pts.items()
+    ]
+    return player_rows, team_rows
+
+
+def _ingested_ids():
+    global _ingested
+    if _ingested is None:
+        _ingested = {row[0] for row in _db().execute("SELECT DISTINCT game_id FROM team_games")}
+    return _ingested
+
+
+def ingest_box_scores(target_date, boxes: dict):
+    """
+    Add a finished date's raw box scores ({game_id: payload}) to the store.
+    Games already ingested (or that failed to download) are skipped, so callers can
+    pass every box score they served.
+    """
+    with _lock:
+        new = {gid: box for gid, box in boxes.items() if box is not None and gid not in _ingested_ids()}
+    if not new:
+        return 0
+
+    player_rows, team_rows = [], []
+    for gid, box in new.items():
+        try:
+            players, teams = _rows(gid, target_date, box)
+        except Exception as e:
+            print(f"   Could not ingest game {gid}: {e}")
+            continue
+        player_rows += players
+        team_rows += teams
+
+    placeholders = ", ".join("?" * (9 + len(STAT_COLUMNS)))
+    with _lock:
+        db = _db()
+        db.executemany(f"INSERT OR REPLACE INTO player_games VALUES ({placeholders})", player_rows)
+        db.executemany("INSERT OR REPLACE INTO team_games VALUES (?, ?, ?, ?, ?, ?, ?, ?)", team_rows)
+        db.commit()
+        _ingested_ids().update(row[0] for row in team_rows)
+    return len({row[0] for row in team_rows})
+
+
+def backfill(start_date, end_date):
+    """
+    Ingest every finished game from start_date to end_date: one LeagueGameLog call for the
+    range, box scores from the local store (downloading only the ones never fetched).
+    """
+    end_date = min(end_date, datetime.now().date() - timedelta(days=1))
+    if not date_settled(end_date):
+        end_date -= timedelta(days=1)  # last night's late games may still be going
+    by_date = get_games_for_range(start_date, end_date)
+    total = 0
+    for target_date, games_df in by_date.items():
+        if games_df.empty:
+            continue
+        boxes = get_box_scores(games_df["GAME_ID"], final=True)
+        total += ingest_box_scores(target_date, boxes)
+    return total
+
+
+# Queries
+
+def _stat_sql(stat: str):
+    """SQL expression for a box score stat, a named composite or a "PTS+REB+AST" style sum."""
+    expression = COMPOSITE_STATS.get(stat.upper(), stat.upper())
+    terms = expression.split("+")
+    missing = [term for term in terms if term not in STAT_COLUMNS]
+    if missing:
+        raise ValueError(f"Unknown stat {', '.join(missing)}. Use {', '.join(STAT_COLUMNS)} or sums of them.")
+    return " + ".join(f'COALESCE("{term}", 0)' for term in terms)
+
+
+def _filters(season, team=None, season_type=None):
+    where, params = ["season = ?"], [season or get_season_string()]
+    if team:
+        where.append("team_abbr = ?")
+        params.append(team)
+    if season_type:
+        where.append("season_type = ?")
+        params.append(season_type)
+    return " AND ".join(where), params
+
+
+def _query(sql, params):
+    with _lock:
+        cursor = _db().execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def best_performances(stat: str = "PRA", season: str = None, limit: int = 10, team: str = None,
+                      season_type: str = None):
+    """The `limit` best single-game lines of a season by `stat` (optionally one team / season type)."""
+    value = _stat_sql(stat)
+    where, params = _filters(season, team, season_type)
+    performances = _query(
+        f"""SELECT game_date, game_id, player_id, player_name, team_abbr, opponent_abbr, minutes,
+                   PTS, REB, AST, STL, BLK, {value} AS value
+            FROM player_games WHERE {where}
+            ORDER BY value DESC, game_date LIMIT ?""",
+        params + [limit],
+    )
+    return {"season": params[0], "stat": stat.upper(), "performances": performances}
+
+
+def streaks(stat: str = "PTS", threshold: float = 30, season: str = None, limit: int = 10, team: str = None):
+    """
+    Longest runs of consecutive games played with `stat` >= `threshold` in a season.
+    Runs are counted over the games each player appeared in (gaps-and-islands in SQL).
+    """
+    value = _stat_sql(stat)
+    where, params = _filters(season, team)
+    rows = _query(
+        f"""WITH games AS (
+                SELECT player_id, player_name, team_abbr, game_date, ({value}) >= ? AS hit,
+                       ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date) AS n
+                FROM player_games WHERE {where}
+            ),
+            runs AS (
+                SELECT player_id, player_name, team_abbr, game_date,
+                       n - ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date) AS run
+                FROM games WHERE hit
+            )
+            SELECT player_id, MAX(player_name) AS player_name, MAX(team_abbr) AS team_abbr,
+                   COUNT(*) AS games, MIN(game_date) AS start_date, MAX(game_date) AS end_date
+            FROM runs GROUP BY player_id, run
+            ORDER BY games DESC, end_date DESC LIMIT ?""",
+        [threshold] + params + [limit],
+    )
+    return {"season": params[0], "stat": stat.upper(), "threshold": threshold, "streaks": rows}
+
+
+def team_history(team: str, season: str = None, limit: int = 5):
+    """A team's record, scoring, leading scorers and best games over the ingested part of a season."""
+    where, params = _filters(season, team)
+    record = _query(
+        f"""SELECT COUNT(*) AS games,
+                   SUM(pts > opponent_pts) AS wins, SUM(pts < opponent_pts) AS losses,
+                   ROUND(AVG(pts), 1) AS pts_per_game, ROUND(AVG(opponent_pts), 1) AS opponent_pts_per_game
+            FROM team_games WHERE {where}""",
+        params,
+    )[0]
+    leaders = _query(
+        f"""SELECT player_id, MAX(player_name) AS player_name, COUNT(*) AS games,
+                   ROUND(AVG(PTS), 1) AS PTS, ROUND(AVG(REB), 1) AS REB, ROUND(AVG(AST), 1) AS AST
+            FROM player_games WHERE {where}
+            GROUP BY player_id ORDER BY AVG(PTS) DESC LIMIT ?""",
+        params + [limit],
+    )
+    best = best_performances("PRA", params[0], limit, team)["performances"]
+    return {"season": params[0], "team": team, **record, "leaders": leaders, "best_games": best}
+
+
+def history_stats():
+    """Games and player lines in the store, per season."""
+    return {
+        "seasons": _query(
+            """SELECT season, COUNT(DISTINCT game_id) AS games, COUNT(*) AS player_lines,
+                      MIN(game_date) AS first_date, MAX(game_date) AS last_date
+               FROM player_games GROUP BY season ORDER BY season""",
+            [],
+        )
+    }
+
+
+if __name__ == "__main__":
+    start, end = (datetime.strptime(arg, "%Y-%m-%d").date() for arg in sys.argv[1:3])
+    started = time.time()
+    print(f"Ingested {backfill(start, end)} games in {time.time() - started:.1f}s")
@@ -1,41 +1,211 @@
 # leaders.py
-from nba_api.stats.endpoints import leagueleaders
-from nba.utils import get_season_string  # assumes you already have this helper
+import threading
+import time
+from nba.utils import get_season_string, lazy_module
+from nba.fetch import call_endpoint, coalesce, result_set_frame
+from nba.stats_client import get_stats_client
+from nba.metrics import count_cache
+from nba.derived_stats import derive, mode_columns
 
-#get_league_leaders(stat: str, limit: int = 5)
+leagueleaders = lazy_module("nba_api.stats.endpoints.leagueleaders")
 
-def get_league_leaders(stat: str, limit: int = 5):
-    """
-    Returns the top `limit` players for the current season’s Regular Season,
-    ranked by the given stat category (per game).
-    """
-    season = get_season_string()
-    season_type = "Regular Season"
+#get_league_leaders(stat: str, limit: int = 5, ascending: bool = False, min_games: int = 0, mode: str = "per_game")
+#get_league_leaders_async(stat: str, limit: int = 5, ascending: bool = False, min_games: int = 0, mode: str = "per_game")
+#get_league_table(season: str = None)
+#get_league_table_async(season: str = None)
+#snapshot_state() / restore_state(state)
 
-    print(f"Loading Top {limit} players in {stat} for {season} ...")
+# The whole season's per-game table is fetched once and ranked locally for any stat/limit
+TABLE_TTL_SECONDS = 60 * 60
+# NBA.com's qualifiers for percentage leaders (season minimums, prorated by games played so far)
+PCT_QUALIFIERS = {"FG_PCT": ("FGM", 300), "FG3_PCT": ("FG3M", 82), "FT_PCT": ("FTM", 125)}
+# Named composites on top of plain "A+B+C" sums
+COMPOSITE_STATS = {"PRA": "PTS+REB+AST", "STOCKS": "STL+BLK"}
+# Season minutes (prorated like PCT_QUALIFIERS) for per-36 and advanced leaders, so a few
+# garbage-time minutes don't top the list
+MODE_MINUTES_QUALIFIER = {"per_36": 500, "advanced": 500}
 
-    ll = leagueleaders.LeagueLeaders(
+_table = None  # (season, df, fetched_at, raw LeagueLeaders response)
+_derived = {}  # mode -> (the per-game df it was derived from, derived df)
+_past_tables = {}  # season -> df, for seasons that are over (they never change)
+_lock = threading.Lock()
+
+
+def _table_params(season: str):
+    # Sorted by PTS the endpoint lists every player, not just the qualified ones
+    return dict(
         season=season,
-        season_type_all_star=season_type,
-        stat_category_abbreviation=stat,
+        season_type_all_star="Regular Season",
+        stat_category_abbreviation="PTS",
         per_mode48="PerGame",
         league_id="00",
     )
 
-    df = ll.get_data_frames()[0]
+
+def _cached_table(season: str):
+    with _lock:
+        table = _table
+    if table is not None and table[0] == season and time.time() - table[2] < TABLE_TTL_SECONDS:
+        count_cache("leaders_table", True)
+        if table[1] is None:
+            # Restored from the warm-start snapshot: the frame is built on first use
+            return _store_table(season, table[3], fetched_at=table[2])
+        return table[1]
+    count_cache("leaders_table", False)
+    return None
+
+
+def _store_table(season: str, ll: dict, fetched_at: float = None):
+    global _table
+    df = result_set_frame(ll, "LeagueLeaders")
+    with _lock:
+        _table = (season, df, fetched_at or time.time(), ll)
+    return df
+
+
+def snapshot_state():
+    """The cached table as (season, raw response, fetched_at), for the warm-start snapshot."""
+    with _lock:
+        table = _table
+    return None if table is None else (table[0], table[3], table[2])
+
+
+def restore_state(state):
+    global _table
+    season, ll, fetched_at = state
+    with _lock:
+        _table = (season, None, fetched_at, ll)
+
+
+def _load_table(season: str):
+    df = _cached_table(season)
+    if df is None:
+        print(f"Loading the {season} per-game table...")
+        df = coalesce(
+            ("leaders_table", season),
+            lambda: _store_table(season, call_endpoint(leagueleaders.LeagueLeaders, **_table_params(season))),
+        )
+    return df
+
+
+def get_league_table(season: str = None):
+    """
+    The per-game LeagueLeaders table (every player) of `season`, default the current one.
+    The current season's is the hourly-refreshed leaders table; past seasons are kept for good.
+    """
+    current = get_season_string()
+    season = season or current
+    if season == current:
+        return _load_table(season)
+    with _lock:
+        df = _past_tables.get(season)
+    if df is None:
+        ll = coalesce(("leaders_table", season),
+                      lambda: call_endpoint(leagueleaders.LeagueLeaders, **_table_params(season)))
+        df = result_set_frame(ll, "LeagueLeaders")
+        with _lock:
+            _past_tables[season] = df
+    return df
+
+
+async def get_league_table_async(season: str = None):
+    """get_league_table on the async stats client."""
+    current = get_season_string()
+    season = season or current
+    if season == current:
+        df = _cached_table(season)
+        if df is None:
+            ll = await get_stats_client().get(leagueleaders.LeagueLeaders, **_table_params(season))
+            df = _store_table(season, ll)
+        return df
+    with _lock:
+        df = _past_tables.get(season)
+    if df is None:
+        ll = await get_stats_client().get(leagueleaders.LeagueLeaders, **_table_params(season))
+        df = result_set_frame(ll, "LeagueLeaders")
+        with _lock:
+            _past_tables[season] = df
+    return df
+
+
+def _stat_values(df, stat: str, mode: str = "per_game"):
+    """Column for `stat`, a named composite or a "PTS+REB+AST" style sum."""
+    expression = COMPOSITE_STATS.get(stat, stat)
+    terms = expression.split("+")
+    missing = [t for t in terms if t not in df.columns]
+    if missing:
+        if mode == "per_game":
+            raise ValueError(f"Unknown stat {', '.join(missing)}.")
+        raise ValueError(f"Unknown stat {', '.join(missing)} for mode={mode}. "
+                         f"Use {', '.join(mode_columns(mode))} or sums of them.")
+    # round() drops float noise like 46.49999999999999 from the sums
+    return df[terms].sum(axis=1).round(3) if len(terms) > 1 else df[terms[0]]
+
+
+def _mode_table(df, mode: str):
+    """The league table in `mode` numbers (see derived_stats), derived once per table."""
+    if mode == "per_game":
+        return df
+    with _lock:
+        cached = _derived.get(mode)
+    if cached is not None and cached[0] is df:
+        return cached[1]
+    derived = derive(df, mode, per_game=True)
+    with _lock:
+        _derived[mode] = (df, derived)
+    return derived
+
+
+def _rank_leaders(df, stat: str, limit: int, season: str, ascending: bool = False, min_games: int = 0,
+                  mode: str = "per_game"):
     if df.empty:
         raise Exception(f"No leader data for {stat} in {season}.")
 
-    top_df = df.head(limit)
-    result = []
-    for _, row in top_df.iterrows():
-        result.append({
-            "player_id": int(row["PLAYER_ID"]),
-            "player_name": row["PLAYER"],
-            "team_abbr": row["TEAM"],
-            "value": row.get(stat),
-        })
-    return {"season": season, "stat_category": stat, "leaders": result}
+    # Qualifiers always look at the per-game table; only the ranked value depends on `mode`
+    ranked = df.assign(VALUE=_stat_values(_mode_table(df, mode), stat, mode))
+    keep = ranked["GP"] >= min_games
+    season_share = ranked["GP"].max() / 82
+    if stat in PCT_QUALIFIERS:
+        made_col, season_minimum = PCT_QUALIFIERS[stat]
+        keep &= ranked[made_col] * ranked["GP"] >= season_minimum * season_share
+    if mode in MODE_MINUTES_QUALIFIER:
+        keep &= ranked["MIN"] * ranked["GP"] >= MODE_MINUTES_QUALIFIER[mode] * season_share
+    ranked = ranked[keep & ranked["VALUE"].notna()]
+
+    top_df = ranked.nsmallest(limit, "VALUE") if ascending else ranked.nlargest(limit, "VALUE")
+    result = (
+        top_df[["PLAYER_ID", "PLAYER", "TEAM", "VALUE"]]
+        .rename(columns={"PLAYER_ID": "player_id", "PLAYER": "player_name",
+                         "TEAM": "team_abbr", "VALUE": "value"})
+        .to_dict(orient="records")
+    )
+    return {"season": season, "stat_category": stat, "mode": mode, "leaders": result}
+
+
+def get_league_leaders(stat: str, limit: int = 5, ascending: bool = False, min_games: int = 0,
+                       mode: str = "per_game"):
+    """
+    Returns the top `limit` players for the current season’s Regular Season,
+    ranked by the given stat category (per game).
+    `stat` may also be a composite ("PTS+REB+AST", "PRA"); `ascending` flips the order and
+    `min_games` drops players with fewer games played.
+    `mode` ranks totals, per-36 numbers or advanced stats (TS_PCT, USG_PCT, ...) instead.
+    """
+    season = get_season_string()
+
+    print(f"Loading Top {limit} players in {stat} for {season} ...")
+
+    return _rank_leaders(_load_table(season), stat, limit, season, ascending, min_games, mode)
+
+
+async def get_league_leaders_async(stat: str, limit: int = 5, ascending: bool = False, min_games: int = 0,
+                                   mode: str = "per_game"):
+    """get_league_leaders on the async stats client."""
+    season = get_season_string()
+
+    print(f"Loading Top {limit} players in {stat} for {season} ...")
+
+    return _rank_leaders(await get_league_table_async(season), stat, limit, season, ascending, min_games, mode)
 
 
 if __name__ == "__main__":
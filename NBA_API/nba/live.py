@@ -0,0 +1,302 @@
+# live.py
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from nba.fetch import result_set_frame
+from nba.boxscores import get_box_scores_async, refresh_box_scores_async
+from nba.game_index import date_settled
+from nba.stats_client import get_stats_client
+from nba.utils import lazy_module
+
+scoreboardv2 = lazy_module("nba_api.stats.endpoints.scoreboardv2")
+
+##AVAILABLE FUNCTIONS
+# get_live_tracker()
+# LiveTracker.snapshot()
+# LiveTracker.updates(since: int, timeout: float)
+# LiveTracker.subscribe()
+
+# One poller per process, however many people are watching.
+# It polls faster while games are on and backs off when nothing is happening.
+LIVE_POLL_SECONDS = 15
+IDLE_POLL_SECONDS = 120    # games scheduled, none started yet
+DONE_POLL_SECONDS = 600    # every game of the day is final (or there are none)
+MAX_BACKOFF_SECONDS = 300  # upstream errors
+# Long-poll viewers keep the poller alive this long after their last request
+VIEWER_GRACE_SECONDS = 60
+MAX_EVENTS = 1000
+
+STATUS_SCHEDULED, STATUS_LIVE, STATUS_FINAL = 1, 2, 3
+# Counting stats reported as deltas; MIN is sent as-is
+DELTA_STATS = ["PTS", "REB", "AST", "STL", "BLK", "FGM", "FGA", "FG3M", "FG3A",
+               "FTM", "FTA", "OREB", "DREB", "TO", "PF", "PLUS_MINUS"]
+LINE_STATS = ["MIN"] + DELTA_STATS
+
+
+def _player_lines(box):
+    """player_id -> (name, team, {stat: value}) straight from the raw PlayerStats rows."""
+    rs = next(rs for rs in box["resultSets"] if rs.get("name") == "PlayerStats")
+    idx = {h: i for i, h in enumerate(rs["headers"])}
+    return {
+        row[idx["PLAYER_ID"]]: (
+            row[idx["PLAYER_NAME"]],
+            row[idx["TEAM_ABBREVIATION"]],
+            {stat: row[idx[stat]] for stat in LINE_STATS},
+        )
+        for row in rs["rowSet"]
+    }
+
+
+def _points(value):
+    # LineScore PTS is empty until a game starts (None, or NaN once in a DataFrame)
+    return None if value is None or value != value else int(value)
+
+
+def _delta(old, new):
+    """Changed counting stats, new minus old (missing values count as 0)."""
+    delta = {}
+    for stat in DELTA_STATS:
+        change = (new.get(stat) or 0) - (old.get(stat) or 0)
+        if change:
+            delta[stat] = round(change, 1) if isinstance(change, float) else change
+    return delta
+
+
+class LiveTracker:
+    """
+    Today's games (last night's until they are all final), kept current by one background
+    poll loop on the event loop.
+    Every change is recorded as a numbered event, so clients only ever receive
+    what changed since the version they already have.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.day = None
+        self.games = {}   # game_id -> {"game_id", "status", "status_text", "matchup", "score"}
+        self.lines = {}   # game_id -> {player_id: (name, team, stats)}: last snapshot per game
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.polls = 0
+        self.next_poll_in = LIVE_POLL_SECONDS
+        self._changed = asyncio.Event()  # set (and replaced) whenever version or polls move
+        self._task = None
+        self._viewers = 0
+        self._last_viewer = 0.0
+
+    # Polling
+
+    async def _scoreboard(self, day):
+        board = await get_stats_client().get(
+            scoreboardv2.ScoreboardV2, game_date=day.isoformat(), league_id="00", day_offset=0
+        )
+        header = result_set_frame(board, "GameHeader").drop_duplicates("GAME_ID")
+        line_score = result_set_frame(board, "LineScore")
+        abbr = dict(zip(line_score["TEAM_ID"], line_score["TEAM_ABBREVIATION"]))
+        pts = {(g, t): p for g, t, p in zip(line_score["GAME_ID"], line_score["TEAM_ID"], line_score["PTS"])}
+
+        games = {}
+        for game in header.to_dict(orient="records"):
+            gid, home, away = game["GAME_ID"], game["HOME_TEAM_ID"], game["VISITOR_TEAM_ID"]
+            home_pts, away_pts = _points(pts.get((gid, home))), _points(pts.get((gid, away)))
+            games[gid] = {
+                "game_id": gid,
+                "status": int(game["GAME_STATUS_ID"]),
+                "status_text": str(game["GAME_STATUS_TEXT"]).strip(),
+                "matchup": f"{abbr.get(away, away)} @ {abbr.get(home, home)}",
+                "score": f"{away_pts} - {home_pts}" if None not in (away_pts, home_pts) else None,
+            }
+        return games
+
+    async def _slate(self):
+        """
+        (game date, games) to track. Late games run past local midnight, so last night's
+        slate is kept until all of its games are final (or the date has settled, see
+        game_index.date_settled) before moving on to today's.
+        """
+        today = datetime.now().date()
+        yesterday = today - timedelta(days=1)
+        if self.day in (None, yesterday) and not date_settled(yesterday):
+            games = await self._scoreboard(yesterday)
+            # One more poll of it after the last game ends, so that game's final line is recorded
+            tracked = self.games.values() if self.day == yesterday else []
+            if any(game["status"] != STATUS_FINAL for game in [*games.values(), *tracked]):
+                return yesterday, games
+        return today, await self._scoreboard(today)
+
+    def _record(self, event):
+        self.version += 1
+        self.events.append((self.version, {**event, "version": self.version}))
+
+    async def poll_once(self):
+        """One scoreboard call, plus a box score for every game that is (or just stopped being) live."""
+        day, games = await self._slate()
+        self.polls += 1
+        if day != self.day:
+            # New day, new slate
+            self.day, self.games, self.lines = day, {}, {}
+
+        # Live games are re-downloaded every poll. A game we saw live is fetched one last
+        # time when it ends (and stored for good); one that ended before we started
+        # watching comes from the box score store like any past game.
+        live, just_final, already_final = [], [], []
+        for gid, game in games.items():
+            seen = self.games.get(gid, {}).get("status")
+            if game["status"] == STATUS_LIVE:
+                live.append(gid)
+            elif game["status"] == STATUS_FINAL and seen != STATUS_FINAL:
+                (just_final if seen == STATUS_LIVE else already_final).append(gid)
+        boxes = {}
+        if live:
+            boxes.update(await refresh_box_scores_async(live, final=False))
+        if just_final:
+            boxes.update(await refresh_box_scores_async(just_final, final=True))
+        if already_final:
+            boxes.update(await get_box_scores_async(already_final, final=True))
+
+        for gid, game in games.items():
+            players = []
+            box = boxes.get(gid)
+            if box is not None:
+                old_lines = self.lines.get(gid, {})
+                new_lines = _player_lines(box)
+                for pid, (name, team, stats) in new_lines.items():
+                    old = old_lines.get(pid)
+                    if old is not None and old[2] == stats:
+                        continue
+                    players.append({
+                        "player_id": pid, "name": name, "team": team, "stats": stats,
+                        "delta": _delta(old[2] if old else {}, stats),
+                    })
+                self.lines[gid] = new_lines
+            if players or game != self.games.get(gid):
+                self._record({**game, "players": players})
+            self.games[gid] = game
+
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+        statuses = {game["status"] for game in games.values()}
+        if STATUS_LIVE in statuses:
+            return LIVE_POLL_SECONDS
+        if STATUS_SCHEDULED in statuses:
+            return IDLE_POLL_SECONDS
+        return DONE_POLL_SECONDS
+
+    def _watched(self):
+        return self._viewers > 0 or time.monotonic() - self._last_viewer < VIEWER_GRACE_SECONDS
+
+    async def _run(self):
+        failures = 0
+        try:
+            while self._watched():
+                try:
+                    self.next_poll_in = await self.poll_once()
+                    failures = 0
+                except Exception as e:
+                    failures += 1
+                    self.next_poll_in = min(MAX_BACKOFF_SECONDS, LIVE_POLL_SECONDS * 2 ** failures)
+                    print(f"Live poll failed ({e}); retrying in {self.next_poll_in}s")
+                await asyncio.sleep(self.next_poll_in)
+        finally:
+            self._task = None
+
+    def _ensure_polling(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _wait(self, predicate, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not predicate():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    async def _wait_past(self, version, timeout):
+        await self._wait(lambda: self.version > version, timeout)
+
+    # Views
+
+    def snapshot(self):
+        """Every game of the tracked date (see _slate) with its full current player lines."""
+        return {
+            "version": self.version,
+            "date": self.day.isoformat() if self.day else None,
+            "next_poll_in": self.next_poll_in,
+            "games": [
+                {
+                    **game,
+                    "players": [
+                        {"player_id": pid, "name": name, "team": team, "stats": stats}
+                        for pid, (name, team, stats) in self.lines.get(gid, {}).items()
+                    ],
+                }
+                for gid, game in self.games.items()
+            ],
+        }
+
+    def _events_since(self, version):
+        return [event for v, event in self.events if v > version]
+
+    async def updates(self, since: int = 0, timeout: float = 25):
+        """
+        Long-poll: the events after `since`, waiting up to `timeout` seconds for one.
+        since=0 (or a version too old to replay) gets the full snapshot instead.
+        """
+        self._last_viewer = time.monotonic()
+        self._ensure_polling()
+        if not since or since > self.version or (self.events and self.events[0][0] > since + 1):
+            if self.polls == 0:
+                await self._wait(lambda: self.polls > 0, timeout)  # first poll still running
+            return {"type": "snapshot", **self.snapshot()}
+        await self._wait_past(since, timeout)
+        self._last_viewer = time.monotonic()
+        return {"type": "updates", "version": self.version, "events": self._events_since(since)}
+
+    async def subscribe(self, keepalive: float = 15):
+        """
+        SSE feed: yields ("snapshot", state) once, then ("update", event) for every change
+        and ("ping", {}) when nothing happened for `keepalive` seconds.
+        """
+        self._viewers += 1
+        self._ensure_polling()
+        try:
+            if self.polls == 0:
+                await self._wait(lambda: self.polls > 0, keepalive)
+            seen = self.version
+            yield "snapshot", self.snapshot()
+            while True:
+                await self._wait_past(seen, keepalive)
+                if self.version == seen:
+                    yield "ping", {}
+                    continue
+                if self.events and self.events[0][0] > seen + 1:
+                    # Fell too far behind to replay: start over from a snapshot
+                    seen = self.version
+                    yield "snapshot", self.snapshot()
+                    continue
+                for event in self._events_since(seen):
+                    yield "update", event
+                seen = self.version
+        finally:
+            self._viewers -= 1
+            self._last_viewer = time.monotonic()
+
+
+_tracker = None
+_tracker_loop = None
+
+
+def get_live_tracker():
+    """The LiveTracker for the running event loop (created on first use)."""
+    global _tracker, _tracker_loop
+    loop = asyncio.get_running_loop()
+    if _tracker is None or _tracker_loop is not loop:
+        _tracker = LiveTracker()
+        _tracker_loop = loop
+    return _tracker
@@ -1,69 +1,307 @@
-from nba_api.stats.endpoints import leaguegamelog, boxscoretraditionalv2
 from datetime import datetime, timedelta
-import pandas as pd
-import time
 import json
-from nba.utils import clean_nans, get_season_string
+from nba.utils import clean_nans, nil_rows
+import asyncio
+from nba.fetch import fetch_as_completed, result_set_frame
+from nba.boxscores import get_box_score, get_box_scores, get_box_scores_async
+from nba.history import ingest_box_scores
+from nba.game_index import (date_settled, get_games_for_date, get_games_for_date_async,
+                            get_games_for_range, get_games_for_range_async)
 
 ##AVAILABLE FUNCTIONS
-#get_game_stats(days_back: int)
+#get_game_stats(days_back: int, columnar: bool = False)
+#get_game_stats_async(days_back: int, columnar: bool = False)
+#games_view(games_json, columnar: bool = False)
+#iter_game_stats_range(start_date: datetime.date, end_date: datetime.date, columnar: bool = False)
+#iter_game_stats_range_async(start_date: datetime.date, end_date: datetime.date, columnar: bool = False)
+#iter_game_stats(days_back: int)
+#iter_game_stats_async(days_back: int)
 
-def get_game_stats(days_back: int): #MAIN FUNCTION
+PLAYER_COLUMNS = [
+    "PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "REB", "AST",
+    "STL", "BLK", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "PLUS_MINUS"
+]
+
+
+def _box_lines(game_id, box):
+    """
+    (players as {"columns", "rows"}, final score) from a game's raw box score,
+    or None if it can't be read.
+    """
+    try:
+        # player stats
+        players_df = result_set_frame(box, "PlayerStats")
+        stats_df = players_df[PLAYER_COLUMNS]
+        # NaN -> "Nil" per column here, instead of walking every record afterwards
+        players = {"columns": PLAYER_COLUMNS, "rows": nil_rows(stats_df)}
+
+        # team stats (for final score)
+        team_df = result_set_frame(box, "TeamStats")
+        final_score = " - ".join(str(pts) for pts in team_df["PTS"].tolist())
+        return players, final_score
+
+    except Exception as e:
+        print(f"   Error fetching box score for game {game_id}: {e}")
+        return None
+
+
+def _game_entries(date_str, game_id, sides, box):
+    """One games_json entry per game log row (side) of a game, from its raw box score."""
+    lines = _box_lines(game_id, box)
+    if lines is None:
+        return []
+    players, final_score = lines
+    players = _records(players)
+    return [
+        {
+            "date": date_str,
+            "matchup": matchup,
+            "team": team,
+            "opponent": opponent,
+            "final_score": final_score,
+            "players": players
+        }
+        for matchup, team, opponent in sides
+    ]
+
+
+def _records(players):
+    return [dict(zip(players["columns"], row)) for row in players["rows"]]
+
+
+def games_view(games_json, columnar: bool = False):
+    """
+    games_json with each game's players as records (the default response) or as
+    {"columns", "rows"} (format=columnar, the form that is built and stored).
+    Accepts either form; games sharing one players object keep sharing the converted one.
+    """
+    converted = {}
+    games = []
+    for game in games_json.get("games", []):
+        players = game["players"]
+        if isinstance(players, dict) == columnar:
+            games.append(game)
+            continue
+        key = id(players)
+        if key not in converted:
+            if columnar:
+                columns = list(players[0]) if players else PLAYER_COLUMNS
+                converted[key] = {"columns": columns, "rows": [list(p.values()) for p in players]}
+            else:
+                converted[key] = _records(players)
+        games.append({**game, "players": converted[key]})
+    return {**games_json, "games": games}
+
+
+def _sides(games_df):
+    """
+    (game_id, matchup, team, opponent) for every game log row, in game log order.
+    The opponent is the other row of the same GAME_ID, so nobody has to split MATCHUP.
+    """
+    teams = {}
+    for game_id, team in zip(games_df["GAME_ID"], games_df["TEAM_ABBREVIATION"]):
+        teams.setdefault(game_id, []).append(team)
+    return [
+        (game_id, matchup, team, next((t for t in teams[game_id] if t != team), None))
+        for game_id, matchup, team in zip(games_df["GAME_ID"], games_df["MATCHUP"], games_df["TEAM_ABBREVIATION"])
+    ]
+
+
+def _build_games_json(date_str, games_df, boxes):
+    """Assemble games_json from the day's game log rows and their raw box scores."""
+    games_json = {"games": []}
+
+    # Each game has a row per team; its box score is parsed once for both
+    parsed = {}
+    for game_id, matchup, team, opponent in _sides(games_df):
+        box = boxes.get(game_id)
+        if box is None:
+            continue
+        if game_id not in parsed:
+            parsed[game_id] = _box_lines(game_id, box)
+        if parsed[game_id] is not None:
+            players, final_score = parsed[game_id]
+            games_json["games"].append({
+                "date": date_str,
+                "matchup": matchup,
+                "team": team,
+                "opponent": opponent,
+                "final_score": final_score,
+                "players": players
+            })
+
+    return games_json
+
+
+def _matchups_by_game(games_df):
+    """GAME_ID -> its (matchup, team, opponent) sides (one per team row), in game log order."""
+    matchups = {}
+    for game_id, *side in _sides(games_df):
+        matchups.setdefault(game_id, []).append(tuple(side))
+    return matchups
+
+
+def get_game_stats(days_back: int, columnar: bool = False): #MAIN FUNCTION
+    """
+    Every game of the day with its final score and player lines. One entry per game log
+    row, so each game appears once per team. columnar=True returns each game's players
+    as {"columns", "rows"} instead of one record per player.
+    """
     today = datetime.now().date()
     target_date = today - timedelta(days=days_back)
     date_str = target_date.strftime("%m/%d/%Y")
-    season_str = get_season_string(target_date)
 
-    games_json = {"games": []}
+    try:
+        # shared per-date index → includes all games (reg season, playoffs, etc.)
+        games_df = get_games_for_date(target_date)
+        if games_df.empty:
+            return clean_nans({"games": []})
+
+        # One row per team, so each game shows up twice: fetch every box score once,
+        # in parallel under the shared rate limit. Settled dates come from the local store.
+        final = date_settled(target_date)
+        boxes = get_box_scores(games_df["GAME_ID"], final=final)
+        if final:
+            ingest_box_scores(target_date, boxes)
+        return games_view(_build_games_json(date_str, games_df, boxes), columnar)
+
+    except Exception as e:
+        print(f"Error fetching data for {date_str}: {e}")
+
+    return clean_nans({"games": []})
+
+
+async def get_game_stats_async(days_back: int, columnar: bool = False):
+    """Same result as get_game_stats, fetched on the event loop instead of worker threads."""
+    today = datetime.now().date()
+    target_date = today - timedelta(days=days_back)
+    date_str = target_date.strftime("%m/%d/%Y")
 
     try:
-        gamelog = leaguegamelog.LeagueGameLog(
-            date_from_nullable=date_str,
-            date_to_nullable=date_str,
-            season=season_str
-            # no season_type filter → includes all games (reg season, playoffs, etc.)
-        )
-        games_df = gamelog.get_data_frames()[0]
+        games_df = await get_games_for_date_async(target_date)
         if games_df.empty:
-            return clean_nans(games_json)
-
-        for _, game in games_df.iterrows():
-            game_id = game["GAME_ID"]
-            matchup = game["MATCHUP"]
-
-            try:
-                time.sleep(0.6)
-                box = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id)
-
-                # player stats
-                players_df = box.get_data_frames()[0]
-                stats_df = players_df[[
-                    "PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "REB", "AST",
-                    "STL", "BLK", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "PLUS_MINUS"
-                ]]
-                players = stats_df.to_dict(orient="records")
-
-                # team stats (for final score)
-                team_df = box.get_data_frames()[1]
-                team_scores = team_df[["TEAM_ABBREVIATION", "PTS"]].to_dict(orient="records")
-                final_score = " - ".join(str(team["PTS"]) for team in team_scores)
-
-                # build JSON
-                games_json["games"].append({
-                    "date": date_str,
-                    "matchup": matchup,
-                    "final_score": final_score,
-                    "players": players
-                })
-
-            except Exception as e:
-                print(f"   Error fetching box score for game {game_id}: {e}")
-                continue
+            return clean_nans({"games": []})
+
+        final = date_settled(target_date)
+        boxes = await get_box_scores_async(games_df["GAME_ID"], final=final)
+        if final:
+            await asyncio.to_thread(ingest_box_scores, target_date, boxes)
+        return games_view(_build_games_json(date_str, games_df, boxes), columnar)
+
+    except Exception as e:
+        print(f"Error fetching data for {date_str}: {e}")
+
+    return clean_nans({"games": []})
+
+
+def _day_for(days_back):
+    today = datetime.now().date()
+    target_date = today - timedelta(days=days_back)
+    return target_date, target_date.strftime("%m/%d/%Y"), date_settled(target_date)
+
+
+def iter_game_stats(days_back: int):
+    """
+    Streaming get_game_stats: yields each games_json entry as soon as its box score
+    is in, in completion order rather than game log order.
+    """
+    target_date, date_str, final = _day_for(days_back)
+    try:
+        matchups = _matchups_by_game(get_games_for_date(target_date))
+    except Exception as e:
+        print(f"Error fetching data for {date_str}: {e}")
+        return
 
+    def fetch(game_id):
+        try:
+            return get_box_score(game_id, final=final)
+        except Exception as e:
+            print(f"   Error fetching box score for game {game_id}: {e}")
+            return None
+
+    for game_id, box in fetch_as_completed(fetch, matchups):
+        if box is None:
+            continue
+        if final:
+            ingest_box_scores(target_date, {game_id: box})
+        for entry in _game_entries(date_str, game_id, matchups[game_id], box):
+            yield entry
+
+
+async def iter_game_stats_async(days_back: int):
+    """iter_game_stats as an async generator on the event loop."""
+    target_date, date_str, final = _day_for(days_back)
+    try:
+        matchups = _matchups_by_game(await get_games_for_date_async(target_date))
     except Exception as e:
         print(f"Error fetching data for {date_str}: {e}")
+        return
+
+    async def fetch(game_id):
+        return game_id, (await get_box_scores_async([game_id], final=final))[game_id]
+
+    tasks = [asyncio.ensure_future(fetch(game_id)) for game_id in matchups]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            game_id, box = await next_done
+            if box is None:
+                continue
+            if final:
+                await asyncio.to_thread(ingest_box_scores, target_date, {game_id: box})
+            for entry in _game_entries(date_str, game_id, matchups[game_id], box):
+                yield entry
+    finally:
+        # The client went away: stop fetching what nobody will read
+        for task in tasks:
+            task.cancel()
+
+
+def iter_game_stats_range(start_date, end_date, columnar: bool = False):
+    """
+    Yield {"date": ..., "games": [...]} for every date from start_date to end_date, in order.
+    One LeagueGameLog call covers the whole range; box scores are fetched a day at a time
+    (only the ones not stored yet), so each day is yielded as soon as it is ready.
+    """
+    try:
+        by_date = get_games_for_range(start_date, end_date)
+    except Exception as e:
+        print(f"Error fetching data for {start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}: {e}")
+        by_date = {}
+
+    for i in range((end_date - start_date).days + 1):
+        target_date = start_date + timedelta(days=i)
+        date_str = target_date.strftime("%m/%d/%Y")
+        games_df = by_date.get(target_date)
+        if games_df is None or games_df.empty:
+            yield {"date": date_str, **clean_nans({"games": []})}
+            continue
+        final = date_settled(target_date)
+        boxes = get_box_scores(games_df["GAME_ID"], final=final)
+        if final:
+            ingest_box_scores(target_date, boxes)
+        yield {"date": date_str, **games_view(_build_games_json(date_str, games_df, boxes), columnar)}
+
+
+async def iter_game_stats_range_async(start_date, end_date, columnar: bool = False):
+    """iter_game_stats_range as an async generator on the event loop."""
+    try:
+        by_date = await get_games_for_range_async(start_date, end_date)
+    except Exception as e:
+        print(f"Error fetching data for {start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}: {e}")
+        by_date = {}
 
-    return clean_nans(games_json)
+    for i in range((end_date - start_date).days + 1):
+        target_date = start_date + timedelta(days=i)
+        date_str = target_date.strftime("%m/%d/%Y")
+        games_df = by_date.get(target_date)
+        if games_df is None or games_df.empty:
+            yield {"date": date_str, **clean_nans({"games": []})}
+            continue
+        final = date_settled(target_date)
+        boxes = await get_box_scores_async(games_df["GAME_ID"], final=final)
+        if final:
+            await asyncio.to_thread(ingest_box_scores, target_date, boxes)
+        yield {"date": date_str, **games_view(_build_games_json(date_str, games_df, boxes), columnar)}
 
 
 # Example usage
@@ -0,0 +1,143 @@
+# materialize.py
+import os
+import sys
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from nba.boxscores import CACHE_DIR
+from nba.metrics import count_cache
+from nba.day_summary import get_day_summary
+from nba.game_index import date_settled
+
+##AVAILABLE FUNCTIONS
+# read_materialized(kind: str, target_date: datetime.date)
+# materialize_day(target_date: datetime.date)
+# materialize_days(days: int = MATERIALIZE_DAYS)
+# get_or_compute_async(kind: str, days_ago: int, compute)
+# start_materializer(days: int = MATERIALIZE_DAYS, at_hour: int = MATERIALIZE_HOUR)
+#
+# CLI:  python -m nba.materialize [days]
+
+# Results for finished dates never change: compute them once, then serve the stored copy.
+# A date counts as finished once game_index.date_settled() says so (late games are over).
+MATERIALIZE_DAYS = int(os.environ.get("NBA_MATERIALIZE_DAYS", "7"))
+# Local hour for the nightly run (late games are final and logged by then; keep it at or
+# after NBA_FINAL_GRACE_HOURS, or the night's run finds yesterday not settled yet)
+MATERIALIZE_HOUR = int(os.environ.get("NBA_MATERIALIZE_HOUR", "6"))
+MATERIALIZED_PATH = os.path.join(CACHE_DIR, "materialized.sqlite3")
+
+# kind -> (sync builder taking days_ago, "is this a real result worth keeping?")
+_KINDS = {
+    # Matches (stored columnar, see matches.games_view), player of the day and the day's
+    # leaders in one row: /matches-of-the-day and /player-of-the-day are views over it.
+    # Only kept with every game's box score in (a partial day would also pick POTD from it);
+    # a complete day without games is kept too, so off-days are read, not recomputed.
+    "day_summary": (get_day_summary, lambda out: out.get("complete", False) and "error" not in out
+                    and (not out["games"] or "player_of_the_day" in out["player_of_the_day"])),
+}
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _conn = sqlite3.connect(MATERIALIZED_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            """CREATE TABLE IF NOT EXISTS materialized (
+                   kind TEXT NOT NULL,
+                   game_date TEXT NOT NULL,
+                   payload TEXT NOT NULL,
+                   computed_at REAL NOT NULL,
+                   PRIMARY KEY (kind, game_date)
+               )"""
+        )
+    return _conn
+
+
+def _days_ago_to_date(days_ago: int):
+    return (datetime.now() - timedelta(days=days_ago)).date()
+
+
+def read_materialized(kind: str, target_date):
+    """Stored result for (kind, date), or None."""
+    with _lock:
+        row = _db().execute(
+            "SELECT payload FROM materialized WHERE kind = ? AND game_date = ?",
+            (kind, target_date.isoformat()),
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _write(kind: str, target_date, payload):
+    if not date_settled(target_date) or not _KINDS[kind][1](payload):
+        # Late games may still be going, and partial or failed results may be upstream hiccups
+        return
+    with _lock:
+        _db().execute(
+            "INSERT OR REPLACE INTO materialized (kind, game_date, payload, computed_at) VALUES (?, ?, ?, ?)",
+            (kind, target_date.isoformat(), json.dumps(payload), time.time()),
+        )
+        _db().commit()
+
+
+def materialize_day(target_date):
+    """Compute and store every kind for one finished date."""
+    days_ago = (datetime.now().date() - target_date).days
+    for kind, (build, _) in _KINDS.items():
+        try:
+            _write(kind, target_date, build(days_ago))
+        except Exception as e:
+            print(f"Could not materialize {kind} for {target_date}: {e}")
+
+
+def materialize_days(days: int = MATERIALIZE_DAYS):
+    """Materialize yesterday and the `days - 1` days before it, skipping dates already stored."""
+    for days_ago in range(1, days + 1):
+        target_date = _days_ago_to_date(days_ago)
+        if all(read_materialized(kind, target_date) is not None for kind in _KINDS):
+            continue
+        print(f"Materializing {target_date}...")
+        materialize_day(target_date)
+
+
+async def get_or_compute_async(kind: str, days_ago: int, compute):
+    """
+    O(1) read of a materialized result; dates that were not computed yet fall back to
+    `await compute()` and are stored for next time.
+    """
+    target_date = _days_ago_to_date(days_ago)
+    payload = read_materialized(kind, target_date)
+    count_cache(f"materialized_{kind}", payload is not None)
+    if payload is None:
+        payload = await compute()
+        _write(kind, target_date, payload)
+    return payload
+
+
+def start_materializer(days: int = MATERIALIZE_DAYS, at_hour: int = MATERIALIZE_HOUR):
+    """Run materialize_days now and then every night at `at_hour`, on a daemon thread."""
+    def loop():
+        while True:
+            try:
+                materialize_days(days)
+            except Exception as e:
+                print(f"Materializer run failed: {e}")
+            now = datetime.now()
+            next_run = now.replace(hour=at_hour, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            time.sleep((next_run - now).total_seconds())
+
+    thread = threading.Thread(target=loop, name="materializer", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    materialize_days(int(sys.argv[1]) if len(sys.argv) > 1 else MATERIALIZE_DAYS)
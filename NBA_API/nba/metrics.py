@@ -0,0 +1,188 @@
+# metrics.py
+import threading
+import time
+from bisect import bisect_left
+
+##AVAILABLE FUNCTIONS
+# observe_route(route: str, method: str, status: int, seconds: float)
+# observe_upstream(endpoint: str, seconds: float, ok: bool)
+# observe_rate_wait(seconds: float)
+# count_cache(cache: str, hit: bool)
+# count_route_cache(route: str, result: str)
+# set_gauge(name: str, value: float)
+# render()
+# MetricsMiddleware(app)  (ASGI)
+
+# Seconds. Routes range from in-memory lookups to multi-call upstream fan-outs.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_route_latency = {}     # (route, method) -> Histogram
+_route_requests = {}    # (route, method, status) -> count
+_upstream_latency = {}  # endpoint class name -> Histogram
+_upstream_calls = {}    # (endpoint class name, "ok" | "error") -> count
+_rate_wait = {"seconds": 0.0, "waits": 0, "reservations": 0}
+_cache = {}             # (cache, "hit" | "miss") -> count
+_route_cache = {}       # (route, "hit" | "stale" | "miss" | "stale_if_error" | "refresh_error") -> count
+_gauges = {}            # metric name -> last value
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative when rendered."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def observe_route(route: str, method: str, status: int, seconds: float):
+    with _lock:
+        hist = _route_latency.get((route, method))
+        if hist is None:
+            hist = _route_latency[(route, method)] = Histogram()
+        hist.observe(seconds)
+        key = (route, method, status)
+        _route_requests[key] = _route_requests.get(key, 0) + 1
+
+
+def observe_upstream(endpoint: str, seconds: float, ok: bool):
+    with _lock:
+        hist = _upstream_latency.get(endpoint)
+        if hist is None:
+            hist = _upstream_latency[endpoint] = Histogram()
+        hist.observe(seconds)
+        key = (endpoint, "ok" if ok else "error")
+        _upstream_calls[key] = _upstream_calls.get(key, 0) + 1
+
+
+def observe_rate_wait(seconds: float):
+    with _lock:
+        _rate_wait["reservations"] += 1
+        if seconds > 0:
+            _rate_wait["waits"] += 1
+            _rate_wait["seconds"] += seconds
+
+
+def count_cache(cache: str, hit: bool):
+    key = (cache, "hit" if hit else "miss")
+    with _lock:
+        _cache[key] = _cache.get(key, 0) + 1
+
+
+def count_route_cache(route: str, result: str):
+    key = (route, result)
+    with _lock:
+        _route_cache[key] = _route_cache.get(key, 0) + 1
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def _render_histogram(lines, name, hist, labels):
+    cumulative = 0
+    for bound, n in zip(BUCKETS + ("+Inf",), hist.counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {hist.total:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+def render():
+    """Everything recorded so far, in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        lines += ["# HELP nba_http_request_duration_seconds Time spent serving each route.",
+                  "# TYPE nba_http_request_duration_seconds histogram"]
+        for (route, method), hist in sorted(_route_latency.items()):
+            _render_histogram(lines, "nba_http_request_duration_seconds", hist,
+                              _labels(route=route, method=method))
+
+        lines += ["# HELP nba_http_requests_total Requests served, by route and status.",
+                  "# TYPE nba_http_requests_total counter"]
+        for (route, method, status), n in sorted(_route_requests.items()):
+            lines.append(f"nba_http_requests_total{{{_labels(route=route, method=method, status=status)}}} {n}")
+
+        lines += ["# HELP nba_upstream_request_duration_seconds stats.nba.com call time per nba_api endpoint class.",
+                  "# TYPE nba_upstream_request_duration_seconds histogram"]
+        for endpoint, hist in sorted(_upstream_latency.items()):
+            _render_histogram(lines, "nba_upstream_request_duration_seconds", hist, _labels(endpoint=endpoint))
+
+        lines += ["# HELP nba_upstream_requests_total stats.nba.com calls per nba_api endpoint class.",
+                  "# TYPE nba_upstream_requests_total counter"]
+        for (endpoint, outcome), n in sorted(_upstream_calls.items()):
+            lines.append(f"nba_upstream_requests_total{{{_labels(endpoint=endpoint, outcome=outcome)}}} {n}")
+
+        lines += ["# HELP nba_rate_limit_wait_seconds_total Time callers were held back by the shared rate limit.",
+                  "# TYPE nba_rate_limit_wait_seconds_total counter",
+                  f"nba_rate_limit_wait_seconds_total {_rate_wait['seconds']:.6f}",
+                  "# HELP nba_rate_limit_waits_total Upstream calls that had to wait for a token.",
+                  "# TYPE nba_rate_limit_waits_total counter",
+                  f"nba_rate_limit_waits_total {_rate_wait['waits']}",
+                  "# HELP nba_rate_limit_reservations_total Tokens taken from the shared rate limit.",
+                  "# TYPE nba_rate_limit_reservations_total counter",
+                  f"nba_rate_limit_reservations_total {_rate_wait['reservations']}"]
+
+        lines += ["# HELP nba_cache_requests_total Cache lookups, by cache and result.",
+                  "# TYPE nba_cache_requests_total counter"]
+        for (cache, result), n in sorted(_cache.items()):
+            lines.append(f"nba_cache_requests_total{{{_labels(cache=cache, result=result)}}} {n}")
+
+        lines += ["# HELP nba_cache_hit_ratio Share of lookups answered from the cache.",
+                  "# TYPE nba_cache_hit_ratio gauge"]
+        for cache in sorted({cache for cache, _ in _cache}):
+            hits, misses = _cache.get((cache, "hit"), 0), _cache.get((cache, "miss"), 0)
+            lines.append(f"nba_cache_hit_ratio{{{_labels(cache=cache)}}} {hits / (hits + misses):.4f}")
+
+        lines += ["# HELP nba_route_cache_requests_total Cached routes, by result (hit, stale, miss, stale_if_error, refresh_error).",
+                  "# TYPE nba_route_cache_requests_total counter"]
+        for (route, result), n in sorted(_route_cache.items()):
+            lines.append(f"nba_route_cache_requests_total{{{_labels(route=route, result=result)}}} {n}")
+
+        for name, value in sorted(_gauges.items()):
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware timing every HTTP request by its route template
+    (/player-stats/{player_id}, not one series per player id).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Responses served by the route cache never reach the router, which sets "route"
+            route = getattr(scope.get("route"), "path", None) or scope.get("cached_route", "unmatched")
+            observe_route(route, scope["method"], status[0],
+                          time.perf_counter() - start)
@@ -0,0 +1,121 @@
+# name_index.py
+from nba_api.stats.static import players as nba_players_static
+
+##AVAILABLE FUNCTIONS
+# get_name_index()
+# NameIndex.autocomplete(prefix: str, limit: int = 10)
+# snapshot_state() / restore_state(state)
+
+# Every 1- and 2-character substring gets its own posting list; longer queries
+# intersect the trigram lists and verify the candidates.
+_NGRAM = 3
+
+
+class NameIndex:
+    """
+    Player names indexed once:
+      - a prefix trie over first-name tokens (the "first name starts with" group)
+      - an n-gram index over full names (the substring matches)
+    Players are numbered by their position in full_name order, so every posting
+    list is already sorted the way autocomplete returns results.
+    """
+
+    def __init__(self, players):
+        # Stable sort keeps get_players() order for equal names, as sorted() did
+        self.players = sorted(
+            ({"id": p["id"], "full_name": p["full_name"]} for p in players),
+            key=lambda p: p["full_name"],
+        )
+        self.names_lower = [p["full_name"].lower() for p in self.players]
+        self.trie = {}
+        self.grams = {}
+
+        for rank, name in enumerate(self.names_lower):
+            tokens = name.split()
+            if tokens:
+                self._add_token(tokens[0], rank)
+            for gram in self._grams_of(name):
+                self.grams.setdefault(gram, []).append(rank)
+
+    @staticmethod
+    def _grams_of(name):
+        grams = set()
+        for n in range(1, _NGRAM + 1):
+            for i in range(len(name) - n + 1):
+                grams.add(name[i:i + n])
+        return grams
+
+    def _add_token(self, token, rank):
+        node = self.trie
+        for ch in token:
+            node = node.setdefault(ch, {})
+            # "" holds every rank below this node, in rank order
+            node.setdefault("", []).append(rank)
+
+    def _first_name_matches(self, prefix):
+        node = self.trie
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node.get("", [])
+
+    def _substring_matches(self, query):
+        if len(query) <= _NGRAM:
+            return self.grams.get(query, [])
+        postings = []
+        for i in range(len(query) - _NGRAM + 1):
+            posting = self.grams.get(query[i:i + _NGRAM])
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        names = self.names_lower
+        return sorted(rank for rank in candidates if query in names[rank])
+
+    def autocomplete(self, prefix: str, limit: int = 10):
+        """
+        Players whose full name contains `prefix` (case-insensitive),
+        first-name prefix matches first, then by full name.
+        """
+        query = prefix.lower()
+        # A space can't be inside a first-name token, so those queries never hit the trie
+        first = [] if " " in query else self._first_name_matches(query)
+        result = [self.players[rank] for rank in first[:limit]]
+        if len(result) < limit:
+            taken = set(first)
+            for rank in self._substring_matches(query):
+                if rank not in taken:
+                    result.append(self.players[rank])
+                    if len(result) == limit:
+                        break
+        return [dict(p) for p in result]
+
+
+_index = None
+
+
+def get_name_index():
+    """The process-wide NameIndex, built on first use."""
+    global _index
+    if _index is None:
+        _index = NameIndex(nba_players_static.get_players())
+    return _index
+
+
+def snapshot_state():
+    """The built index's attributes, for the warm-start snapshot (None if not built yet)."""
+    return None if _index is None else vars(_index)
+
+
+def restore_state(state):
+    """Adopt an index saved by snapshot_state instead of rebuilding it from the player list."""
+    global _index
+    index = NameIndex.__new__(NameIndex)
+    vars(index).update(state)
+    _index = index
@@ -1,17 +1,47 @@
 # player_search.py
 from nba_api.stats.static import players as nba_players_static
-from nba_api.stats.endpoints import commonplayerinfo, playercareerstats
-from nba.utils import (_TEAM_MAP, get_season_string, clean_nans)
-import numpy as np
+from nba.utils import (get_season_string, clean_nans, lazy_module)
+from nba.fetch import call_endpoint, coalesce, fetch_all, result_set_frame
+from nba.name_index import get_name_index
+from nba.rosters import get_current_teams, get_current_teams_async
+from nba.stats_client import get_stats_client
+from nba.metrics import count_cache
+from nba.derived_stats import derive, mode_columns
+from collections import OrderedDict
+import asyncio
+import threading
+import time
+
+pd = lazy_module("pandas")
+playercareerstats = lazy_module("nba_api.stats.endpoints.playercareerstats")
 
 ##AVAILABLE FUNCTIONS
 # do_player_search(name: str)
-# get_player_stats(player_id: int)
-# do_players_comparison(player1: int, player2: int)
+# do_player_search_async(name: str)
+# get_player_stats(player_id: int, mode: str = "totals")
+# get_player_stats_async(player_id: int, mode: str = "totals")
+# do_players_comparison(player1: int, player2: int, mode: str = "totals")
+# do_players_comparison_async(player1: int, player2: int, mode: str = "totals")
+# compare_players_batch(player_ids, mode: str = "per_game")
+# compare_players_batch_async(player_ids, mode: str = "per_game")
+# snapshot_state() / restore_state(state)
 # do_players_autocomplete(prefix: str, limit: int = 10)
 
 #PLAYER SEARCH FUCTION
 #############################################################
+def _search_results(matches, teams):
+    result = []
+    for p in matches:
+        pid = p["id"]
+        result.append({
+            "id": pid,
+            "full_name": p["full_name"],
+            "current_team": teams[pid]
+        })
+
+    return result
+
+
 def do_player_search(name: str):
     """
     Search for players whose names contain the given string (case-insensitive).
@@ -27,26 +57,20 @@ def do_player_search(name: str):
         print("No players found matching that name.")
         return []
 
-    result = []
-    for p in matches:
-        pid = p["id"]
-        full_name = p["full_name"]
+    # Current teams come from the league-wide roster snapshot, not one call per match
+    return _search_results(matches, get_current_teams([p["id"] for p in matches]))
 
-        # Attempt to get current team via CommonPlayerInfo
-        try:
-            info = commonplayerinfo.CommonPlayerInfo(player_id=pid).get_data_frames()[0]
-            current_team_id = info.loc[0, "TEAM_ID"]
-            team_abbr = _TEAM_MAP.get(int(current_team_id), None)
-        except Exception:
-            team_abbr = None
 
-        result.append({
-            "id": pid,
-            "full_name": full_name,
-            "current_team": team_abbr
-        })
+async def do_player_search_async(name: str):
+    """do_player_search for the async routes."""
+    print(f"Retrieving {name}'s details...")
+    matches = nba_players_static.find_players_by_full_name(name)
 
-    return result
+    if not matches:
+        print("No players found matching that name.")
+        return []
+
+    return _search_results(matches, await get_current_teams_async([p["id"] for p in matches]))
 
 
 # if __name__ == "__main__":
@@ -63,29 +87,125 @@ def do_player_search(name: str):
 #PLAYER STATS FUCTION
 #############################################################
 
+# Career frames only change when the player plays again, so an hour of reuse is safe
+CAREER_TTL_SECONDS = 60 * 60
+MAX_CACHED_CAREERS = 1024
+
+_careers = OrderedDict()  # player_id -> (PlayerCareerStats response, fetched_at), LRU order
+_careers_lock = threading.Lock()
+
+
+def _cached_career(player_id: int):
+    with _careers_lock:
+        entry = _careers.get(player_id)
+        if entry is None or time.time() - entry[1] >= CAREER_TTL_SECONDS:
+            count_cache("careers", False)
+            return None
+        _careers.move_to_end(player_id)
+    count_cache("careers", True)
+    return entry[0]
+
+
+def _store_career(player_id: int, career: dict):
+    with _careers_lock:
+        _careers[player_id] = (career, time.time())
+        _careers.move_to_end(player_id)
+        while len(_careers) > MAX_CACHED_CAREERS:
+            _careers.popitem(last=False)
+    return career
+
+
+def snapshot_state():
+    """Cached careers as [(player_id, response, fetched_at)], oldest first, for the warm-start snapshot."""
+    with _careers_lock:
+        return [(pid, career, fetched_at) for pid, (career, fetched_at) in _careers.items()]
+
+
+def restore_state(state):
+    with _careers_lock:
+        for pid, career, fetched_at in state:
+            if time.time() - fetched_at < CAREER_TTL_SECONDS:
+                _careers[pid] = (career, fetched_at)
+                _careers.move_to_end(pid)
+        while len(_careers) > MAX_CACHED_CAREERS:
+            _careers.popitem(last=False)
+
+
+def get_career(player_id: int):
+    """PlayerCareerStats response for a player, from the per-player cache when fresh."""
+    career = _cached_career(player_id)
+    if career is None:
+        career = coalesce(
+            ("career", player_id),
+            lambda: _store_career(
+                player_id, call_endpoint(playercareerstats.PlayerCareerStats, player_id=player_id)
+            ),
+        )
+    return career
+
+
+async def get_career_async(player_id: int):
+    """get_career on the async stats client."""
+    career = _cached_career(player_id)
+    if career is None:
+        career = _store_career(
+            player_id,
+            await get_stats_client().get(playercareerstats.PlayerCareerStats, player_id=player_id),
+        )
+    return career
+
+
+def _season_row(df, season: str):
+    """
+    The one SeasonTotalsRegularSeason row of `season` (empty if none). A player traded
+    mid-season has a row per team plus a combined "TOT" row; the combined one is used.
+    """
+    rows = df[df["SEASON_ID"] == season]
+    combined = rows[rows["TEAM_ABBREVIATION"] == "TOT"]
+    return combined.head(1) if not combined.empty else rows.head(1)
+
+
+def _current_season_stats(career: dict, player_id: int, mode: str = "totals"):
+    df = result_set_frame(career, "SeasonTotalsRegularSeason")  # DataFrame per season
+
+    # Get current season dynamically
+    current_season = get_season_string()
+    row = _season_row(df, current_season)
+
+    if row.empty:
+        return {"error": f"No stats found for player {player_id} in season {current_season}."}
+
+    stats = row.iloc[0].to_dict()
+    # Clean NaNs
+    stats = clean_nans(stats)
+
+    result = {"player_id": player_id, "season": current_season, "stats": stats}
+    if mode != "totals":
+        # Per-game / per-36 / advanced numbers next to the raw totals (see derived_stats)
+        result["mode"] = mode
+        result["derived"] = clean_nans(derive(row, mode).iloc[0].to_dict())
+    return result
+
 
-def get_player_stats(player_id: int):
+def get_player_stats(player_id: int, mode: str = "totals"):
     """
     Returns the current season stats for the requested player_id.
     Uses PlayerCareerStats to fetch per‐season splits and filters for the current season.
+    Any other `mode` (per_game, per_36, advanced) adds those numbers as "derived".
     """
     try:
         print(f"Retrieving player {player_id} stats...")
-        career = playercareerstats.PlayerCareerStats(player_id=player_id)
-        df = career.get_data_frames()[0]  # DataFrame per season
+        return _current_season_stats(get_career(player_id), player_id, mode)
 
-        # Get current season dynamically
-        current_season = get_season_string()
-        row = df[df["SEASON_ID"] == current_season]
-
-        if row.empty:
-            return {"error": f"No stats found for player {player_id} in season {current_season}."}
+    except Exception as exc:
+        return {"error": f"NBA API error: {str(exc)}"}
 
-        stats = row.iloc[0].to_dict()
-        # Clean NaNs
-        stats = clean_nans(stats)
 
-        return {"player_id": player_id, "season": current_season, "stats": stats}
+async def get_player_stats_async(player_id: int, mode: str = "totals"):
+    """get_player_stats on the async stats client."""
+    try:
+        print(f"Retrieving player {player_id} stats...")
+        return _current_season_stats(await get_career_async(player_id), player_id, mode)
 
     except Exception as exc:
         return {"error": f"NBA API error: {str(exc)}"}
@@ -103,15 +223,108 @@ def get_player_stats(player_id: int):
 
 
 
-def do_players_comparison(player1: int, player2: int):
+def do_players_comparison(player1: int, player2: int, mode: str = "totals"):
+    season = get_season_string()
+    print(f"Comparing players ({player1} vs {player2}) for {season}...")
+
+    p1_data = get_player_stats(player1, mode)
+    p2_data = get_player_stats(player2, mode)
+
+    return {"season": season, "player1": p1_data, "player2": p2_data}
+
+
+async def do_players_comparison_async(player1: int, player2: int, mode: str = "totals"):
+    """do_players_comparison with both players fetched concurrently."""
     season = get_season_string()
     print(f"Comparing players ({player1} vs {player2}) for {season}...")
 
-    p1_data = get_player_stats(player1)
-    p2_data = get_player_stats(player2)
+    p1_data, p2_data = await asyncio.gather(
+        get_player_stats_async(player1, mode), get_player_stats_async(player2, mode)
+    )
 
     return {"season": season, "player1": p1_data, "player2": p2_data}
 
+
+# Season totals turned into per-game numbers for the batch comparison
+PER_GAME_COLUMNS = ["MIN", "PTS", "REB", "AST", "STL", "BLK", "TOV",
+                    "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA"]
+PCT_COLUMNS = ["FG_PCT", "FG3_PCT", "FT_PCT"]
+
+
+def _compare_columns(mode):
+    """The batch comparison's columns: the original per-game set, or everything derive() gives."""
+    if mode == "per_game":
+        return PER_GAME_COLUMNS + PCT_COLUMNS
+    return mode_columns(mode)
+
+
+def _compare_per_game(careers: dict, season: str, mode: str = "per_game"):
+    """
+    careers: {player_id: PlayerCareerStats response or the exception raised fetching it}.
+    One row per player for `season`; the `mode` numbers of every player are derived in one pass.
+    """
+    columns = _compare_columns(mode)
+    rows = []
+    errors = {}
+    for pid, career in careers.items():
+        try:
+            if isinstance(career, Exception):
+                raise career
+            df = result_set_frame(career, "SeasonTotalsRegularSeason")
+            row = _season_row(df, season)
+            if row.empty:
+                errors[pid] = f"No stats found for player {pid} in season {season}."
+            else:
+                rows.append(row.assign(PLAYER_ID=pid))
+        except Exception as exc:
+            errors[pid] = f"NBA API error: {str(exc)}"
+
+    table = pd.concat(rows, ignore_index=True).set_index("PLAYER_ID") if rows else None
+    if table is not None:
+        derived = derive(table, mode)[columns]
+
+    players = []
+    for pid in careers:
+        if pid in errors:
+            players.append({"player_id": pid, "error": errors[pid]})
+            continue
+        players.append({
+            "player_id": pid,
+            "team_abbr": table.at[pid, "TEAM_ABBREVIATION"],
+            "GP": int(table.at[pid, "GP"]),
+            mode: derived.loc[pid].to_dict(),
+        })
+    return clean_nans({"season": season, "mode": mode, "columns": columns, "players": players})
+
+
+def compare_players_batch(player_ids, mode: str = "per_game"):
+    """
+    Per-game averages (or per-36 / advanced / totals, see `mode`) of the current season
+    for N players, aligned on the same columns.
+    Only players missing from the career cache cost an upstream call (fetched in parallel).
+    """
+    season = get_season_string()
+    player_ids = list(dict.fromkeys(player_ids))
+    print(f"Comparing {len(player_ids)} players for {season}...")
+
+    def fetch(pid):
+        try:
+            return get_career(pid)
+        except Exception as exc:
+            return exc
+
+    return _compare_per_game(dict(zip(player_ids, fetch_all(fetch, player_ids))), season, mode)
+
+
+async def compare_players_batch_async(player_ids, mode: str = "per_game"):
+    """compare_players_batch on the async stats client."""
+    season = get_season_string()
+    player_ids = list(dict.fromkeys(player_ids))
+    print(f"Comparing {len(player_ids)} players for {season}...")
+
+    careers = await asyncio.gather(*(get_career_async(pid) for pid in player_ids), return_exceptions=True)
+    return _compare_per_game(dict(zip(player_ids, careers)), season, mode)
+
 # if __name__ == "__main__":
 #     # Replace with two valid NBA player IDs
 #     player1_id = 2544      # Example: LeBron James
@@ -130,33 +343,9 @@ def do_players_autocomplete(prefix: str, limit: int = 10):
     """
     Return players whose names contain the given prefix (case-insensitive).
     Prioritize first-name matches before others.
+    Served from the in-memory name index (see name_index.py), built once per process.
     """
-    prefix_lower = prefix.lower()
-
-    # Fetch all players
-    all_players = nba_players_static.get_players()
-
-    # Filter matches (substring, not just startswith)
-    matches = [
-        {"id": p["id"], "full_name": p["full_name"]}
-        for p in all_players
-        if prefix_lower in p["full_name"].lower()
-    ]
-
-    if not matches:
-        return []  # No suggestions, just empty list
-
-    def sort_key(player):
-        name_parts = player["full_name"].lower().split()
-        first_name = name_parts[0]
-        # Prioritize first name startswith -> then substring match
-        return (
-            0 if first_name.startswith(prefix_lower) else 1,
-            player["full_name"],
-        )
-
-    # Sort with custom key, clamp to limit
-    return sorted(matches, key=sort_key)[:limit]
+    return get_name_index().autocomplete(prefix, limit)
 
 
 
@@ -1,210 +1,211 @@
 # player_of_the_day.py
-import time
-import math
+import asyncio
 import json
-import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
-from nba.utils import get_season_string, clean_nans
-
-from nba_api.stats.endpoints import (
-    leaguegamelog,
-    boxscoretraditionalv2,
-    boxscoresummaryv2,
-)
+from nba.utils import get_season_string, clean_nans, lazy_module
+from nba.fetch import call_endpoint
+from nba.scoring import player_lines, rank_players
+from nba.boxscores import get_box_scores, get_box_scores_async
+from nba.history import ingest_box_scores
+from nba.game_index import (date_settled, get_games_for_date, get_games_for_date_async,
+                            get_games_for_range, get_games_for_range_async)
+from nba.stats_client import get_stats_client
+from nba.game_context import context_from_summary, final_score, opponent_of, resolve_game_contexts
+
+boxscoresummaryv2 = lazy_module("nba_api.stats.endpoints.boxscoresummaryv2")
 
 # #AVAILABLE FUNCTIONS
-# get_player_of_the_day(days_ago: int = 1)
+# get_player_of_the_day(days_ago: int = 1, formula: str = "pra", top_n: int = 1)
+# get_player_of_the_day_async(days_ago: int = 1, formula: str = "pra", top_n: int = 1)
+# iter_player_of_the_day_range(start_date, end_date, formula: str = "pra", top_n: int = 1)
+# iter_player_of_the_day_range_async(start_date, end_date, formula: str = "pra", top_n: int = 1)
+# player_of_the_day_from(date_str: str, games_df, box_dicts: dict, players_df=None, formula: str = "pra", top_n: int = 1)
+# player_of_the_day_from_async(date_str: str, games_df, box_dicts: dict, players_df=None, formula: str = "pra", top_n: int = 1)
+
+def _target_date(days_ago):
+    target_dt = (datetime.now() - timedelta(days=days_ago)).date()
+    date_str = target_dt.strftime("%m/%d/%Y")
+    print(f"Fetching Player of the Day for {date_str} (season {get_season_string(target_dt)})...")
+    return target_dt, date_str
+
 
-def get_player_of_the_day(days_ago: int = 1): #Main funtion
+def _to_payload(row):
+    return {
+        "Player": row["PLAYER_NAME"],
+        "Team": row["TEAM_ABBREVIATION"],
+        "Points": int(row["PTS"]),
+        "Rebounds": int(row["REB"]),
+        "Assists": int(row["AST"]),
+    }
+
+
+def _assemble_result(date_str, ranked, context, top_n):
+    """
+    Build the response from the ranked player lines and the winner's game context
+    (see game_context; None when neither the day's data nor the summary could settle it).
+    """
+    best_row = ranked.iloc[0]
+    if context is not None:
+        opponent_abbr = opponent_of(context, best_row["TEAM_ABBREVIATION"])
+        final_score_str = final_score(context)
+    else:
+        opponent_abbr = "N/A"
+        final_score_str = "Score unavailable"
+
+    result = {
+        "date": date_str,
+        "player_of_the_day": {
+            **_to_payload(best_row),
+            "Opponent": opponent_abbr,
+            "Final_Score": final_score_str,
+        },
+    }
+    if top_n > 1:
+        result["top_players"] = [
+            {**_to_payload(row), "Score": round(float(row["SCORE"]), 1)}
+            for _, row in ranked.iterrows()
+        ]
+    return clean_nans(result)
+
+
+def get_player_of_the_day(days_ago: int = 1, formula: str = "pra", top_n: int = 1): #Main funtion
     """
     Standalone (terminal) function.
-    Picks the best player for the day (PTS+REB+AST) across ALL game types.
+    Picks the best player for the day (PTS+REB+AST by default, see scoring.SCORING_FORMULAS)
+    across ALL game types. With top_n > 1 the runners-up are listed under "top_players".
     Returns a JSON-serializable dict.
     """
-    target_dt = (datetime.now() - timedelta(days=days_ago)).date()
-    date_str = target_dt.strftime("%m/%d/%Y")
-    season = get_season_string(target_dt)
+    target_dt, date_str = _target_date(days_ago)
 
-    print(f"Fetching Player of the Day for {date_str} (season {season})...")
+    # The shared per-date index (all season types, avoid ScoreboardV2)
+    try:
+        games_df = get_games_for_date(target_dt)
+    except Exception as e:
+        print(f"  Could not load games for {date_str}: {e}")
+        games_df = None
 
-    # Gather game IDs using LeagueGameLog for each season type (avoid ScoreboardV2)
-    season_types = ["Regular Season", "Playoffs", "Pre Season", "In Season Tournament", "All Star"]
-    game_ids = set()
+    return _player_of_the_day_for(target_dt, date_str, games_df, formula, top_n)
 
-    for stype in season_types:
-        try:
-            gl = leaguegamelog.LeagueGameLog(
-                season=season,
-                season_type_all_star=stype,
-                date_from_nullable=date_str,
-                date_to_nullable=date_str,
-                # We *could* pass player/team mode; default works, we'll just dedupe GAME_IDs
-            )
-            df = gl.get_data_frames()[0]
-            if not df.empty:
-                # GAME_ID appears per-player when defaulting to player logs; dedupe
-                for gid in df["GAME_ID"].unique().tolist():
-                    game_ids.add(gid)
-        except Exception as e:
-            # If a season type isn't valid on that day, just skip it
-            # (e.g., no Playoffs that date).
-            continue
-
-    if not game_ids:
+
+def _player_of_the_day_for(target_dt, date_str, games_df, formula, top_n):
+    """get_player_of_the_day once the day's game log is known."""
+    if games_df is None or games_df.empty:
         return {"message": f"No NBA games were played on {date_str}."}
 
-    best = None  # will hold (score, payload_dict, game_id, team_abbr)
-    # We’ll also store team summaries per game to compute final score later
-    team_summaries = {}
+    # Box scores come from the local store or are fetched in parallel, in game order
+    final = date_settled(target_dt)
+    box_dicts = get_box_scores(sorted(games_df["GAME_ID"].unique()), final=final)
+    if final:
+        ingest_box_scores(target_dt, box_dicts)
+    return player_of_the_day_from(date_str, games_df, box_dicts, formula=formula, top_n=top_n)
+
+
+def _rank_day(games_df, box_dicts, players_df, formula, top_n):
+    """(ranked player lines, the best player's game context or None, its GAME_ID)."""
+    if players_df is None:
+        players_df = player_lines(box_dicts)
+    # Stack every player line of the day and score them in one pass
+    ranked = rank_players(players_df, formula=formula, top_n=top_n)
+    if ranked.empty:
+        return ranked, None, None
+    # Opponent, home/away and score come from the game log + box scores already here;
+    # BoxScoreSummaryV2 is only asked when those don't settle the winner's game
+    best_gid = ranked.iloc[0]["GAME_ID"]
+    return ranked, resolve_game_contexts(games_df, box_dicts).get(best_gid), best_gid
+
+
+def player_of_the_day_from(date_str, games_df, box_dicts: dict, players_df=None, formula: str = "pra",
+                           top_n: int = 1):
+    """
+    get_player_of_the_day's result from a day's game log and raw box scores already at hand
+    (players_df: their player_lines, when the caller has stacked them already).
+    """
+    ranked, context, best_gid = _rank_day(games_df, box_dicts, players_df, formula, top_n)
+    if ranked.empty:
+        return {"message": f"No player data available for {date_str}."}
+    if context is None:
+        try:
+            context = context_from_summary(call_endpoint(boxscoresummaryv2.BoxScoreSummaryV2, game_id=best_gid))
+        except Exception:
+            context = None
+    return _assemble_result(date_str, ranked, context, top_n)
 
-    for gid in sorted(game_ids):
-        # Rate-limit kindness
-        time.sleep(0.6)
 
+async def player_of_the_day_from_async(date_str, games_df, box_dicts: dict, players_df=None,
+                                       formula: str = "pra", top_n: int = 1):
+    """player_of_the_day_from, asking BoxScoreSummaryV2 (when needed) on the async stats client."""
+    ranked, context, best_gid = _rank_day(games_df, box_dicts, players_df, formula, top_n)
+    if ranked.empty:
+        return {"message": f"No player data available for {date_str}."}
+    if context is None:
         try:
-            # 1) Player stats (traditional box score)
-            box = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=gid)
-            box_dict = box.get_dict()
-
-            # Extract PlayerStats safely by name
-            player_rs = next(
-                (rs for rs in box_dict.get("resultSets", []) if rs.get("name") == "PlayerStats"),
-                None
-            )
-            if not player_rs or not player_rs.get("rowSet"):
-                continue
-
-            ph = player_rs["headers"]
-            idx_PLAYER_NAME = ph.index("PLAYER_NAME")
-            idx_TEAM_ABBR   = ph.index("TEAM_ABBREVIATION")
-            idx_PTS         = ph.index("PTS")
-            idx_REB         = ph.index("REB")
-            idx_AST         = ph.index("AST")
-
-            # 2) Team stats for later final-score formatting
-            team_rs = next(
-                (rs for rs in box_dict.get("resultSets", []) if rs.get("name") == "TeamStats"),
-                None
+            context = context_from_summary(
+                await get_stats_client().get(boxscoresummaryv2.BoxScoreSummaryV2, game_id=best_gid)
             )
-            if team_rs and team_rs.get("rowSet"):
-                th = team_rs["headers"]
-                idx_TTEAM_ID  = th.index("TEAM_ID")
-                idx_TABBR     = th.index("TEAM_ABBREVIATION")
-                idx_TPTS      = th.index("PTS")
-                team_summaries[gid] = [
-                    {
-                        "TEAM_ID": row[idx_TTEAM_ID],
-                        "ABBR": row[idx_TABBR],
-                        "PTS": row[idx_TPTS],
-                    }
-                    for row in team_rs["rowSet"]
-                ]
-
-            # 3) Walk players and compute SCORE = PTS + REB + AST
-            for row in player_rs["rowSet"]:
-                try:
-                    pts = int(row[idx_PTS]) if row[idx_PTS] not in (None, "", "None") else 0
-                    reb = int(row[idx_REB]) if row[idx_REB] not in (None, "", "None") else 0
-                    ast = int(row[idx_AST]) if row[idx_AST] not in (None, "", "None") else 0
-                except Exception:
-                    # If any weird types pop up, default to 0
-                    pts, reb, ast = 0, 0, 0
-
-                score = pts + reb + ast
-                player_name = row[idx_PLAYER_NAME]
-                team_abbr = row[idx_TEAM_ABBR]
-
-                payload = {
-                    "Player": player_name,
-                    "Team": team_abbr,
-                    "Points": pts,
-                    "Rebounds": reb,
-                    "Assists": ast,
-                }
-
-                if (best is None) or (score > best[0]):
-                    best = (score, payload, gid, team_abbr)
-
-        except Exception as e:
-            print(f"  Skipping game {gid} due to error: {e}")
-            continue
-
-    if best is None:
-        return {"message": f"No player data available for {date_str}."}
+        except Exception:
+            context = None
+    return _assemble_result(date_str, ranked, context, top_n)
+
 
-    _, best_payload, best_gid, best_team_abbr = best
+async def get_player_of_the_day_async(days_ago: int = 1, formula: str = "pra", top_n: int = 1):
+    """Same result as get_player_of_the_day, fetched on the event loop."""
+    target_dt, date_str = _target_date(days_ago)
 
-    # Build final score + opponent using BoxScoreSummaryV2 (no WinProbability here)
-    time.sleep(0.6)
     try:
-        summ = boxscoresummaryv2.BoxScoreSummaryV2(game_id=best_gid).get_dict()
-        # GameSummary has HOME_TEAM_ID / VISITOR_TEAM_ID
-        gs = next((rs for rs in summ["resultSets"] if rs.get("name") == "GameSummary"), None)
-        ls = next((rs for rs in summ["resultSets"] if rs.get("name") == "LineScore"), None)
-
-        home_abbr = away_abbr = None
-        home_pts = away_pts = None
-
-        if gs and gs.get("rowSet"):
-            gh = gs["headers"]
-            idx_HOME = gh.index("HOME_TEAM_ID")
-            idx_AWAY = gh.index("VISITOR_TEAM_ID")
-            home_id = gs["rowSet"][0][idx_HOME]
-            away_id = gs["rowSet"][0][idx_AWAY]
-
-            # Map team_id -> (abbr, pts) from LineScore
-            id_to_abbr_pts = {}
-            if ls and ls.get("rowSet"):
-                lh = ls["headers"]
-                idx_LTEAM = lh.index("TEAM_ID")
-                idx_LABBR = lh.index("TEAM_ABBREVIATION")
-                idx_LPTS  = lh.index("PTS")
-                for row in ls["rowSet"]:
-                    id_to_abbr_pts[row[idx_LTEAM]] = (row[idx_LABBR], row[idx_LPTS])
-
-            if home_id in id_to_abbr_pts and away_id in id_to_abbr_pts:
-                home_abbr, home_pts = id_to_abbr_pts[home_id]
-                away_abbr, away_pts = id_to_abbr_pts[away_id]
-
-        # Fallback: if we didn’t get summary, try from previously captured TeamStats
-        if (home_abbr is None or away_abbr is None) and best_gid in team_summaries:
-            teams = team_summaries[best_gid]
-            if len(teams) == 2:
-                # We don’t know home/away, but we can still present "A vs B"
-                away_abbr, home_abbr = teams[0]["ABBR"], teams[1]["ABBR"]
-                away_pts, home_pts = teams[0]["PTS"], teams[1]["PTS"]
-
-        # Determine opponent based on best player’s team
-        if home_abbr and away_abbr:
-            if best_team_abbr == home_abbr:
-                opponent_abbr = away_abbr
-            elif best_team_abbr == away_abbr:
-                opponent_abbr = home_abbr
-            else:
-                opponent_abbr = "N/A"
-
-            if (home_pts is not None) and (away_pts is not None):
-                final_score_str = f"{away_abbr}@{home_abbr}: {away_pts}-{home_pts}"
-            else:
-                final_score_str = "Score unavailable"
-        else:
-            opponent_abbr = "N/A"
-            final_score_str = "Score unavailable"
+        games_df = await get_games_for_date_async(target_dt)
+    except Exception as e:
+        print(f"  Could not load games for {date_str}: {e}")
+        games_df = None
+
+    return await _player_of_the_day_for_async(target_dt, date_str, games_df, formula, top_n)
 
+
+async def _player_of_the_day_for_async(target_dt, date_str, games_df, formula, top_n):
+    """_player_of_the_day_for on the async stats client."""
+    if games_df is None or games_df.empty:
+        return {"message": f"No NBA games were played on {date_str}."}
+
+    final = date_settled(target_dt)
+    box_dicts = await get_box_scores_async(sorted(games_df["GAME_ID"].unique()), final=final)
+    if final:
+        await asyncio.to_thread(ingest_box_scores, target_dt, box_dicts)
+    return await player_of_the_day_from_async(date_str, games_df, box_dicts, formula=formula, top_n=top_n)
+
+
+def _range_days(start_date, end_date, by_date):
+    """[(date, date_str, games_df or None)] for every date of the range, in order."""
+    days = []
+    for i in range((end_date - start_date).days + 1):
+        target_dt = start_date + timedelta(days=i)
+        days.append((target_dt, target_dt.strftime("%m/%d/%Y"), by_date.get(target_dt)))
+    return days
+
+
+def iter_player_of_the_day_range(start_date, end_date, formula: str = "pra", top_n: int = 1):
+    """
+    Yield get_player_of_the_day's result for every date from start_date to end_date, in order.
+    One LeagueGameLog call covers the whole range; each day is yielded as soon as it is ready.
+    """
+    print(f"Fetching Players of the Day for {start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}...")
+    try:
+        by_date = get_games_for_range(start_date, end_date)
     except Exception as e:
-        opponent_abbr = "N/A"
-        final_score_str = "Score unavailable"
+        print(f"  Could not load games for {start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}: {e}")
+        by_date = {}
+    for target_dt, date_str, games_df in _range_days(start_date, end_date, by_date):
+        yield {"date": date_str, **_player_of_the_day_for(target_dt, date_str, games_df, formula, top_n)}
 
-    result = {
-        "date": date_str,
-        "player_of_the_day": {
-            **best_payload,
-            "Opponent": opponent_abbr,
-            "Final_Score": final_score_str,
-        },
-    }
-    return clean_nans(result)
+
+async def iter_player_of_the_day_range_async(start_date, end_date, formula: str = "pra", top_n: int = 1):
+    """iter_player_of_the_day_range as an async generator on the event loop."""
+    print(f"Fetching Players of the Day for {start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}...")
+    try:
+        by_date = await get_games_for_range_async(start_date, end_date)
+    except Exception as e:
+        print(f"  Could not load games for {start_date:%m/%d/%Y}-{end_date:%m/%d/%Y}: {e}")
+        by_date = {}
+    for target_dt, date_str, games_df in _range_days(start_date, end_date, by_date):
+        yield {"date": date_str, **await _player_of_the_day_for_async(target_dt, date_str, games_df, formula, top_n)}
 
 if __name__ == "__main__":#TEST CODE
     # Change days_ago as needed for testing
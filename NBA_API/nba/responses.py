@@ -0,0 +1,40 @@
+# responses.py
+import json
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib path gives the same bytes
+    orjson = None
+
+##AVAILABLE FUNCTIONS
+# dumps(content)
+# FastJSONResponse(content)
+
+
+def _numpy_default(value):
+    """numpy scalars and arrays (which orjson takes with OPT_SERIALIZE_NUMPY) for json.dumps."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """
+    Compact UTF-8 JSON, byte-for-byte what Starlette's JSONResponse renders for our payloads.
+    Payloads must already be NaN-free (see utils.nil_rows / clean_nans).
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                      default=_numpy_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Return this from a route instead of a dict to skip FastAPI's jsonable_encoder,
+    which rebuilds the whole payload before it is serialized.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,158 @@
+# rosters.py
+import asyncio
+import threading
+import time
+from nba.utils import get_season_string, lazy_module
+from nba.teams import team_abbr
+from nba.fetch import call_endpoint, coalesce, fetch_all, result_set, result_set_frame
+from nba.stats_client import get_stats_client
+from nba.metrics import count_cache
+
+commonallplayers = lazy_module("nba_api.stats.endpoints.commonallplayers")
+commonplayerinfo = lazy_module("nba_api.stats.endpoints.commonplayerinfo")
+
+##AVAILABLE FUNCTIONS
+# get_roster_snapshot()
+# get_current_teams(player_ids)
+# get_current_teams_async(player_ids)
+# start_roster_refresher(interval: int = ROSTER_TTL_SECONDS)
+# snapshot_state() / restore_state(state)
+
+# Trades and signings are rare enough that a few hours of staleness is fine
+ROSTER_TTL_SECONDS = 6 * 60 * 60
+
+_snapshot = None  # (player_id -> team_id, fetched_at)
+_lock = threading.Lock()
+
+
+def _snapshot_params():
+    season = get_season_string()
+    print(f"Loading roster snapshot for {season}...")
+    return dict(is_only_current_season=1, league_id="00", season=season)
+
+
+def _store_snapshot(data):
+    global _snapshot
+    rs = result_set(data, "CommonAllPlayers")
+    person, team = rs["headers"].index("PERSON_ID"), rs["headers"].index("TEAM_ID")
+    teams = {int(row[person]): int(row[team] or 0) for row in rs["rowSet"]}
+    with _lock:
+        _snapshot = (teams, time.time())
+    return teams
+
+
+def snapshot_state():
+    """(player_id -> team_id, fetched_at) for the warm-start snapshot."""
+    with _lock:
+        return _snapshot
+
+
+def restore_state(state):
+    global _snapshot
+    with _lock:
+        _snapshot = state
+
+
+def _load_snapshot():
+    """One league-wide CommonAllPlayers call for the current season."""
+    return _store_snapshot(call_endpoint(commonallplayers.CommonAllPlayers, **_snapshot_params()))
+
+
+def _fresh_snapshot():
+    """(fresh teams map or None, whatever snapshot we have)"""
+    with _lock:
+        snapshot = _snapshot
+    if snapshot is not None and time.time() - snapshot[1] < ROSTER_TTL_SECONDS:
+        count_cache("roster_snapshot", True)
+        return snapshot[0], snapshot
+    count_cache("roster_snapshot", False)
+    return None, snapshot
+
+
+def get_roster_snapshot():
+    """
+    player_id -> team_id for everyone on a current roster.
+    Reloaded when older than ROSTER_TTL_SECONDS; returns None if it can't be loaded at all.
+    """
+    teams, snapshot = _fresh_snapshot()
+    if teams is not None:
+        return teams
+    try:
+        return coalesce("roster_snapshot", _load_snapshot)
+    except Exception as e:
+        print(f"Roster snapshot unavailable: {e}")
+        # A stale snapshot still beats one request per player
+        return snapshot[0] if snapshot is not None else None
+
+
+def _team_from_player_info(player_id):
+    try:
+        info = result_set_frame(
+            call_endpoint(commonplayerinfo.CommonPlayerInfo, player_id=player_id),
+            "CommonPlayerInfo",
+        )
+        return team_abbr(info.loc[0, "TEAM_ID"])
+    except Exception:
+        return None
+
+
+def _teams_from_snapshot(teams, player_ids):
+    return {pid: team_abbr(teams.get(int(pid), 0)) for pid in player_ids}
+
+
+def get_current_teams(player_ids):
+    """
+    {player_id: team abbreviation or None (free agent / retired / unknown)}.
+    Only falls back to per-player CommonPlayerInfo calls when there is no snapshot.
+    """
+    teams = get_roster_snapshot()
+    if teams is None:
+        player_ids = list(player_ids)
+        return dict(zip(player_ids, fetch_all(_team_from_player_info, player_ids)))
+    return _teams_from_snapshot(teams, player_ids)
+
+
+async def get_current_teams_async(player_ids):
+    """get_current_teams on the async stats client."""
+    client = get_stats_client()
+    teams, snapshot = _fresh_snapshot()
+    if teams is None:
+        try:
+            teams = _store_snapshot(await client.get(commonallplayers.CommonAllPlayers, **_snapshot_params()))
+        except Exception as e:
+            print(f"Roster snapshot unavailable: {e}")
+            teams = snapshot[0] if snapshot is not None else None
+    if teams is not None:
+        return _teams_from_snapshot(teams, player_ids)
+
+    async def from_player_info(pid):
+        try:
+            info = result_set_frame(
+                await client.get(commonplayerinfo.CommonPlayerInfo, player_id=pid), "CommonPlayerInfo"
+            )
+            return team_abbr(info.loc[0, "TEAM_ID"])
+        except Exception:
+            return None
+
+    player_ids = list(player_ids)
+    return dict(zip(player_ids, await asyncio.gather(*(from_player_info(pid) for pid in player_ids))))
+
+
+def start_roster_refresher(interval: int = ROSTER_TTL_SECONDS):
+    """Reload the snapshot every `interval` seconds on a daemon thread."""
+    def refresh():
+        while True:
+            # A snapshot restored at start-up is only reloaded once it is due
+            with _lock:
+                age = time.time() - _snapshot[1] if _snapshot is not None else interval
+            if age < interval:
+                time.sleep(interval - age)
+            try:
+                coalesce("roster_snapshot", _load_snapshot)
+            except Exception as e:
+                print(f"Roster refresh failed: {e}")
+                time.sleep(interval)
+
+    thread = threading.Thread(target=refresh, name="roster-refresher", daemon=True)
+    thread.start()
+    return thread
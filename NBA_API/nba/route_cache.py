@@ -0,0 +1,288 @@
+# route_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from starlette.routing import compile_path
+from nba.metrics import count_route_cache, set_gauge
+from nba.seasons import today
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, as in responses.py
+    orjson = None
+
+##AVAILABLE FUNCTIONS
+# RouteCacheMiddleware(app, ttls: dict, dated: tuple = ())  (ASGI)
+# route_cache_stats()
+
+# Whole GET responses, keyed by path + query string, kept per route for:
+#   fresh_seconds   served as-is
+#   stale_seconds   after that, served immediately while one background request refreshes it
+# Past both, the request waits for the app again; if the app fails (upstream down or
+# throttling us) the last good response is served instead of the error. The same goes for
+# a 200 that only reports trouble (see _degraded): it is never stored over a good answer.
+# An empty result ({"games": []} on an off-day) is an answer like any other.
+MAX_BYTES = int(os.environ.get("NBA_ROUTE_CACHE_BYTES", str(64 * 1024 * 1024)))
+# One response may not take more than this share of the cache
+MAX_ENTRY_SHARE = 16
+# Rough per-entry bookkeeping cost on top of the body
+_ENTRY_OVERHEAD = 512
+
+
+class _Entry:
+    __slots__ = ("status", "headers", "body", "etag", "stored_at", "size")
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"etag", b"cache-control")]
+        self.body = body
+        self.etag = b'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest().encode() + b'"'
+        self.stored_at = time.time()
+        self.size = len(body) + sum(len(k) + len(v) for k, v in self.headers) + _ENTRY_OVERHEAD
+
+
+class _LRU:
+    """Byte-capped LRU of _Entry objects, shared by every route."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        if entry.size > self.max_bytes // MAX_ENTRY_SHARE:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+            self.entries[key] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted.size
+            set_gauge("nba_route_cache_bytes", self.bytes)
+            set_gauge("nba_route_cache_entries", len(self.entries))
+
+
+_cache = _LRU(MAX_BYTES)
+_refreshing = set()  # keys with a background refresh in flight
+_tasks = set()       # strong references to those refresh tasks
+
+
+def route_cache_stats():
+    """Entries and bytes currently held by the route cache."""
+    with _cache.lock:
+        return {"entries": len(_cache.entries), "bytes": _cache.bytes, "max_bytes": _cache.max_bytes}
+
+
+def _seconds_to_midnight():
+    now = datetime.now()
+    return (datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) - now).total_seconds()
+
+
+def _same_day(scope):
+    """False when a dated route's answer was computed after the midnight its key belongs to."""
+    return scope.get("route_cache_day", today()) == today()
+
+
+def _header(scope, name):
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value
+    return None
+
+
+def _degraded(body):
+    """
+    True for a 200 body the handlers use to report trouble instead of raising: a JSON
+    object with an "error" key or "complete": false (a day missing box scores).
+    """
+    if body[:1] != b"{":
+        return False
+    try:
+        payload = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and ("error" in payload or payload.get("complete") is False)
+
+
+async def _run(app, scope):
+    """Call the app for `scope` and collect the whole response: (status, headers, body)."""
+    status, headers, chunks = 500, [], []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status, headers = message["status"], list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, headers, b"".join(chunks)
+
+
+class RouteCacheMiddleware:
+    """
+    Plain ASGI middleware in front of the router. `ttls` maps route templates
+    ("/player-stats/{player_id}") to (fresh_seconds, stale_seconds); other routes pass through.
+    `dated` routes answer relative to today (days_ago=1 is a different date after midnight):
+    their keys include today's date and their Cache-Control never reaches past midnight.
+    Responses carry an ETag (If-None-Match gets a 304), Cache-Control and X-Cache
+    (HIT, STALE, MISS or STALE-IF-ERROR).
+    """
+
+    def __init__(self, app, ttls: dict, dated: tuple = ()):
+        self.app = app
+        self.routes = [(compile_path(path)[0], path, ttl) for path, ttl in ttls.items()]
+        self.dated = set(dated)
+
+    def _route(self, path):
+        for regex, template, ttl in self.routes:
+            if regex.match(path):
+                return template, ttl
+        return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        template, ttl = self._route(scope["path"])
+        if template is None:
+            await self.app(scope, receive, send)
+            return
+
+        fresh_seconds, stale_seconds = ttl
+        key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        if template in self.dated:
+            scope["route_cache_day"] = today()
+            key = f"{scope['route_cache_day'].isoformat()} {key}"
+        entry = _cache.get(key)
+        age = time.time() - entry.stored_at if entry is not None else None
+
+        if entry is not None and age < fresh_seconds:
+            count_route_cache(template, "hit")
+            scope["cached_route"] = template
+            await self._send_entry(scope, send, entry, b"HIT", fresh_seconds - age, stale_seconds)
+            return
+
+        if entry is not None and age < fresh_seconds + stale_seconds:
+            count_route_cache(template, "stale")
+            scope["cached_route"] = template
+            self._refresh_in_background(key, scope, template)
+            await self._send_entry(scope, send, entry, b"STALE", 0, stale_seconds)
+            return
+
+        count_route_cache(template, "miss")
+        await self._miss(scope, receive, send, key, entry, template, fresh_seconds, stale_seconds)
+
+    async def _miss(self, scope, receive, send, key, entry, template, fresh_seconds, stale_seconds):
+        """
+        Run the app. A response that arrives in one body message is stored and sent with
+        cache headers; a streamed one is passed through as it comes, uncached.
+        """
+        start = None
+        streaming = False
+
+        async def capture(message):
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if streaming:
+                await send(message)
+                return
+            if message.get("more_body", False):
+                streaming = True
+                await send(start)
+                await send(message)
+                return
+            await self._finish(scope, send, key, entry, template, start, message.get("body", b""),
+                               fresh_seconds, stale_seconds)
+
+        try:
+            await self.app(scope, receive, capture)
+        except Exception:
+            if start is not None or entry is None:
+                raise
+            # Nothing was sent yet: fall back to the last good answer below
+            start = {"status": 500, "headers": []}
+            await self._finish(scope, send, key, entry, template, start, b"", fresh_seconds, stale_seconds)
+
+    async def _finish(self, scope, send, key, entry, template, start, body, fresh_seconds, stale_seconds):
+        status = start["status"]
+        degraded = status == 200 and _degraded(body)
+        if status == 200 and not degraded:
+            fresh = _Entry(status, start.get("headers", []), body)
+            if _same_day(scope):
+                _cache.put(key, fresh)
+            await self._send_entry(scope, send, fresh, b"MISS", fresh_seconds, stale_seconds)
+        elif (status >= 500 or degraded) and entry is not None:
+            # Upstream trouble: the last good answer beats an error
+            count_route_cache(template, "stale_if_error")
+            scope["cached_route"] = template
+            await self._send_entry(scope, send, entry, b"STALE-IF-ERROR", 0, stale_seconds)
+        else:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+    def _refresh_in_background(self, key, scope, template):
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+        async def refresh():
+            try:
+                status, headers, body = await _run(self.app, dict(scope))
+                if status == 200 and not _degraded(body):
+                    if _same_day(scope):
+                        _cache.put(key, _Entry(status, headers, body))
+                else:
+                    count_route_cache(template, "refresh_error")
+            except Exception as e:
+                count_route_cache(template, "refresh_error")
+                print(f"Background refresh of {key} failed: {e}")
+            finally:
+                _refreshing.discard(key)
+
+        task = asyncio.ensure_future(refresh())
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+    async def _send_entry(self, scope, send, entry, outcome, max_age, stale_seconds):
+        if "route_cache_day" in scope:
+            # Downstream caches must not hold it into the next day either
+            until_midnight = _seconds_to_midnight()
+            max_age, stale_seconds = min(max_age, until_midnight), min(stale_seconds, until_midnight)
+        cache_headers = [
+            (b"etag", entry.etag),
+            (b"cache-control", f"public, max-age={int(max_age)}, stale-while-revalidate={int(stale_seconds)}".encode()),
+            (b"x-cache", outcome),
+        ]
+        if _header(scope, b"if-none-match") == entry.etag:
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status,
+                    "headers": entry.headers + cache_headers
+                               + [(b"content-length", str(len(entry.body)).encode())]})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,68 @@
+# scoring.py
+from nba.fetch import result_set_frame
+from nba.utils import lazy_module
+
+pd = lazy_module("pandas")
+
+##AVAILABLE FUNCTIONS
+# player_lines(box_dicts: dict)
+# rank_players(players_df, formula: str = "pra", top_n: int = 1)
+
+# Box score columns the formulas may use; missing/None values count as 0
+STAT_COLUMNS = ["PTS", "REB", "AST", "STL", "BLK", "TO", "PF",
+                "FGM", "FGA", "FTM", "FTA", "FG3M", "OREB", "DREB"]
+
+SCORING_FORMULAS = {
+    # The original "best player" rule
+    "pra": lambda df: df["PTS"] + df["REB"] + df["AST"],
+    # John Hollinger's Game Score
+    "game_score": lambda df: (
+        df["PTS"] + 0.4 * df["FGM"] - 0.7 * df["FGA"] - 0.4 * (df["FTA"] - df["FTM"])
+        + 0.7 * df["OREB"] + 0.3 * df["DREB"] + df["STL"] + 0.7 * df["AST"]
+        + 0.7 * df["BLK"] - 0.4 * df["PF"] - df["TO"]
+    ),
+    # NBA.com fantasy points
+    "fantasy": lambda df: (
+        df["PTS"] + 1.2 * df["REB"] + 1.5 * df["AST"] + 3 * df["STL"] + 3 * df["BLK"] - df["TO"]
+    ),
+}
+
+
+def player_lines(box_dicts: dict):
+    """
+    Stack the PlayerStats rows of several raw box scores into one DataFrame,
+    in the order of `box_dicts`, with stat columns coerced to numbers.
+    """
+    frames = []
+    for gid, box in box_dicts.items():
+        if box is None:
+            continue
+        try:
+            frames.append(result_set_frame(box, "PlayerStats"))
+        except Exception as e:
+            print(f"  Skipping game {gid} due to error: {e}")
+    if not frames:
+        return pd.DataFrame(columns=["GAME_ID", "PLAYER_NAME", "TEAM_ABBREVIATION"] + STAT_COLUMNS)
+
+    df = pd.concat(frames, ignore_index=True)
+    for col in STAT_COLUMNS:
+        if col not in df:
+            df[col] = 0
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    return df
+
+
+def rank_players(players_df, formula: str = "pra", top_n: int = 1):
+    """
+    Score every row with the chosen formula and return the `top_n` best rows
+    (SCORE column added). Ties keep the earlier row, like the old one-by-one walk.
+    """
+    if formula not in SCORING_FORMULAS:
+        raise ValueError(f"Unknown scoring formula {formula!r}. Use one of {sorted(SCORING_FORMULAS)}.")
+    if players_df.empty:
+        return players_df.assign(SCORE=pd.Series(dtype=float))
+
+    scored = players_df.assign(SCORE=SCORING_FORMULAS[formula](players_df))
+    if top_n == 1:
+        return scored.loc[[scored["SCORE"].idxmax()]]
+    return scored.sort_values("SCORE", ascending=False, kind="stable").head(top_n)
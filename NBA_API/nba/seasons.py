@@ -0,0 +1,52 @@
+# seasons.py
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+##AVAILABLE FUNCTIONS
+# today()
+# season_for(day: datetime.date)
+# season_bounds(season: str)
+# current_season()
+
+# A season runs October through the following September (finals end in June,
+# the calendar rolls over to the next season on October 1st).
+SEASON_START_MONTH = 10
+
+_current = None  # (day, season, (start, end)), recomputed when the date changes
+_lock = threading.Lock()
+
+
+def today():
+    """Today's local date, read at call time (never as a default argument)."""
+    return datetime.now().date()
+
+
+@lru_cache(maxsize=4096)
+def season_for(day) -> str:
+    """The NBA season string ('2024-25') a date belongs to."""
+    start = day.year if day.month >= SEASON_START_MONTH else day.year - 1
+    return f"{start}-{str(start + 1)[-2:]}"
+
+
+@lru_cache(maxsize=64)
+def season_bounds(season: str):
+    """(first day, last day) of a season string like '2024-25'."""
+    start = int(season[:4])
+    return date(start, SEASON_START_MONTH, 1), date(start + 1, SEASON_START_MONTH, 1) - timedelta(days=1)
+
+
+def current_season():
+    """
+    (season, (start, end)) for today, computed once per process day, so a
+    long-running server rolls over to the new season on its own.
+    """
+    global _current
+    day = today()
+    current = _current
+    if current is None or current[0] != day:
+        season = season_for(day)
+        current = (day, season, season_bounds(season))
+        with _lock:
+            _current = current
+    return current[1], current[2]
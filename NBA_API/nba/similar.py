@@ -0,0 +1,185 @@
+# similar.py
+import asyncio
+import threading
+import warnings
+from datetime import timedelta
+from nba.utils import get_season_string, lazy_module
+from nba.seasons import season_bounds, season_for
+from nba.derived_stats import derive
+from nba.leaders import get_league_table, get_league_table_async
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+##AVAILABLE FUNCTIONS
+# build_index(tables: dict)
+# get_similar_players(player_id: int, k: int = 10, metric: str = "cosine", seasons: int = 1)
+# get_similar_players_async(player_id: int, k: int = 10, metric: str = "cosine", seasons: int = 1)
+
+# Every player-season of the last `seasons` league tables as one row of a float matrix:
+# per-36 production plus shooting efficiency, each feature z-scored over the index so
+# rebounds and free-throw rates weigh the same. A query is one matrix-vector product
+# over the whole index, then argpartition for the top k.
+PER_36_FEATURES = ["PTS", "REB", "OREB", "AST", "STL", "BLK", "TOV", "FG3A", "FTA"]
+ADVANCED_FEATURES = ["TS_PCT", "EFG_PCT", "USG_PCT"]
+METRICS = ["cosine", "euclidean"]
+# Season minutes a player-season needs to be in the index (per-36 numbers from a
+# handful of minutes are noise), prorated over the part of the season played so far
+MIN_SEASON_MINUTES = 250
+
+_indexes = {}  # seasons tuple -> (the league tables it was built from, index)
+_lock = threading.Lock()
+
+
+def _seasons_back(count):
+    """The current season string and the `count - 1` before it, newest first."""
+    seasons = [get_season_string()]
+    while len(seasons) < count:
+        seasons.append(season_for(season_bounds(seasons[-1])[0] - timedelta(days=1)))
+    return seasons
+
+
+def build_index(tables: dict):
+    """
+    {season: per-game LeagueLeaders DataFrame} -> index dict:
+      players   DataFrame of player_id / player_name / team_abbr / season, one row per vector
+      vectors   z-scored feature matrix (rows aligned with players)
+      unit      the same rows scaled to length 1, for cosine similarity
+      sq_norms  squared row lengths, for Euclidean distance
+    """
+    frames = []
+    for season, df in tables.items():
+        if df.empty:
+            continue
+        season_share = min(df["GP"].max() / 82, 1)
+        keep = df[df["MIN"] * df["GP"] >= MIN_SEASON_MINUTES * season_share]
+        features = pd.concat([derive(keep, "per_36", per_game=True)[PER_36_FEATURES],
+                              derive(keep, "advanced", per_game=True)[ADVANCED_FEATURES]], axis=1)
+        frames.append((keep[["PLAYER_ID", "PLAYER", "TEAM"]].assign(SEASON=season), features))
+
+    if not frames:
+        # Nothing qualifies yet (say, before tip-off): an index no query can match
+        width = len(PER_36_FEATURES + ADVANCED_FEATURES)
+        return {"players": pd.DataFrame(columns=["player_id", "player_name", "team_abbr", "season"]),
+                "player_ids": np.array([], dtype=int), "vectors": np.zeros((0, width)),
+                "unit": np.zeros((0, width)), "sq_norms": np.zeros(0)}
+
+    players = pd.concat([ids for ids, _ in frames], ignore_index=True).rename(
+        columns={"PLAYER_ID": "player_id", "PLAYER": "player_name", "TEAM": "team_abbr", "SEASON": "season"})
+    matrix = np.vstack([features.to_numpy(dtype=float) for _, features in frames])
+
+    # z-score every feature; a missing value (no attempts) sits at the mean
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # a feature with no values at all
+        mean = np.nanmean(matrix, axis=0)
+        std = np.nanstd(matrix, axis=0)
+    std[(std == 0) | np.isnan(std)] = 1.0
+    vectors = np.nan_to_num((matrix - mean) / std)
+    norms = np.linalg.norm(vectors, axis=1)
+    unit = vectors / np.where(norms == 0, 1.0, norms)[:, None]
+    return {
+        "players": players,
+        "player_ids": players["player_id"].to_numpy(),
+        "vectors": vectors,
+        "unit": unit,
+        "sq_norms": norms ** 2,
+    }
+
+
+def _index_for(tables: dict):
+    """The index of these tables, rebuilt whenever one of them was refreshed."""
+    key = tuple(tables)
+    with _lock:
+        cached = _indexes.get(key)
+    if cached is not None and all(a is b for a, b in zip(cached[0], tables.values())):
+        return cached[1]
+    index = build_index(tables)
+    with _lock:
+        _indexes[key] = (list(tables.values()), index)
+    return index
+
+
+def _query(index, player_id: int, k: int, metric: str, seasons: list):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}. Use one of {', '.join(METRICS)}.")
+    rows = np.flatnonzero(index["player_ids"] == player_id)
+    if rows.size == 0:
+        return None
+    row = rows[0]  # newest season first
+    others = index["player_ids"] != player_id
+
+    if metric == "cosine":
+        scores = index["unit"] @ index["unit"][row]
+        order = -scores  # smaller is closer for both metrics
+    else:
+        # ||a - b||^2 = ||a||^2 - 2 a.b + ||b||^2, for every row in one product
+        scores = np.sqrt(np.maximum(
+            index["sq_norms"] - 2 * (index["vectors"] @ index["vectors"][row]) + index["sq_norms"][row], 0))
+        order = scores.copy()
+    order[~others] = np.inf
+    n = min(k, int(others.sum()))
+    top = np.argpartition(order, n - 1)[:n] if n else np.array([], dtype=int)
+    top = top[np.argsort(order[top], kind="stable")]
+
+    players = index["players"]
+    target = players.iloc[row]
+    return {
+        "player_id": int(player_id),
+        "player_name": target["player_name"],
+        "season": target["season"],
+        "metric": metric,
+        "seasons": seasons,
+        "features": PER_36_FEATURES + ADVANCED_FEATURES,
+        "similar": [
+            {
+                "player_id": int(players.iat[i, 0]),
+                "player_name": players.iat[i, 1],
+                "team_abbr": players.iat[i, 2],
+                "season": players.iat[i, 3],
+                "score": round(float(scores[i]), 4),
+            }
+            for i in top
+        ],
+    }
+
+
+def _before_tip_off(names: list, tables: dict):
+    """
+    Until the current season has games its table is empty; the index then covers the
+    `seasons` seasons before it. Returns those names (None when the season is under way).
+    """
+    if not tables[names[0]].empty:
+        return None
+    return _seasons_back(len(names) + 1)[1:]
+
+
+def get_similar_players(player_id: int, k: int = 10, metric: str = "cosine", seasons: int = 1):
+    """
+    The `k` player-seasons closest to `player_id`'s latest season in the index of the last
+    `seasons` seasons (cosine: higher is closer; euclidean: lower is closer), or None
+    when the player has no qualifying season there.
+    """
+    names = _seasons_back(seasons)
+    tables = {season: get_league_table(season) for season in names}
+    earlier = _before_tip_off(names, tables)
+    if earlier is not None:
+        names = earlier
+        tables = {season: tables[season] if season in tables else get_league_table(season) for season in names}
+    return _query(_index_for(tables), player_id, k, metric, names)
+
+
+async def get_similar_players_async(player_id: int, k: int = 10, metric: str = "cosine", seasons: int = 1):
+    """get_similar_players with the league tables fetched concurrently on the async stats client."""
+    names = _seasons_back(seasons)
+    tables = dict(zip(names, await asyncio.gather(*(get_league_table_async(season) for season in names))))
+    earlier = _before_tip_off(names, tables)
+    if earlier is not None:
+        names = earlier
+        tables = {season: tables[season] if season in tables else await get_league_table_async(season)
+                  for season in names}
+    return _query(_index_for(tables), player_id, k, metric, names)
+
+
+if __name__ == "__main__":#TEST CODE
+    import json
+    print(json.dumps(get_similar_players(2544), indent=2))
@@ -0,0 +1,101 @@
+# snapshot.py
+import os
+import pickle
+import threading
+import time
+import importlib
+import nba_api
+from nba import leaders, name_index, player, rosters
+from nba.boxscores import CACHE_DIR
+
+##AVAILABLE FUNCTIONS
+# save_snapshot(path: str = SNAPSHOT_PATH)
+# load_snapshot(path: str = SNAPSHOT_PATH)
+# warm_imports()
+
+# The in-memory caches that are expensive to rebuild after a restart are saved on
+# shutdown and restored on start-up, so the first requests after a deploy don't pay
+# full upstream latency. Everything stored here is plain Python data (raw stats
+# responses, dicts, lists), so restoring it needs neither pandas nor nba_api's endpoints.
+# The file is only ever written by this process, which is what makes pickle acceptable.
+SNAPSHOT_PATH = os.environ.get("NBA_SNAPSHOT_PATH", os.path.join(CACHE_DIR, "warm_snapshot.pickle"))
+SNAPSHOT_VERSION = 1
+
+# part -> (export, restore)
+_PARTS = {
+    "name_index": (name_index.snapshot_state, name_index.restore_state),
+    "leaders_table": (leaders.snapshot_state, leaders.restore_state),
+    "roster_snapshot": (rosters.snapshot_state, rosters.restore_state),
+    "careers": (player.snapshot_state, player.restore_state),
+}
+
+# Imported in the background once the server is up (see warm_imports)
+_HEAVY_MODULES = ["numpy", "pandas", "nba_api.stats.endpoints"]
+
+
+def save_snapshot(path: str = SNAPSHOT_PATH):
+    """Write every cache part that has something in it; returns the file size in bytes."""
+    parts = {}
+    for name, (export, _) in _PARTS.items():
+        try:
+            state = export()
+        except Exception as e:
+            print(f"Could not snapshot {name}: {e}")
+            continue
+        if state:
+            parts[name] = state
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "nba_api": nba_api.__version__,  # the name index is built from nba_api's static player list
+        "saved_at": time.time(),
+        "parts": parts,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Write then rename, so a crash mid-write never leaves a truncated snapshot behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH):
+    """Restore the parts found in the snapshot file; returns the names of the parts restored."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot {path}: {e}")
+        return []
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return []
+
+    restored = []
+    for name, state in snapshot["parts"].items():
+        if name not in _PARTS:
+            continue
+        if name == "name_index" and snapshot.get("nba_api") != nba_api.__version__:
+            continue  # the player list may have changed: rebuild instead
+        try:
+            _PARTS[name][1](state)
+            restored.append(name)
+        except Exception as e:
+            print(f"Could not restore {name} from snapshot: {e}")
+    return restored
+
+
+def warm_imports():
+    """
+    Import pandas, numpy and nba_api's endpoints on a daemon thread. The modules use them
+    lazily (utils.lazy_module), so start-up doesn't wait for them and neither, usually,
+    does the first request that needs them.
+    """
+    def run():
+        for module in _HEAVY_MODULES:
+            importlib.import_module(module)
+
+    thread = threading.Thread(target=run, name="warm-imports", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,88 @@
+# stats_client.py
+import asyncio
+import time
+import httpx
+from nba_api.stats.library.http import NBAStatsHTTP
+from nba.fetch import STATS_LIMITER, MAX_WORKERS
+from nba.metrics import observe_upstream
+
+##AVAILABLE FUNCTIONS
+# get_stats_client()
+# close_stats_client()
+# AsyncStatsClient.get(endpoint_cls, **params)
+
+
+class AsyncStatsClient:
+    """
+    Async counterpart of fetch.call_endpoint, for the async FastAPI routes.
+    nba_api endpoint classes are only used to build the request parameters;
+    the request itself goes over one pooled httpx connection pool.
+    Identical requests already in flight share a single upstream call.
+    """
+
+    def __init__(self, timeout: float = 30, max_connections: int = MAX_WORKERS * 2):
+        headers = dict(NBAStatsHTTP.headers)
+        # brotli needs an optional dependency; gzip is plenty
+        headers["Accept-Encoding"] = "gzip, deflate"
+        self._http = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        self._inflight = {}
+
+    async def _request(self, name, endpoint, params):
+        # Same shared token bucket as the sync path, without blocking the event loop
+        wait = STATS_LIMITER.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await self._http.get(NBAStatsHTTP.base_url.format(endpoint=endpoint), params=params)
+            response.raise_for_status()
+            payload = response.json()
+            ok = True
+            return payload
+        finally:
+            observe_upstream(name, time.perf_counter() - start, ok)
+
+    async def get(self, endpoint_cls, **params):
+        """Raw response dict for an nba_api endpoint (same as call_endpoint)."""
+        request = endpoint_cls(**params, get_request=False)
+        # requests (used by nba_api) drops None parameters, so do the same
+        query = sorted((k, v) for k, v in request.parameters.items() if v is not None)
+        key = (request.endpoint, tuple(query))
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(endpoint_cls.__name__, request.endpoint, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller disconnecting must not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+_client = None
+_client_loop = None
+
+
+def get_stats_client():
+    """The AsyncStatsClient for the running event loop (created on first use)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = AsyncStatsClient()
+        _client_loop = loop
+    return _client
+
+
+async def close_stats_client():
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = _client_loop = None
@@ -0,0 +1,60 @@
+# teams.py
+from nba_api.stats.static import teams as nba_teams_static
+
+##AVAILABLE FUNCTIONS
+# get_team(key)
+# team_abbr(team_id: int)
+# all_teams(conference: str = None)
+
+_EAST = {"ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DET", "IND", "MIA", "MIL",
+         "NYK", "ORL", "PHI", "TOR", "WAS"}
+
+
+def _build_index():
+    """
+    Every current team as {team_id, abbr, name, nickname, city, conference}, plus a
+    lookup from each of its keys (id, abbreviation, full name, nickname; lowercased) to it.
+    Built once from nba_api's static team list, no request involved.
+    """
+    teams = []
+    lookup = {}
+    for t in sorted(nba_teams_static.get_teams(), key=lambda t: t["abbreviation"]):
+        team = {
+            "team_id": t["id"],
+            "abbr": t["abbreviation"],
+            "name": t["full_name"],
+            "nickname": t["nickname"],
+            "city": t["city"],
+            "conference": "East" if t["abbreviation"] in _EAST else "West",
+        }
+        teams.append(team)
+        lookup[team["team_id"]] = team
+        for key in (str(team["team_id"]), team["abbr"], team["name"], team["nickname"]):
+            lookup[key.lower()] = team
+    return teams, lookup
+
+
+_TEAMS, _LOOKUP = _build_index()
+
+
+def get_team(key):
+    """The team for an id (int or digits), abbreviation, full name or nickname; None if unknown."""
+    if isinstance(key, str):
+        return _LOOKUP.get(key.strip().lower())
+    try:
+        return _LOOKUP.get(int(key))
+    except (TypeError, ValueError):
+        return None
+
+
+def team_abbr(team_id):
+    """Abbreviation for a TEAM_ID, or None (free agents come back with TEAM_ID 0)."""
+    team = get_team(team_id)
+    return team["abbr"] if team else None
+
+
+def all_teams(conference: str = None):
+    """All teams in abbreviation order, optionally only one conference ('East'/'West')."""
+    if conference is None:
+        return list(_TEAMS)
+    return [team for team in _TEAMS if team["conference"].lower() == conference.lower()]
@@ -1,18 +1,34 @@
-from datetime import datetime
+import importlib
 import math
+from nba.seasons import current_season, season_for
 
 ##AVAILABLE FUNCTIONS
 # clean_nans(obj)
-# get_season_string(date: datetime.date = datetime.now())
+# nil_rows(df)
+# get_season_string(date: datetime.date = None)
+# lazy_module(name: str)
 
-_TEAM_MAP = { 
-    1610612737: "ATL", 1610612738: "BOS", 1610612751: "BKN", 1610612766: "CHA", 1610612741: "CHI",
-    1610612739: "CLE", 1610612742: "DAL", 1610612743: "DEN", 1610612765: "DET", 1610612744: "GSW", 
-    1610612745: "HOU", 1610612754: "IND", 1610612746: "LAC", 1610612747: "LAL", 1610612763: "MEM", 
-    1610612748: "MIA", 1610612749: "MIL", 1610612750: "MIN", 1610612740: "NOP", 1610612752: "NYK", 
-    1610612760: "OKC", 1610612753: "ORL", 1610612755: "PHI", 1610612756: "PHX", 1610612757: "POR", 
-    1610612758: "SAC", 1610612759: "SAS", 1610612761: "TOR", 1610612762: "UTA", 1610612764: "WAS" 
-}
+class _LazyModule:
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def lazy_module(name: str):
+    """
+    `pd = lazy_module("pandas")` instead of `import pandas as pd`: the import runs the first
+    time the module is used, not when the server starts. pandas, numpy and
+    nba_api.stats.endpoints (which imports pandas and every endpoint class) are most of
+    the process start-up time.
+    """
+    return _LazyModule(name)
 
 def clean_nans(obj):
     """Recursively replace NaN/Infinity with 'Nil'."""
@@ -26,14 +42,26 @@ def clean_nans(obj):
         return obj
     return obj
 
-def get_season_string(date: datetime.date = datetime.now()) -> str:
+def nil_rows(df):
+    """
+    df's rows as lists of native Python values (what to_dict gives per cell), with
+    NaN/Infinity already replaced by 'Nil' like clean_nans would, built column by
+    column so no second pass over every record is needed. None stays None, as before.
+    """
+    columns = []
+    for col in df.columns:
+        values = df[col].tolist()  # native Python scalars, like to_dict
+        if df[col].dtype.kind in "fO":
+            values = ["Nil" if isinstance(v, float) and not math.isfinite(v) else v for v in values]
+        columns.append(values)
+    return [list(row) for row in zip(*columns)]
+
+def get_season_string(date=None) -> str:
     """
-    Defaults to today's date
+    Defaults to today's date (read on every call, not once at import)
     Given a date, return the NBA season string like '2024-25'.
     NBA season starts in October and ends in June/July.
     """
-    year = date.year
-    if date.month >= 10:  # October or later → season starts this year
-        return f"{year}-{str(year + 1)[-2:]}"
-    else:  # Before October → season started the previous year
-        return f"{year - 1}-{str(year)[-2:]}"
\ No newline at end of file
+    if date is None:
+        return current_season()[0]
+    return season_for(date)
@@ -37,26 +37,33 @@ app.use(express.static("public"))
 
 
 // FUNCTIONS
+// playerData: the per-game numbers the API derives (/player-stats/:id?mode=per_game)
 function getStats(data, playerData) {
-  const perGame = playerData.GP;
   const playerStats = {
     name: data.fullName,
     team: data.currentTeam,
     stats: {
-      PTS: (playerData.PTS / perGame).toFixed(1),
-      REB: (playerData.REB / perGame).toFixed(1),
-      AST: (playerData.AST / perGame).toFixed(1),
-      STL: (playerData.STL / perGame).toFixed(1),
-      BLK: (playerData.BLK / perGame).toFixed(1),
-      FG3M: (playerData.FG3M / perGame).toFixed(1),
+      PTS: playerData.PTS.toFixed(1),
+      REB: playerData.REB.toFixed(1),
+      AST: playerData.AST.toFixed(1),
+      STL: playerData.STL.toFixed(1),
+      BLK: playerData.BLK.toFixed(1),
+      FG3M: playerData.FG3M.toFixed(1),
       FG3_PCT: (playerData.FG3_PCT * 100).toFixed(1) + "%",
-      FGM: (playerData.FGM / perGame).toFixed(1),
+      FGM: playerData.FGM.toFixed(1),
       FG_PCT: (playerData.FG_PCT*100).toFixed(1) + "%",
     }
   }
   return playerStats;
 }
 
+async function getPerGameStats(playerId) {
+  const response = await axios.get(`${NBA_API_URL}/player-stats/${playerId}`, {
+    params: { mode: "per_game" }
+  });
+  return response.data;
+}
+
 async function getImageUrl(playerName) {
   try {
     const response = await axios.get("https://www.googleapis.com/customsearch/v1", {
@@ -135,10 +142,16 @@ function getFinalScore(game){
 }
 
 
+async function getDaySummary() {
+  // Both pages read the same day summary, so the API fetches and caches the day once
+  const response = await axios.get(`${NBA_API_URL}/day-summary`);
+  return response.data;
+}
+
+
 app.get("/", async(req, res) => { 
   try {
-    const response = await axios.get(`${NBA_API_URL}/player-of-the-day`);
-    const data = (response.data); 
+    const data = (await getDaySummary()).player_of_the_day; 
   console.log(data);
   if (!data.player_of_the_day){
     res.render("index.ejs", {
@@ -173,15 +186,17 @@ app.get("/", async(req, res) => {
 });
 
 app.get("/matches-today", async(req, res) => { 
-  const response = await axios.get(`${NBA_API_URL}/matches-of-the-day`); 
-  const data = (response.data); 
+  const data = await getDaySummary(); 
   const games = data.games
   const matchups = [];
 
   if (games[0]){
     games.forEach(game => {
       
-      const [team1Name, team2Name] = ( game.matchup.split(" vs. ").length == 2) ? game.matchup.split(" vs. ") : game.matchup.split(" @ ")
+      // team/opponent come from the API; older cached payloads only have the matchup string
+      const [team1Name, team2Name] = game.team
+        ? [game.team, game.opponent]
+        : ( game.matchup.split(" vs. ").length == 2) ? game.matchup.split(" vs. ") : game.matchup.split(" @ ")
       
       const [team1Score, team2Score] = game.final_score.split(" - ")
       const players = game.players
@@ -236,13 +251,13 @@ app.post("/player-stats", async(req, res) => {
 
   const playerData = await getPlayerData(playerName);
   const playerId = playerData.id;
-  const playerStats = await axios.get(`${NBA_API_URL}/player-stats/${playerId}`);
-  console.log(playerStats.data);
+  const playerStats = await getPerGameStats(playerId);
+  console.log(playerStats);
 
   const imageLink = await getImageUrl(playerName);
   console.log(imageLink);
 
-  const raw_stats = playerStats.data.stats
+  const raw_stats = playerStats.derived
   const stats = getStats(playerData, raw_stats); 
 
  res.render("player-stats.ejs", {
@@ -308,11 +323,11 @@ app.post("/player-comparison", async(req, res) => {
   const player2Data= await getPlayerData(player2Name);
   const player2_id = player2Data.id;
 
-  const playerStats1 = await axios.get(`${NBA_API_URL}/player-stats/${player1_id}`);
-  const playerStats2 = await axios.get(`${NBA_API_URL}/player-stats/${player2_id}`);
+  const playerStats1 = await getPerGameStats(player1_id);
+  const playerStats2 = await getPerGameStats(player2_id);
 
-  const player1AllStats = playerStats1.data.stats;
-  const player2AllStats = playerStats2.data.stats;
+  const player1AllStats = playerStats1.derived;
+  const player2AllStats = playerStats2.derived;
   
   const player1Stats = getStats(player1Data, player1AllStats);
   const player2Stats = getStats(player2Data, player2AllStats);